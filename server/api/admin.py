@@ -1,7 +1,8 @@
 from django.contrib import admin
-from .models import FinancialProfile, Income, Expense, Investment
+from .models import FinancialProfile, Income, Expense, Investment, Budget
 
 admin.site.register(FinancialProfile)
 admin.site.register(Income)
 admin.site.register(Expense)
 admin.site.register(Investment)
+admin.site.register(Budget)
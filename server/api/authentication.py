@@ -0,0 +1,76 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+
+class UserCache:
+    """Small thread-safe TTL + LRU cache of authenticated ``User`` instances keyed by id.
+
+    Entries are dropped when the user is saved or deleted in this process (see
+    ``api.signals``); the TTL bounds how long other worker processes can serve
+    a stale copy.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._users = OrderedDict()
+
+    def _config(self):
+        return getattr(settings, 'AUTH_USER_CACHE', {})
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at < time.monotonic():
+                del self._users[user_id]
+                return None
+            self._users.move_to_end(user_id)
+        # Hand out a copy so per-request changes never leak into the cache
+        return copy.copy(user)
+
+    def set(self, user_id, user):
+        config = self._config()
+        with self._lock:
+            self._users[user_id] = (time.monotonic() + config.get('TTL', 300), copy.copy(user))
+            self._users.move_to_end(user_id)
+            while len(self._users) > config.get('MAX_SIZE', 10000):
+                self._users.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._users.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+
+
+user_cache = UserCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT authentication that resolves the token's user without a per-request query.
+
+    The first request for a user loads the row as usual; later requests are
+    served from ``user_cache`` until the user changes or the entry expires.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        cached = user_id is not None and getattr(settings, 'AUTH_USER_CACHE', {}).get('ENABLED', True)
+        if cached:
+            user = user_cache.get(user_id)
+            if user is not None:
+                return user
+
+        user = super().get_user(validated_token)
+        if cached:
+            user_cache.set(user_id, user)
+        return user
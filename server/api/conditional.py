@@ -0,0 +1,36 @@
+import functools
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from .services.data_version import get_data_version
+
+
+def conditional_on_data_version(method):
+    """Serve ``ETag``/``Last-Modified`` for a DRF ``get`` from the user's data version.
+
+    Revalidation costs one primary-key lookup: when the client's validators
+    still match, a 304 is returned without running the view, so no querysets
+    are evaluated and nothing is serialized. Responses are marked
+    ``private, no-cache`` so browsers store them but always revalidate. The
+    ``(version, updated_at)`` pair is left on ``request.data_version`` for the
+    view to reuse.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        version, updated_at = get_data_version(request.user.pk)
+        request.data_version = (version, updated_at)
+        # The same version renders differently per format (JSON vs. browsable API)
+        etag = f'"{request.user.pk}-{version}-{request.accepted_renderer.format}"'
+        last_modified = int(updated_at.timestamp()) if updated_at else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = method(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                response.headers.setdefault('ETag', etag)
+                if last_modified is not None:
+                    response.headers.setdefault('Last-Modified', http_date(last_modified))
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    return wrapper
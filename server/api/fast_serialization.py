@@ -0,0 +1,97 @@
+"""Read-only fast path for list endpoints.
+
+``ModelSerializer(many=True)`` builds a model instance per row and then runs
+every field's ``get_attribute``/``to_representation``. For flat serializers
+whose fields all map to plain columns, the same output can be produced from
+``values_list()`` tuples with one converter per field, chosen once per request.
+The converters reproduce DRF's own ``to_representation`` exactly; field types
+without a specialised converter use the field's bound ``to_representation``.
+"""
+import decimal
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import ISO_8601, fields
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+def _decimal_converter(field):
+    coerce_to_string = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+    if not coerce_to_string or field.localize or field.normalize_output or field.decimal_places is None:
+        return field.to_representation
+
+    quantum = decimal.Decimal('.1') ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding = field.rounding
+
+    def convert(value):
+        if not isinstance(value, decimal.Decimal):
+            value = decimal.Decimal(str(value).strip())
+        return '{:f}'.format(value.quantize(quantum, rounding=rounding, context=context))
+
+    return convert
+
+
+def _converter(field):
+    to_representation = type(field).to_representation
+    if to_representation is fields.IntegerField.to_representation:
+        return int
+    if to_representation is fields.CharField.to_representation:
+        return str
+    if to_representation is fields.DecimalField.to_representation:
+        return _decimal_converter(field)
+    if to_representation is fields.DateField.to_representation:
+        if getattr(field, 'format', api_settings.DATE_FORMAT) == ISO_8601:
+            return lambda value: value.isoformat() if value else None
+    return field.to_representation
+
+
+def compile_representation(serializer):
+    """Return ``(output names, columns, converters)`` for ``serializer``, or None if it has no fast path.
+
+    Only serializers whose readable fields each read one concrete, non-relational
+    model column qualify.
+    """
+    model = serializer.Meta.model
+    names, columns, converters = [], [], []
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if len(field.source_attrs) != 1:
+            return None
+        try:
+            model_field = model._meta.get_field(field.source_attrs[0])
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete or model_field.is_relation:
+            return None
+        names.append(field.field_name)
+        columns.append(model_field.attname)
+        converters.append(_converter(field))
+    return names, columns, converters
+
+
+def values_representation(serializer, queryset):
+    """Serialize ``queryset`` like ``serializer_class(queryset, many=True).data``, without model instances."""
+    compiled = compile_representation(serializer)
+    if compiled is None:
+        return type(serializer)(queryset, many=True, context=serializer.context).data
+
+    names, columns, converters = compiled
+    fields_and_converters = list(zip(names, converters))
+    return [
+        # DRF emits None for a None attribute without calling the field
+        {name: None if value is None else convert(value) for (name, convert), value in zip(fields_and_converters, row)}
+        for row in queryset.values_list(*columns)
+    ]
+
+
+class ValuesListMixin:
+    """Serve unpaginated list GETs through ``values_representation``."""
+
+    def list(self, request, *args, **kwargs):
+        if self.paginator is not None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(values_representation(self.get_serializer(), queryset))
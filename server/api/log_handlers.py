@@ -0,0 +1,159 @@
+"""Logging building blocks used by ``settings.LOGGING``.
+
+Kept free of model imports because Django configures logging before the app
+registry is ready.
+"""
+import copy
+import datetime
+import itertools
+import json
+import logging
+import logging.handlers
+import queue
+import threading
+from django.utils.module_loading import import_string
+
+# Attributes present on every LogRecord; anything else was passed via ``extra``.
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+
+class _Listener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self):
+        # Wait for room rather than failing to stop when the queue is full
+        self.queue.put(self._sentinel)
+
+
+class QueueingHandler(logging.Handler):
+    """Hand records to a background thread that formats and writes them.
+
+    ``target`` is the dotted path of the handler doing the real I/O; remaining
+    keyword arguments are passed to it, e.g.::
+
+        "file": {
+            "class": "api.log_handlers.QueueingHandler",
+            "target": "logging.FileHandler",
+            "filename": "logs/app.log",
+            "formatter": "json",
+        }
+
+    The request thread interpolates the message and renders any traceback,
+    so the queued record holds no references to the caller's objects, which
+    could change or be kept alive; formatting and I/O happen on the listener
+    thread. When the queue is full records are dropped (and counted) rather
+    than blocking the request.
+    """
+
+    def __init__(self, target, queue_size=10000, **kwargs):
+        super().__init__()
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.target = import_string(target)(**kwargs)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+        self.listener = _Listener(self.queue, self.target, respect_handler_level=True)
+        self.listener.start()
+        self._running = True
+
+    def setFormatter(self, fmt):
+        # Formatting is the target's job, on the listener thread
+        self.target.setFormatter(fmt)
+
+    def setLevel(self, level):
+        super().setLevel(level)
+        self.target.setLevel(level)
+
+    def handle(self, record):
+        # The queue is thread-safe, so skip the per-handler lock Handler.handle takes
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
+
+    def prepare(self, record):
+        # As logging.handlers.QueueHandler.prepare, but leaving the formatting to the target
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = (self.target.formatter or logging.Formatter()).formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record):
+        try:
+            self.queue.put_nowait(self.prepare(record))
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+    def flush(self):
+        """Block until every queued record has been handed to the target."""
+        if self._running:
+            self.listener.stop()
+            self.listener.start()
+        self.target.flush()
+
+    def close(self):
+        # logging.shutdown() calls this at exit, draining the queue first
+        if self._running:
+            self.listener.stop()
+            self._running = False
+        self.target.close()
+        super().close()
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only one in N records for configured high-volume messages.
+
+    ``every`` maps a logger name to ``{message template prefix: N}``. Matching
+    is on the unformatted template (``record.msg``), so the log calls must use
+    lazy ``%s`` arguments rather than f-strings::
+
+        "every": {"api.views.expense_views": {"ExpenseListCreateView: Fetching expenses": 100}}
+
+    One instance is usually shared by several handlers, which each call
+    ``filter`` on the same record; the decision is made once per record and
+    remembered on it, so every handler keeps the same one in N.
+    """
+
+    def __init__(self, every=None):
+        super().__init__()
+        self.every = every or {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        rules = self.every.get(record.name)
+        if not rules or not isinstance(record.msg, str):
+            return True
+        for prefix, n in rules.items():
+            if record.msg.startswith(prefix):
+                decisions = record.__dict__.setdefault('_sampled', {})
+                if id(self) not in decisions:
+                    with self._lock:
+                        counter = self._counters.setdefault((record.name, prefix), itertools.count())
+                        decisions[id(self)] = next(counter) % n == 0
+                return decisions[id(self)]
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    """Format records as one JSON object per line, including any ``extra`` fields."""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.datetime.fromtimestamp(record.created, tz=datetime.timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            # Underscored attributes are bookkeeping, e.g. SamplingFilter's decision
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
@@ -0,0 +1,213 @@
+import json
+import platform
+import random
+import threading
+import time
+from datetime import date, datetime
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+from api.models import FinancialProfile, Income, Expense, Investment, Budget
+from api.services.llm_stub import StubLLMServer
+from api.services.anomalies import rebuild_category_stats
+from api.services.budgets import rebuild_category_spend
+from api.services.seeding import delete_users_data, transaction_rows, write_rows
+from api.services.semantic_cache import chat_answer_cache
+
+PREFIX = "bench_endpoints_"
+CATEGORIES = ["Rent", "Groceries", "Transport", "Entertainment", "Healthcare", "Utilities", "Dining", "Shopping"]
+
+
+def expense_payload(i):
+    return {"category": CATEGORIES[i % len(CATEGORIES)], "amount": "1250.00", "date_spent": str(date.today())}
+
+
+class Command(BaseCommand):
+    """Measure throughput and p50/p99 latency of the main endpoints at several data scales.
+
+    For each scale a benchmark user is seeded with that many transactions
+    (split across incomes, expenses and investments), then every endpoint is
+    hit through the full middleware/auth stack. AI modes call a local stub LLM,
+    so their numbers cover prompt building and DB reads only. Results are
+    written as JSON so runs can be compared, e.g.::
+
+        python manage.py bench_endpoints --scales 10,10000,1000000 --output before.json
+        python manage.py bench_endpoints --scales 10,10000,1000000 --output after.json --baseline before.json
+    """
+
+    help = "Benchmark endpoint latency and throughput against seeded datasets"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', default="10,10000,1000000",
+                            help="Comma-separated transaction counts to seed per benchmark user")
+        parser.add_argument('--requests', type=int, default=50, help="Requests per endpoint and scale")
+        parser.add_argument('--threads', type=int, default=1, help="Concurrent client threads per endpoint")
+        parser.add_argument('--time-limit', type=float, default=60.0,
+                            help="Stop an endpoint early once it has run this many seconds")
+        parser.add_argument('--bulk-size', type=int, default=50, help="Items per bulk create request")
+        parser.add_argument('--batch-size', type=int, default=10_000, help="Rows per bulk_create batch when seeding")
+        parser.add_argument('--endpoints', help="Comma-separated subset of endpoint names to run")
+        parser.add_argument('--output', default="bench_endpoints.json", help="Path to write the results as JSON")
+        parser.add_argument('--baseline', help="Earlier results file to compare against")
+        parser.add_argument('--keep', action='store_true', help="Keep the benchmark users and rows afterwards")
+
+    def handle(self, *args, **options):
+        scales = [int(scale) for scale in options['scales'].split(",")]
+        results = {
+            'meta': {
+                'started_at': datetime.now().isoformat(timespec='seconds'),
+                'database': connection.vendor,
+                'python': platform.python_version(),
+                'requests': options['requests'],
+                'threads': options['threads'],
+                'bulk_size': options['bulk_size'],
+            },
+            'scales': {},
+        }
+
+        with StubLLMServer(reply="Benchmark advice.") as stub, override_settings(GROQ_API_URL=stub.url):
+            for scale in scales:
+                user = self._ensure_user(scale, options['batch_size'])
+                token = str(RefreshToken.for_user(user).access_token)
+                self.stdout.write(f"\nScale: {scale} transactions")
+                self.stdout.write(f"{'endpoint':<26}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+
+                scale_results = results['scales'][str(scale)] = {}
+                for name, method, url, payload in self._endpoints(options):
+                    result = self._run(method, url, payload, token, options)
+                    scale_results[name] = result
+                    self.stdout.write(
+                        f"{name:<26}{result['requests_per_second']:>10.1f}{result['p50_ms']:>10.2f}"
+                        f"{result['p99_ms']:>10.2f}{result['errors']:>8}"
+                    )
+
+        with open(options['output'], 'w') as f:
+            json.dump(results, f, indent=2)
+        self.stdout.write(f"\nResults written to {options['output']}")
+
+        if options['baseline']:
+            self._compare(options['baseline'], results)
+
+        if not options['keep']:
+            self._cleanup()
+            self.stdout.write("Benchmark users removed.")
+        self.stdout.write(self.style.SUCCESS("✅ Benchmark complete!"))
+
+    def _endpoints(self, options):
+        bulk = [expense_payload(i) for i in range(options['bulk_size'])]
+        loan = {"loan_type": "home", "loan_amount": "2500000.00", "interest_rate": "8.50", "loan_tenure": 20}
+        endpoints = [
+            ("dashboard", "get", reverse("user-dashboard"), None),
+            ("budget status", "get", reverse("budget-status"), None),
+            ("portfolio returns", "get", reverse("analytics-portfolio"), None),
+            ("investment projections", "get", reverse("investment-projections"), None),
+            ("goal simulation", "post", reverse("analytics-goal-simulation"), {"goal_amount": "50000000.00", "target_age": 60}),
+            ("recurring transactions", "get", reverse("analytics-recurring"), None),
+            ("monthly trends", "get", reverse("analytics-trends") + "?period=month&start=2020-01-01", None),
+            ("income list", "get", reverse("income-list"), None),
+            ("expense list", "get", reverse("expense-list"), None),
+            ("investment list", "get", reverse("investment-list"), None),
+            ("expense anomalies", "get", reverse("expense-anomalies"), None),
+            ("search", "get", reverse("search") + "?q=groceries", None),
+            ("expense create", "post", reverse("expense-list"), expense_payload(0)),
+            ("expense bulk create", "post", reverse("expense-list"), bulk),
+            ("ai insights", "get", reverse("ai-insights"), None),
+            ("ai chat", "post", reverse("ai-chat"), {"message": "How much should I keep as an emergency fund?"}),
+            ("ai similar investments", "get", reverse("ai-similar-investments"), None),
+            ("ai loan analysis", "post", reverse("ai-loan-analysis"), loan),
+        ]
+        if options['endpoints']:
+            wanted = {name.strip() for name in options['endpoints'].split(",")}
+            endpoints = [endpoint for endpoint in endpoints if endpoint[0] in wanted]
+        return endpoints
+
+    def _run(self, method, url, payload, token, options):
+        latencies = []
+        errors = []
+        lock = threading.Lock()
+        deadline = time.perf_counter() + options['time_limit']
+
+        def worker():
+            client = Client(HTTP_HOST="localhost", HTTP_AUTHORIZATION=f"Bearer {token}")
+            timings = []
+            failed = 0
+            for _ in range(options['requests']):
+                if time.perf_counter() > deadline:
+                    break
+                # Measure the uncached chat path on every request
+                chat_answer_cache.clear()
+                started = time.perf_counter()
+                if method == "get":
+                    response = client.get(url)
+                else:
+                    response = client.post(url, json.dumps(payload), content_type="application/json")
+                timings.append((time.perf_counter() - started) * 1000)
+                if response.status_code >= 400:
+                    failed += 1
+            with lock:
+                latencies.extend(timings)
+                errors.append(failed)
+
+        threads = [threading.Thread(target=worker) for _ in range(options['threads'])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        return {
+            'requests': len(latencies),
+            'errors': sum(errors),
+            'requests_per_second': len(latencies) / elapsed if elapsed else 0.0,
+            'mean_ms': sum(latencies) / len(latencies) if latencies else 0.0,
+            'p50_ms': latencies[len(latencies) // 2] if latencies else 0.0,
+            'p99_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] if latencies else 0.0,
+        }
+
+    def _compare(self, path, results):
+        with open(path) as f:
+            baseline = json.load(f)
+        self.stdout.write(f"\nCompared with {path} (p50 ms, negative is faster):")
+        for scale, endpoints in results['scales'].items():
+            for name, result in endpoints.items():
+                before = baseline.get('scales', {}).get(scale, {}).get(name)
+                if not before or not before['p50_ms']:
+                    continue
+                change = (result['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100
+                self.stdout.write(
+                    f"{scale:>9} {name:<26}{before['p50_ms']:>10.2f} -> {result['p50_ms']:>10.2f} ({change:+.1f}%)"
+                )
+
+    def _ensure_user(self, scale, batch_size):
+        user, _ = User.objects.get_or_create(
+            username=f"{PREFIX}{scale}", defaults={"email": f"{PREFIX}{scale}@example.com"}
+        )
+        profile, _ = FinancialProfile.objects.get_or_create(
+            user=user,
+            defaults={"age": 32, "monthly_salary": 120000, "monthly_savings": 30000, "risk_tolerance": "medium"},
+        )
+        for category in CATEGORIES:
+            Budget.objects.get_or_create(user=user, category=category, defaults={"monthly_limit": 20000})
+
+        existing = Income.objects.filter(user=user).count() + Expense.objects.filter(user=user).count() \
+            + Investment.objects.filter(user=user).count()
+        if existing >= scale:
+            return user
+
+        self.stdout.write(f"Seeding {scale - existing} transactions for {user.username}...")
+        started = time.perf_counter()
+        rows = transaction_rows(user, scale - existing, random.Random(scale), profile.monthly_salary)
+        write_rows(rows, batch_size, method="copy" if connection.vendor == "postgresql" else "bulk")
+        rebuild_category_spend([user.pk])
+        rebuild_category_stats([user.pk])
+        self.stdout.write(f"Seeded in {time.perf_counter() - started:.1f}s")
+        return user
+
+    def _cleanup(self):
+        delete_users_data(User.objects.filter(username__startswith=PREFIX).values_list('id', flat=True))
@@ -0,0 +1,82 @@
+import io
+import json
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from api import renderers
+from api.models import Expense
+from api.renderers import FastJSONParser, FastJSONRenderer
+from api.serializers import ExpenseSerializer
+from api.services.seeding import EXPENSE_CATEGORIES
+
+
+class Command(BaseCommand):
+    """Compare DRF's stdlib JSON renderer/parser with the orjson-backed ones.
+
+    The payload is an expense list exactly as ``ExpenseSerializer`` emits it,
+    built from unsaved instances so no database is needed::
+
+        python manage.py bench_json --rows 10000
+    """
+
+    help = "Micro-benchmark JSON rendering and parsing of a large expense payload"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10_000)
+        parser.add_argument('--repeat', type=int, default=20, help="Timed runs per case")
+        parser.add_argument('--output', help="Optional path to write the results as JSON")
+
+    def handle(self, *args, **options):
+        if renderers.orjson is None:
+            self.stdout.write(self.style.WARNING("orjson is not installed; the fast classes fall back to the stdlib."))
+
+        rng = random.Random(0)
+        today = date.today()
+        expenses = [
+            Expense(
+                id=i, category=EXPENSE_CATEGORIES[i % len(EXPENSE_CATEGORIES)][0],
+                amount=round(rng.uniform(100, 30000), 2), date_spent=today - timedelta(days=rng.randrange(730)),
+            )
+            for i in range(1, options['rows'] + 1)
+        ]
+        data = ExpenseSerializer(expenses, many=True).data
+        body = JSONRenderer().render(data)
+        if FastJSONRenderer().render(data) != body:
+            self.stderr.write(self.style.ERROR("Rendered output differs from DRF's JSONRenderer."))
+        if FastJSONParser().parse(io.BytesIO(body)) != JSONParser().parse(io.BytesIO(body)):
+            self.stderr.write(self.style.ERROR("Parsed output differs from DRF's JSONParser."))
+
+        cases = [
+            ("render", "JSONRenderer", lambda: JSONRenderer().render(data)),
+            ("render", "FastJSONRenderer", lambda: FastJSONRenderer().render(data)),
+            ("parse", "JSONParser", lambda: JSONParser().parse(io.BytesIO(body))),
+            ("parse", "FastJSONParser", lambda: FastJSONParser().parse(io.BytesIO(body))),
+        ]
+        results = {'rows': options['rows'], 'bytes': len(body), 'cases': {}}
+        self.stdout.write(f"Payload: {options['rows']} expenses, {len(body) / 1024:.0f} KiB")
+        self.stdout.write(f"{'case':<28}{'median ms':>12}{'min ms':>10}{'MB/s':>10}")
+        for operation, name, run in cases:
+            run()  # Warm up
+            timings = []
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                run()
+                timings.append((time.perf_counter() - started) * 1000)
+            median = statistics.median(timings)
+            results['cases'][f"{operation} {name}"] = {'median_ms': median, 'min_ms': min(timings)}
+            self.stdout.write(
+                f"{operation + ' ' + name:<28}{median:>12.2f}{min(timings):>10.2f}{len(body) / 1e3 / median:>10.1f}"
+            )
+
+        for operation, stdlib, fast in (("render", "JSONRenderer", "FastJSONRenderer"), ("parse", "JSONParser", "FastJSONParser")):
+            speedup = results['cases'][f"{operation} {stdlib}"]['median_ms'] / results['cases'][f"{operation} {fast}"]['median_ms']
+            self.stdout.write(f"{operation}: {speedup:.1f}x faster")
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+        self.stdout.write(self.style.SUCCESS("✅ Benchmark complete!"))
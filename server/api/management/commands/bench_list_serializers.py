@@ -0,0 +1,85 @@
+import json
+import random
+import statistics
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from api.fast_serialization import values_representation
+from api.models import Income, Expense, Investment
+from api.renderers import FastJSONRenderer
+from api.serializers import IncomeSerializer, ExpenseSerializer, InvestmentSerializer
+from api.services.seeding import delete_users_data, transaction_rows, write_rows
+
+USERNAME = "bench_list_serializers"
+
+
+class Command(BaseCommand):
+    """Compare ``ModelSerializer(many=True)`` with the ``values_list`` fast path.
+
+    A throwaway user is seeded with ``--rows`` transactions; each case fetches
+    that user's rows and renders them to JSON, so the timings cover everything
+    a list GET does after authentication::
+
+        python manage.py bench_list_serializers --rows 100000
+    """
+
+    help = "Benchmark the serializer and values_list paths of the list endpoints"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=50_000, help="Transactions to seed for the benchmark user")
+        parser.add_argument('--repeat', type=int, default=10, help="Timed runs per case")
+        parser.add_argument('--batch-size', type=int, default=10_000, help="Rows per bulk_create batch when seeding")
+        parser.add_argument('--output', help="Optional path to write the results as JSON")
+
+    def handle(self, *args, **options):
+        self._cleanup()  # Leftovers from an interrupted run
+        user = User.objects.create(username=USERNAME, email=f"{USERNAME}@example.com")
+        try:
+            write_rows(
+                transaction_rows(user, options['rows'], random.Random(0), 120000), options['batch_size'],
+                method="copy" if connection.vendor == "postgresql" else "bulk",
+            )
+            results = self._run(user, options)
+        finally:
+            self._cleanup()
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+        self.stdout.write(self.style.SUCCESS("✅ Benchmark complete!"))
+
+    def _run(self, user, options):
+        renderer = FastJSONRenderer()
+        results = {}
+        self.stdout.write(f"{'list':<14}{'rows':>8}{'serializer ms':>16}{'values ms':>12}{'speedup':>10}")
+        for model, serializer_class in ((Income, IncomeSerializer), (Expense, ExpenseSerializer),
+                                        (Investment, InvestmentSerializer)):
+            queryset = model.objects.filter(user=user).order_by('id')
+            slow = renderer.render(serializer_class(queryset.all(), many=True).data)
+            if renderer.render(values_representation(serializer_class(), queryset.all())) != slow:
+                self.stderr.write(self.style.ERROR(f"{model.__name__} output differs between the two paths."))
+
+            cases = {
+                'serializer': lambda: renderer.render(serializer_class(queryset.all(), many=True).data),
+                'values': lambda: renderer.render(values_representation(serializer_class(), queryset.all())),
+            }
+            medians = {}
+            for name, run in cases.items():
+                timings = []
+                for _ in range(options['repeat']):
+                    started = time.perf_counter()
+                    run()
+                    timings.append((time.perf_counter() - started) * 1000)
+                medians[name] = statistics.median(timings)
+
+            rows = queryset.count()
+            speedup = medians['serializer'] / medians['values']
+            results[model.__name__] = {'rows': rows, 'bytes': len(slow), 'median_ms': medians, 'speedup': speedup}
+            self.stdout.write(
+                f"{model.__name__:<14}{rows:>8}{medians['serializer']:>16.2f}{medians['values']:>12.2f}{speedup:>9.1f}x"
+            )
+        return results
+
+    def _cleanup(self):
+        delete_users_data(User.objects.filter(username=USERNAME).values_list('id', flat=True))
@@ -0,0 +1,122 @@
+import json
+import logging
+import os
+import tempfile
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+from api.log_handlers import QueueingHandler, SamplingFilter
+
+FORMAT = "{levelname} {asctime} {module} {message}"
+MESSAGE = "ExpenseListCreateView: Fetching expenses for user %s"
+
+
+class CountingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def emit(self, record):
+        self.count += 1
+
+
+class Command(BaseCommand):
+    """Measure the time logging adds to the request thread.
+
+    Compares a synchronous FileHandler with f-string messages (the old setup)
+    against the queued handler with lazy arguments, with and without sampling,
+    then scales by the number of records a list request emits.
+    """
+
+    help = "Benchmark per-message and per-request logging overhead"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=5000, help="Log calls to time per configuration")
+        parser.add_argument('--sample-every', type=int, default=10)
+        parser.add_argument('--output', help="Optional path to write the results as JSON")
+
+    def handle(self, *args, **options):
+        records_per_request = self._records_per_request()
+        results = {'records_per_list_request': records_per_request, 'configurations': {}}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            configurations = [
+                ("sync file, f-string", self._sync_handler, False, None),
+                ("queued file, lazy", self._queued_handler, True, None),
+                (f"queued file, lazy, 1/{options['sample_every']} sampled", self._queued_handler, True, options['sample_every']),
+            ]
+            for name, make_handler, lazy, sample_every in configurations:
+                handler = make_handler(os.path.join(tmp, f"{len(results['configurations'])}.log"))
+                if sample_every:
+                    handler.addFilter(SamplingFilter(every={"bench.logging": {MESSAGE[:30]: sample_every}}))
+                per_message_us, p99_us, max_us = self._time_messages(handler, lazy, options['messages'])
+                handler.close()
+                results['configurations'][name] = {
+                    'per_message_us': per_message_us,
+                    'p99_us': p99_us,
+                    'max_us': max_us,
+                    'per_request_us': per_message_us * records_per_request,
+                    'dropped': getattr(handler, 'dropped', 0),
+                }
+
+        self.stdout.write(f"Records emitted per list request: {records_per_request}")
+        self.stdout.write(
+            f"{'configuration':<36}{'µs/message':>12}{'p99 µs':>10}{'max µs':>10}{'µs/request':>12}{'dropped':>10}"
+        )
+        for name, result in results['configurations'].items():
+            self.stdout.write(
+                f"{name:<36}{result['per_message_us']:>12.2f}{result['p99_us']:>10.2f}{result['max_us']:>10.2f}"
+                f"{result['per_request_us']:>12.2f}{result['dropped']:>10}"
+            )
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+        self.stdout.write(self.style.SUCCESS("✅ Benchmark complete!"))
+
+    def _sync_handler(self, path):
+        handler = logging.FileHandler(path)
+        handler.setFormatter(logging.Formatter(FORMAT, style="{"))
+        return handler
+
+    def _queued_handler(self, path):
+        handler = QueueingHandler("logging.FileHandler", filename=path)
+        handler.setFormatter(logging.Formatter(FORMAT, style="{"))
+        return handler
+
+    def _time_messages(self, handler, lazy, count):
+        logger = logging.getLogger("bench.logging")
+        logger.handlers = [handler]
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+        timings = []
+        for user_id in range(count):
+            started = time.perf_counter()
+            if lazy:
+                logger.info(MESSAGE, user_id)
+            else:
+                logger.info(f"ExpenseListCreateView: Fetching expenses for user {user_id}")
+            timings.append((time.perf_counter() - started) * 1_000_000)
+
+        logger.handlers = []
+        timings.sort()
+        return sum(timings) / count, timings[min(count - 1, int(count * 0.99))], timings[-1]
+
+    def _records_per_request(self):
+        user, _ = User.objects.get_or_create(username="bench_logging", defaults={"email": "bench_logging@example.com"})
+        client = Client(HTTP_HOST="localhost", HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+        counter = CountingHandler()
+        loggers = [logging.getLogger("api"), logging.getLogger("django")]
+        for logger in loggers:
+            logger.addHandler(counter)
+        try:
+            client.get(reverse("expense-list"))
+        finally:
+            for logger in loggers:
+                logger.removeHandler(counter)
+            user.delete()
+        return counter.count
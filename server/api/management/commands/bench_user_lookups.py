@@ -0,0 +1,86 @@
+import random
+import statistics
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from api.services.users import get_user_by_username, users_by_login_keys
+
+PREFIX = "bench_user_"
+
+
+class Command(BaseCommand):
+    """Benchmark case-insensitive username/email lookups against a large auth_user table.
+
+    Compares the legacy ``__iexact`` filters with the ``LOWER(...)`` lookups
+    served by the functional unique indexes, e.g.::
+
+        python manage.py bench_user_lookups --users 1000000
+    """
+
+    help = "Benchmark case-insensitive user lookups (iexact vs. functional indexes)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1_000_000, help="Number of benchmark users to ensure exist")
+        parser.add_argument('--lookups', type=int, default=500, help="Lookups to time per strategy")
+        parser.add_argument('--batch-size', type=int, default=10_000)
+        parser.add_argument('--keep', action='store_true', help="Keep the benchmark users afterwards")
+
+    def handle(self, *args, **options):
+        total = options['users']
+        self._ensure_users(total, options['batch_size'])
+
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {User._meta.db_table}")
+
+        rng = random.Random(0)
+        samples = [rng.randrange(total) for _ in range(options['lookups'])]
+        usernames = [f"{PREFIX}{i:07d}".upper() for i in samples]
+        emails = [f"{PREFIX}{i:07d}@Example.com" for i in samples]
+
+        strategies = [
+            ("username __iexact", lambda v: User.objects.filter(username__iexact=v).first(), usernames),
+            ("username LOWER() index", get_user_by_username, usernames),
+            ("email __iexact", lambda v: User.objects.filter(email__iexact=v).first(), emails),
+            ("email LOWER() index", lambda v: users_by_login_keys().filter(email_lower=v.lower()).first(), emails),
+        ]
+        self.stdout.write(f"{'strategy':<24}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}")
+        for name, lookup, values in strategies:
+            timings = []
+            for value in values:
+                started = time.perf_counter()
+                lookup(value)
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+            self.stdout.write(f"{name:<24}{statistics.median(timings):>10.3f}{p99:>10.3f}{statistics.mean(timings):>10.3f}")
+
+        if connection.vendor == 'postgresql':
+            self.stdout.write("\nQuery plans:")
+            self.stdout.write(User.objects.filter(username__iexact=usernames[0]).explain())
+            self.stdout.write(users_by_login_keys().filter(username_lower=usernames[0].lower()).explain())
+
+        if not options['keep']:
+            with connection.cursor() as cursor:
+                cursor.execute(f"DELETE FROM {User._meta.db_table} WHERE username LIKE %s", [f"{PREFIX}%"])
+            self.stdout.write("Benchmark users removed.")
+
+        self.stdout.write(self.style.SUCCESS("✅ Benchmark complete!"))
+
+    def _ensure_users(self, total, batch_size):
+        existing = User.objects.filter(username__startswith=PREFIX).count()
+        if existing >= total:
+            return
+        self.stdout.write(f"Creating {total - existing} benchmark users...")
+        started = time.perf_counter()
+        for start in range(existing, total, batch_size):
+            User.objects.bulk_create([
+                User(
+                    username=f"{PREFIX}{i:07d}",
+                    email=f"{PREFIX}{i:07d}@example.com",
+                    password="!",  # Unusable password; these accounts can't log in
+                )
+                for i in range(start, min(start + batch_size, total))
+            ])
+        self.stdout.write(f"Created in {time.perf_counter() - started:.1f}s")
@@ -1,49 +1,94 @@
-from django.core.management.base import BaseCommand
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
-from api.models import FinancialProfile, Income, Expense, Investment
-from datetime import date
-import random
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from api.services.seeding import (
+    SEED_PASSWORD,
+    SEED_USER_PREFIX,
+    delete_users_data,
+    seed_users,
+    seed_users_in_worker,
+)
+
 
 class Command(BaseCommand):
+    """Seed users with realistic, reproducible financial data.
+
+    The same ``--seed`` always produces the same users and rows, whatever the
+    batch size or worker count. Users that already exist are skipped, so a run
+    can be resumed or extended. Large datasets for performance testing::
+
+        python manage.py seed_db --users 10000 --rows-per-user 100 --workers 8
+
+    Seed users log in with password ``SeedPass123!``.
+    """
+
     help = "Seed the database with dummy users and financial data"
 
-    def handle(self, *args, **kwargs):
-        # Define dummy users
-        users_data = [
-            {"username": "young_investor", "email": "young@example.com", "age": 25, "risk_tolerance": "high"},
-            {"username": "mid_career", "email": "midcareer@example.com", "age": 40, "risk_tolerance": "medium"},
-            {"username": "retired_saver", "email": "retired@example.com", "age": 60, "risk_tolerance": "low"},
-        ]
-
-        # Create Users & Financial Profiles
-        users = []
-        for user_data in users_data:
-            user, _ = User.objects.get_or_create(username=user_data["username"], defaults={"email": user_data["email"]})
-            users.append(user)
-            FinancialProfile.objects.get_or_create(user=user, defaults={"age": user_data["age"], "risk_tolerance": user_data["risk_tolerance"]})
-
-        # Add Incomes
-        for user in users:
-            Income.objects.get_or_create(user=user, source="Salary", amount=random.randint(50000, 150000), date_received=date.today())
-
-        # Add Expenses
-        expense_categories = ["Rent", "Groceries", "Transport", "Entertainment", "Healthcare"]
-        for user in users:
-            for category in expense_categories:
-                Expense.objects.get_or_create(user=user, category=category, amount=random.randint(5000, 30000), date_spent=date.today())
-
-        # Add Investments
-        investments = [
-            {"name": "Reliance Industries", "investment_type": "stocks", "amount_invested": 75000, "current_value": 80000},
-            {"name": "SBI Bluechip Fund", "investment_type": "mutual_funds", "amount_invested": 50000, "current_value": 52000},
-            {"name": "Gold ETF", "investment_type": "gold", "amount_invested": 40000, "current_value": 45000},
-        ]
-        for user in users:
-            for inv in investments:
-                Investment.objects.get_or_create(
-                    user=user, name=inv["name"], investment_type=inv["investment_type"],
-                    amount_invested=inv["amount_invested"], current_value=inv["current_value"],
-                    date_invested=date.today()
-                )
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=3, help="Number of users to create")
+        parser.add_argument('--rows-per-user', type=int, default=20,
+                            help="Income, expense and investment rows per user")
+        parser.add_argument('--seed', type=int, default=0, help="Random seed; the same seed gives the same data")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Rows per insert batch")
+        parser.add_argument('--method', choices=['auto', 'bulk', 'copy'], default='auto',
+                            help="bulk_create, Postgres COPY, or COPY when available (default)")
+        parser.add_argument('--workers', type=int, default=1, help="Processes writing users in parallel")
+        parser.add_argument('--reset', action='store_true', help="Delete previously seeded users first")
+
+    def handle(self, *args, **options):
+        method = options['method']
+        if method == 'auto':
+            method = 'copy' if connection.vendor == 'postgresql' else 'bulk'
+        elif method == 'copy' and connection.vendor != 'postgresql':
+            raise CommandError("--method copy requires PostgreSQL.")
+
+        if options['reset']:
+            user_ids = User.objects.filter(username__startswith=SEED_USER_PREFIX).values_list('id', flat=True)
+            delete_users_data(user_ids)
+            self.stdout.write("Removed previously seeded users.")
+
+        users = options['users']
+        workers = max(1, min(options['workers'], users))
+        kwargs = {
+            'rows_per_user': options['rows_per_user'],
+            'seed': options['seed'],
+            'batch_size': options['batch_size'],
+            'method': method,
+            # Hashing once keeps user creation cheap; every seed user shares the password
+            'password_hash': make_password(SEED_PASSWORD),
+        }
+        self.stdout.write(
+            f"Seeding {users} users x {options['rows_per_user']} rows with {method} "
+            f"({workers} worker{'s' if workers > 1 else ''})..."
+        )
+        started = time.perf_counter()
+
+        if workers == 1:
+            results = [seed_users(0, users, **kwargs)]
+        else:
+            if 'fork' not in multiprocessing.get_all_start_methods():
+                raise CommandError("--workers needs a platform that supports fork.")
+            # Children must open their own connections rather than share the parent's socket
+            connections.close_all()
+            bounds = [users * i // workers for i in range(workers + 1)]
+            with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('fork')) as pool:
+                futures = [
+                    pool.submit(seed_users_in_worker, bounds[i], bounds[i + 1], **kwargs)
+                    for i in range(workers)
+                ]
+                results = [future.result() for future in futures]
 
+        elapsed = time.perf_counter() - started
+        totals = {}
+        for result in results:
+            for model, count in result.items():
+                totals[model] = totals.get(model, 0) + count
+        for model, count in totals.items():
+            self.stdout.write(f"  {model}: {count}")
+        rows = sum(totals.values())
+        self.stdout.write(f"Wrote {rows} rows in {elapsed:.1f}s ({rows / elapsed if elapsed else 0:.0f} rows/s)")
         self.stdout.write(self.style.SUCCESS("✅ Database seeded successfully!"))
@@ -0,0 +1,222 @@
+"""Per-route request metrics, aggregated in-process and exported in Prometheus text format.
+
+Threads record into a fixed set of ``SHARDS`` stripes, each with its own lock,
+assigned round-robin as threads first record, so the request path rarely
+contends and a server starting a thread per connection doesn't add a shard per
+thread. Stripes are only merged when ``/metrics`` is scraped. With
+``METRICS_DIR`` set, every worker process writes its totals there from a
+background thread every ``METRICS_FLUSH_INTERVAL`` seconds and once more at
+exit, and the scrape merges the files of the workers still running.
+"""
+import atexit
+import itertools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from django.conf import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SHARDS = 16
+
+
+def _new_route_stats():
+    return {
+        'count': 0,
+        'latency_sum': 0.0,
+        'latency_buckets': [0] * (len(LATENCY_BUCKETS) + 1),
+        'db_queries': 0,
+        'db_time': 0.0,
+        'response_bytes': 0,
+        'status': defaultdict(int),
+    }
+
+
+def _merge_into(target, stats):
+    target['count'] += stats['count']
+    target['latency_sum'] += stats['latency_sum']
+    target['latency_buckets'] = [a + b for a, b in zip(target['latency_buckets'], stats['latency_buckets'])]
+    target['db_queries'] += stats['db_queries']
+    target['db_time'] += stats['db_time']
+    target['response_bytes'] += stats['response_bytes']
+    for code, count in list(stats['status'].items()):
+        target['status'][str(code)] += count
+
+
+class RequestMetrics:
+    def __init__(self, shards=SHARDS):
+        self._local = threading.local()
+        self._shards = [(threading.Lock(), defaultdict(_new_route_stats)) for _ in range(shards)]
+        self._next_shard = itertools.count()
+        self._flusher_lock = threading.Lock()
+        self._flusher_pid = None
+
+    def _shard(self):
+        index = getattr(self._local, 'shard', None)
+        if index is None:
+            index = self._local.shard = next(self._next_shard) % len(self._shards)
+        return self._shards[index]
+
+    def record(self, route, method, status_code, latency, db_queries, db_time, response_bytes):
+        bucket = len(LATENCY_BUCKETS)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if latency <= bound:
+                bucket = i
+                break
+        lock, shard = self._shard()
+        with lock:
+            stats = shard[(route, method)]
+            stats['count'] += 1
+            stats['latency_sum'] += latency
+            stats['latency_buckets'][bucket] += 1
+            stats['db_queries'] += db_queries
+            stats['db_time'] += db_time
+            stats['response_bytes'] += response_bytes
+            stats['status'][str(status_code)] += 1
+        self._start_flusher()
+
+    def snapshot(self):
+        """Merge every shard into ``{(route, method): stats}`` for this process."""
+        merged = defaultdict(_new_route_stats)
+        for lock, shard in self._shards:
+            with lock:
+                for key, stats in shard.items():
+                    _merge_into(merged[key], stats)
+        return merged
+
+    def reset(self):
+        for lock, shard in self._shards:
+            with lock:
+                shard.clear()
+
+    def _start_flusher(self):
+        # Once per process: a worker forked from a process that already started one has no such thread
+        if not getattr(settings, 'METRICS_DIR', None) or self._flusher_pid == os.getpid():
+            return
+        with self._flusher_lock:
+            if self._flusher_pid == os.getpid():
+                return
+            if self._flusher_pid is None:
+                atexit.register(self._flush_now)
+            self._flusher_pid = os.getpid()
+            threading.Thread(target=self._flush_periodically, name='metrics-flush', daemon=True).start()
+
+    def _flush_periodically(self):
+        while True:
+            time.sleep(getattr(settings, 'METRICS_FLUSH_INTERVAL', 5))
+            self._flush_now()
+
+    def _flush_now(self):
+        directory = getattr(settings, 'METRICS_DIR', None)
+        if directory:
+            try:
+                self.flush(directory)
+            except OSError:
+                pass
+
+    def flush(self, directory):
+        """Write this process's totals to ``<directory>/<pid>.json`` atomically."""
+        os.makedirs(directory, exist_ok=True)
+        data = [
+            {'route': route, 'method': method, **stats}
+            for (route, method), stats in self.snapshot().items()
+        ]
+        path = os.path.join(directory, f"{os.getpid()}.json")
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def collect(self):
+        """Totals across all worker processes (or just this one without ``METRICS_DIR``)."""
+        directory = getattr(settings, 'METRICS_DIR', None)
+        if not directory:
+            return self.snapshot()
+
+        self.flush(directory)
+        merged = defaultdict(_new_route_stats)
+        for name in os.listdir(directory):
+            pid = name[:-len('.json')]
+            if not name.endswith('.json') or not pid.isdigit():
+                continue
+            if not _is_running(int(pid)):
+                # An exited worker's totals would otherwise be counted forever
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+                continue
+            try:
+                with open(os.path.join(directory, name)) as f:
+                    entries = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for entry in entries:
+                _merge_into(merged[(entry['route'], entry['method'])], entry)
+        return merged
+
+
+def _is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Exists, under another user
+        return True
+    return True
+
+
+request_metrics = RequestMetrics()
+
+
+def _labels(**labels):
+    return ",".join(f'{key}="{str(value)}"' for key, value in labels.items())
+
+
+def render_prometheus(routes, llm_summary=None):
+    """Render route stats (and optionally LLM stats) in the Prometheus text exposition format."""
+    lines = [
+        "# HELP http_request_duration_seconds Request latency by route.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for (route, method), stats in sorted(routes.items()):
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + (float('inf'),), stats['latency_buckets']):
+            cumulative += count
+            le = "+Inf" if bound == float('inf') else repr(bound)
+            lines.append(f"http_request_duration_seconds_bucket{{{_labels(route=route, method=method, le=le)}}} {cumulative}")
+        lines.append(f"http_request_duration_seconds_sum{{{_labels(route=route, method=method)}}} {stats['latency_sum']}")
+        lines.append(f"http_request_duration_seconds_count{{{_labels(route=route, method=method)}}} {stats['count']}")
+
+    counters = [
+        ("http_requests_total", "Requests by route and status code.", None),
+        ("http_db_queries_total", "Database queries executed by route.", 'db_queries'),
+        ("http_db_query_seconds_total", "Time spent in database queries by route.", 'db_time'),
+        ("http_response_bytes_total", "Response body bytes by route.", 'response_bytes'),
+    ]
+    for name, help_text, field in counters:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for (route, method), stats in sorted(routes.items()):
+            if field is None:
+                for code, count in sorted(stats['status'].items()):
+                    lines.append(f"{name}{{{_labels(route=route, method=method, status=code)}}} {count}")
+            else:
+                lines.append(f"{name}{{{_labels(route=route, method=method)}}} {stats[field]}")
+
+    if llm_summary:
+        lines.append("# HELP llm_calls_total LLM calls by AI mode and model.")
+        lines.append("# TYPE llm_calls_total counter")
+        for mode, models in sorted(llm_summary.items()):
+            for model, stats in sorted(models.items()):
+                lines.append(f"llm_calls_total{{{_labels(mode=mode, model=model)}}} {stats['calls']}")
+        lines.append("# HELP llm_tokens_total LLM prompt and completion tokens by AI mode and model.")
+        lines.append("# TYPE llm_tokens_total counter")
+        for mode, models in sorted(llm_summary.items()):
+            for model, stats in sorted(models.items()):
+                lines.append(f"llm_tokens_total{{{_labels(mode=mode, model=model, kind='prompt')}}} {stats['prompt_tokens']}")
+                lines.append(f"llm_tokens_total{{{_labels(mode=mode, model=model, kind='completion')}}} {stats['completion_tokens']}")
+
+    return "\n".join(lines) + "\n"
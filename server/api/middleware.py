@@ -0,0 +1,35 @@
+import time
+from django.db import connection
+from .metrics import request_metrics
+
+
+class RequestMetricsMiddleware:
+    """Record latency, DB query count/time, response size and status per URL name."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = {'count': 0, 'time': 0.0}
+
+        def count_queries(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                queries['count'] += 1
+                queries['time'] += time.perf_counter() - started
+
+        started = time.perf_counter()
+        with connection.execute_wrapper(count_queries):
+            response = self.get_response(request)
+        latency = time.perf_counter() - started
+
+        match = getattr(request, 'resolver_match', None)
+        route = match.view_name if match and match.view_name else 'unmatched'
+        response_bytes = 0 if response.streaming else len(response.content)
+        request_metrics.record(
+            route, request.method, response.status_code, latency,
+            queries['count'], queries['time'], response_bytes,
+        )
+        return response
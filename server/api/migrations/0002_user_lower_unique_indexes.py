@@ -0,0 +1,52 @@
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+# Conflicting groups listed per field in the error, so a large clash stays readable
+MAX_REPORTED = 20
+
+
+def check_case_insensitive_duplicates(apps, schema_editor):
+    # The unique indexes below would fail on these rows with only the database's error to go by
+    User = apps.get_model('auth', 'User')
+    problems = []
+    for field in ('username', 'email'):
+        users = User.objects.exclude(**{field: ''}) if field == 'email' else User.objects.all()
+        clashes = list(
+            users.annotate(folded=Lower(field)).values('folded').annotate(count=Count('id'))
+            .filter(count__gt=1).order_by('folded').values_list('folded', flat=True)[:MAX_REPORTED]
+        )
+        for folded in clashes:
+            rows = users.annotate(folded=Lower(field)).filter(folded=folded).order_by('id')
+            problems.append(f"  {field} {folded!r}: " + ', '.join(
+                f"id={user_id} {value!r}" for user_id, value in rows.values_list('id', field)
+            ))
+    if problems:
+        raise RuntimeError(
+            "Usernames and emails must be unique ignoring case, but these users share one:\n"
+            + '\n'.join(problems)
+            + "\nRename or merge these accounts, then run the migration again."
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_case_insensitive_duplicates, migrations.RunPython.noop),
+        # Functional unique indexes backing case-insensitive username/email lookups
+        # (see api.services.users). Blank emails index as NULL so accounts created
+        # without one, e.g. via createsuperuser, don't collide.
+        migrations.RunSQL(
+            sql='CREATE UNIQUE INDEX IF NOT EXISTS auth_user_username_lower_uniq ON auth_user (LOWER(username));',
+            reverse_sql='DROP INDEX IF EXISTS auth_user_username_lower_uniq;',
+        ),
+        migrations.RunSQL(
+            sql="CREATE UNIQUE INDEX IF NOT EXISTS auth_user_email_lower_uniq ON auth_user (LOWER(NULLIF(email, '')));",
+            reverse_sql='DROP INDEX IF EXISTS auth_user_email_lower_uniq;',
+        ),
+    ]
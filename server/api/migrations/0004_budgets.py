@@ -0,0 +1,59 @@
+# Generated by Django 5.1.6 on 2026-10-19 12:46
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+
+def backfill_category_spend(apps, schema_editor):
+    # Existing expenses predate the signals that maintain the running totals
+    Expense = apps.get_model('api', 'Expense')
+    CategorySpend = apps.get_model('api', 'CategorySpend')
+    rows = (
+        Expense.objects.annotate(month=TruncMonth('date_spent'))
+        .values('user_id', 'category', 'month')
+        .annotate(total=Sum('amount'), transactions=Count('id'))
+        .order_by()
+    )
+    CategorySpend.objects.bulk_create((CategorySpend(**row) for row in rows.iterator()), batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_user_data_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Budget',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(max_length=255)),
+                ('monthly_limit', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='budgets', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'category'), name='unique_budget_category_per_user')],
+            },
+        ),
+        migrations.CreateModel(
+            name='CategorySpend',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(max_length=255)),
+                ('month', models.DateField()),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('transactions', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='category_spend', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'category', 'month'), name='unique_category_spend_per_month')],
+            },
+        ),
+        migrations.RunPython(backfill_category_spend, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.1.6 on 2026-10-19 13:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Avg, Count, Variance
+
+
+def backfill_category_stats(apps, schema_editor):
+    # Existing expenses predate the signals that maintain the statistics; they aren't scored
+    Expense = apps.get_model('api', 'Expense')
+    CategoryStats = apps.get_model('api', 'CategoryStats')
+    rows = (
+        Expense.objects.values('user_id', 'category')
+        .annotate(count=Count('id'), mean=Avg('amount'), variance=Variance('amount'))
+        .order_by()
+    )
+    CategoryStats.objects.bulk_create(
+        (CategoryStats(user_id=row['user_id'], category=row['category'], count=row['count'], mean=float(row['mean']),
+                       m2=float(row['variance'] or 0) * row['count'])
+         for row in rows.iterator()),
+        batch_size=5000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_budgets'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(max_length=255)),
+                ('count', models.IntegerField(default=0)),
+                ('mean', models.FloatField(default=0)),
+                ('m2', models.FloatField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='category_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'category'), name='unique_category_stats_per_user')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ExpenseAnomaly',
+            fields=[
+                ('expense', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='anomaly', serialize=False, to='api.expense')),
+                ('z_score', models.FloatField()),
+                ('category_mean', models.FloatField()),
+                ('category_std', models.FloatField()),
+                ('flagged_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='expense_anomalies', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', '-flagged_at'], name='expense_anomaly_user_recent')],
+            },
+        ),
+        migrations.RunPython(backfill_category_stats, migrations.RunPython.noop),
+    ]
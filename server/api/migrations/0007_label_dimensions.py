@@ -0,0 +1,80 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Dimension tables and nullable foreign keys to them; 0008 fills them in and 0009 makes them required.
+
+    Kept apart so Postgres never alters a table with deferred foreign-key
+    checks pending from the backfill in the same transaction.
+    """
+
+    dependencies = [
+        ('api', '0006_recurring_transactions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExpenseCategory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255, unique=True)),
+                ('name', models.CharField(max_length=255)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='IncomeSource',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255, unique=True)),
+                ('name', models.CharField(max_length=255)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='income',
+            name='source_ref',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='incomes', to='api.incomesource'),
+        ),
+        migrations.AddField(
+            model_name='expense',
+            name='category_ref',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='expenses', to='api.expensecategory'),
+        ),
+        migrations.RemoveConstraint(
+            model_name='budget',
+            name='unique_budget_category_per_user',
+        ),
+        migrations.AddField(
+            model_name='budget',
+            name='category_ref',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='budgets', to='api.expensecategory'),
+        ),
+        # The running totals and statistics are derived data: their text keys
+        # are dropped and 0008 rebuilds them keyed by category id
+        migrations.RemoveConstraint(
+            model_name='categoryspend',
+            name='unique_category_spend_per_month',
+        ),
+        migrations.RemoveField(
+            model_name='categoryspend',
+            name='category',
+        ),
+        migrations.AddField(
+            model_name='categoryspend',
+            name='category',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='api.expensecategory'),
+        ),
+        migrations.RemoveConstraint(
+            model_name='categorystats',
+            name='unique_category_stats_per_user',
+        ),
+        migrations.RemoveField(
+            model_name='categorystats',
+            name='category',
+        ),
+        migrations.AddField(
+            model_name='categorystats',
+            name='category',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='api.expensecategory'),
+        ),
+    ]
@@ -0,0 +1,83 @@
+from django.db import migrations
+from django.db.models import Avg, BigIntegerField, Case, Count, F, Min, Sum, Value, Variance, When
+from django.db.models.functions import TruncMonth
+
+LABELS_PER_UPDATE = 500
+
+
+def normalize_label(label):
+    # Copied from api.services.dimensions, so later changes there can't alter this migration
+    return ' '.join(label.split()).casefold()
+
+
+def intern(model, label_field, dimension):
+    labels = list(model.objects.values_list(label_field, flat=True).distinct().order_by())
+    ids = dict(dimension.objects.values_list('key', 'id'))
+    new = {}
+    for label in labels:
+        new.setdefault(normalize_label(label), ' '.join(label.split()))
+    dimension.objects.bulk_create(
+        [dimension(key=key, name=name) for key, name in new.items() if key not in ids], batch_size=5000,
+    )
+    ids = dict(dimension.objects.values_list('key', 'id'))
+    # One pass over the table per chunk of labels, instead of one per label
+    for start in range(0, len(labels), LABELS_PER_UPDATE):
+        chunk = labels[start:start + LABELS_PER_UPDATE]
+        model.objects.filter(**{f'{label_field}__in': chunk}).update(**{
+            f'{label_field}_ref': Case(
+                *[When(**{label_field: label}, then=Value(ids[normalize_label(label)])) for label in chunk],
+                output_field=BigIntegerField(),
+            ),
+        })
+
+
+def backfill_label_dimensions(apps, schema_editor):
+    ExpenseCategory = apps.get_model('api', 'ExpenseCategory')
+    Expense = apps.get_model('api', 'Expense')
+    Budget = apps.get_model('api', 'Budget')
+    intern(apps.get_model('api', 'Income'), 'source', apps.get_model('api', 'IncomeSource'))
+    intern(Expense, 'category', ExpenseCategory)
+    intern(Budget, 'category', ExpenseCategory)
+
+    # Budgets whose categories differ only in case or spacing now collide; keep the oldest
+    duplicates = (
+        Budget.objects.values('user_id', 'category_ref_id').annotate(count=Count('id'), keep=Min('id'))
+        .filter(count__gt=1).order_by()
+    )
+    for row in duplicates:
+        Budget.objects.filter(user_id=row['user_id'], category_ref_id=row['category_ref_id']).exclude(id=row['keep']).delete()
+
+    CategorySpend = apps.get_model('api', 'CategorySpend')
+    CategorySpend.objects.all().delete()
+    rows = (
+        Expense.objects.annotate(month=TruncMonth('date_spent'))
+        .values('user_id', 'month', category_id=F('category_ref'))
+        .annotate(total=Sum('amount'), transactions=Count('id'))
+        .order_by()
+    )
+    CategorySpend.objects.bulk_create((CategorySpend(**row) for row in rows.iterator()), batch_size=5000)
+
+    CategoryStats = apps.get_model('api', 'CategoryStats')
+    CategoryStats.objects.all().delete()
+    rows = (
+        Expense.objects.values('user_id', category_id=F('category_ref'))
+        .annotate(count=Count('id'), mean=Avg('amount'), variance=Variance('amount'))
+        .order_by()
+    )
+    CategoryStats.objects.bulk_create(
+        (CategoryStats(user_id=row['user_id'], category_id=row['category_id'], count=row['count'],
+                       mean=float(row['mean']), m2=float(row['variance'] or 0) * row['count'])
+         for row in rows.iterator()),
+        batch_size=5000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_label_dimensions'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_label_dimensions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_backfill_label_dimensions'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='income',
+            name='source_ref',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='incomes', to='api.incomesource'),
+        ),
+        migrations.AlterField(
+            model_name='expense',
+            name='category_ref',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='expenses', to='api.expensecategory'),
+        ),
+        migrations.AlterField(
+            model_name='budget',
+            name='category_ref',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='budgets', to='api.expensecategory'),
+        ),
+        migrations.AlterField(
+            model_name='categoryspend',
+            name='category',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='api.expensecategory'),
+        ),
+        migrations.AlterField(
+            model_name='categorystats',
+            name='category',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='api.expensecategory'),
+        ),
+        migrations.AddConstraint(
+            model_name='budget',
+            constraint=models.UniqueConstraint(fields=('user', 'category_ref'), name='unique_budget_category_per_user'),
+        ),
+        migrations.AddConstraint(
+            model_name='categoryspend',
+            constraint=models.UniqueConstraint(fields=('user', 'category', 'month'), name='unique_category_spend_per_month'),
+        ),
+        migrations.AddConstraint(
+            model_name='categorystats',
+            constraint=models.UniqueConstraint(fields=('user', 'category'), name='unique_category_stats_per_user'),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.1.6 on 2026-10-19 13:19
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+# GIN trigram indexes behind search's label matching (see api.services.search)
+TRIGRAM_INDEXES = [
+    ('api_expensecategory_key_trgm', 'api_expensecategory', 'key'),
+    ('api_incomesource_key_trgm', 'api_incomesource', 'key'),
+    ('api_investment_name_trgm', 'api_investment', 'name'),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # PostgreSQL only; other databases match by substring without an index
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm;')
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} USING gin ({column} gin_trgm_ops);'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    # Leaves the extension installed; other schemas may use it
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _, _ in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name};')
+
+
+class AddIndexConcurrentlyOnPostgres(AddIndexConcurrently):
+    # Other databases build the index the plain way
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+        else:
+            migrations.AddIndex.database_forwards(self, app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+        else:
+            migrations.AddIndex.database_backwards(self, app_label, schema_editor, from_state, to_state)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run in a transaction; building the indexes
+    # this way doesn't block writes to the large expense, income and investment tables
+    atomic = False
+
+    dependencies = [
+        ('api', '0009_label_dimension_constraints'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name='expense',
+            index=models.Index(fields=['user', 'category_ref', '-date_spent'], name='expense_user_category_recent'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='income',
+            index=models.Index(fields=['user', 'source_ref', '-date_received'], name='income_user_source_recent'),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
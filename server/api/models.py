@@ -17,26 +17,73 @@ class FinancialProfile(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.risk_tolerance}"
 
+# Interned labels: one row per case- and whitespace-normalized name, shared by all users
+class ExpenseCategory(models.Model):
+    key = models.CharField(max_length=255, unique=True)  # Normalized; see services/dimensions.py
+    name = models.CharField(max_length=255)  # First spelling seen
+
+    def __str__(self):
+        return self.name
+
+class IncomeSource(models.Model):
+    key = models.CharField(max_length=255, unique=True)
+    name = models.CharField(max_length=255)
+
+    def __str__(self):
+        return self.name
+
+# Rows whose free-text LABEL_FIELD is interned in the dimension table DIMENSION_FIELD points to
+class InternedLabelMixin:
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembered so saving with the same label skips the dimension lookup
+        if cls.LABEL_FIELD in field_names:
+            instance._interned_label = values[list(field_names).index(cls.LABEL_FIELD)]
+        return instance
+
 # Income Details
-class Income(models.Model):
+class Income(InternedLabelMixin, models.Model):
+    LABEL_FIELD, DIMENSION_FIELD = 'source', 'source_ref'
+
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="incomes")
-    source = models.CharField(max_length=255)  # Salary, Freelancing, etc.
+    source = models.CharField(max_length=255)  # Salary, Freelancing, etc., as entered
+    source_ref = models.ForeignKey(IncomeSource, on_delete=models.PROTECT, related_name="incomes")
     amount = models.DecimalField(max_digits=12, decimal_places=2)
     date_received = models.DateField()
 
+    class Meta:
+        # Search fetches a user's rows by matching source; see services/search.py
+        indexes = [models.Index(fields=['user', 'source_ref', '-date_received'], name='income_user_source_recent')]
+
     def __str__(self):
         return f"{self.user.username} - {self.source}: ₹{self.amount}"
 
 # Expense Details
-class Expense(models.Model):
+class Expense(InternedLabelMixin, models.Model):
+    LABEL_FIELD, DIMENSION_FIELD = 'category', 'category_ref'
+
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="expenses")
-    category = models.CharField(max_length=255)  # Rent, Groceries, Transport, etc.
+    category = models.CharField(max_length=255)  # Rent, Groceries, Transport, etc., as entered
+    category_ref = models.ForeignKey(ExpenseCategory, on_delete=models.PROTECT, related_name="expenses")
     amount = models.DecimalField(max_digits=12, decimal_places=2)
     date_spent = models.DateField()
 
+    class Meta:
+        indexes = [models.Index(fields=['user', 'category_ref', '-date_spent'], name='expense_user_category_recent')]
+
     def __str__(self):
         return f"{self.user.username} - {self.category}: ₹{self.amount}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembered so an update can take the expense out of the aggregates its old values counted towards
+        loaded = dict(zip(field_names, values))
+        if {'category_ref_id', 'amount', 'date_spent'} <= loaded.keys():
+            instance._stored_values = (loaded['category_ref_id'], loaded['amount'], loaded['date_spent'])
+        return instance
+
 # Investment Details (Stocks, Mutual Funds, SIPs)
 class Investment(models.Model):
     INVESTMENT_TYPE_CHOICES = [
@@ -58,6 +105,117 @@ class Investment(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.name}: ₹{self.amount_invested}"
 
+# Per-user data version, bumped on every write to the user's financial data
+class UserDataVersion(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name="data_version")
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.user_id} - v{self.version}"
+
+# Monthly spending limit for one expense category
+class Budget(InternedLabelMixin, models.Model):
+    LABEL_FIELD, DIMENSION_FIELD = 'category', 'category_ref'
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="budgets")
+    category = models.CharField(max_length=255)
+    category_ref = models.ForeignKey(ExpenseCategory, on_delete=models.PROTECT, related_name="budgets")
+    monthly_limit = models.DecimalField(max_digits=12, decimal_places=2)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'category_ref'], name='unique_budget_category_per_user'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.category}: ₹{self.monthly_limit}/month"
+
+# Running total of a user's expenses per category and month, kept current by signals
+class CategorySpend(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="category_spend")
+    category = models.ForeignKey(ExpenseCategory, on_delete=models.PROTECT, related_name="+")
+    month = models.DateField()  # First day of the month
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    transactions = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'category', 'month'], name='unique_category_spend_per_month'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - category {self.category_id} {self.month:%Y-%m}: ₹{self.total}"
+
+# Running count, mean and sum of squared deviations (Welford) of a user's expense amounts per category
+class CategoryStats(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="category_stats")
+    category = models.ForeignKey(ExpenseCategory, on_delete=models.PROTECT, related_name="+")
+    count = models.IntegerField(default=0)
+    mean = models.FloatField(default=0)
+    m2 = models.FloatField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'category'], name='unique_category_stats_per_user'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - category {self.category_id}: n={self.count}, mean={self.mean:.2f}"
+
+# An expense flagged as unusually large for its category when it was saved
+class ExpenseAnomaly(models.Model):
+    expense = models.OneToOneField(Expense, on_delete=models.CASCADE, primary_key=True, related_name="anomaly")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="expense_anomalies")
+    z_score = models.FloatField()
+    category_mean = models.FloatField()
+    category_std = models.FloatField()
+    flagged_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['user', '-flagged_at'], name='expense_anomaly_user_recent')]
+
+    def __str__(self):
+        return f"{self.user_id} - expense {self.expense_id}: z={self.z_score:.1f}"
+
+# A recurring income or expense series found in a user's history
+class RecurringTransaction(models.Model):
+    KIND_CHOICES = [("income", "Income"), ("expense", "Expense")]
+    CADENCE_CHOICES = [
+        ("weekly", "Weekly"),
+        ("biweekly", "Every two weeks"),
+        ("monthly", "Monthly"),
+        ("quarterly", "Quarterly"),
+        ("yearly", "Yearly"),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="recurring_transactions")
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    label = models.CharField(max_length=255)  # Most common spelling of the category or source
+    cadence = models.CharField(max_length=10, choices=CADENCE_CHOICES)
+    interval_days = models.FloatField()
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    occurrences = models.PositiveIntegerField()
+    first_date = models.DateField()
+    last_date = models.DateField()
+    next_date = models.DateField()
+
+    class Meta:
+        indexes = [models.Index(fields=['user', 'next_date'], name='recurring_user_next')]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.label} ({self.cadence}): ₹{self.amount}"
+
+# Data version a user's recurring transactions were last detected from
+class RecurrenceScan(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name="recurrence_scan")
+    data_version = models.PositiveBigIntegerField()
+    scanned_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user_id} - v{self.data_version}"
+
 # Chat History
 class ChatHistory(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
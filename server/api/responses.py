@@ -0,0 +1,34 @@
+import json
+from rest_framework.response import Response
+
+
+class PrerenderedResponse(Response):
+    """A DRF ``Response`` whose body was rendered earlier, e.g. taken from a cache.
+
+    The renderer is skipped entirely. ``.data`` is decoded from the JSON body
+    only if something (typically a test) asks for it.
+    """
+
+    def __init__(self, content, data=None, **kwargs):
+        self._content_bytes = content
+        super().__init__(data=data, **kwargs)
+
+    @property
+    def data(self):
+        if self._data is None and self._content_bytes is not None:
+            self._data = json.loads(self._content_bytes)
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+
+    @property
+    def rendered_content(self):
+        renderer = self.accepted_renderer
+        if self.content_type is None:
+            self.content_type = (
+                f"{renderer.media_type}; charset={renderer.charset}" if renderer.charset else renderer.media_type
+            )
+        self['Content-Type'] = self.content_type
+        return self._content_bytes
@@ -1,9 +1,17 @@
-from rest_framework import serializers
+from rest_framework import ISO_8601, serializers
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.contrib.auth.password_validation import validate_password
-from django.core.validators import MinValueValidator, EmailValidator
+from django.core.validators import MaxValueValidator, MinValueValidator, EmailValidator
 from datetime import date
-from .models import FinancialProfile, Income, Expense, Investment
+from decimal import Decimal
+from .models import FinancialProfile, Income, Expense, Investment, Budget, ExpenseAnomaly, RecurringTransaction
+from .services.dimensions import normalize_label
+from .services.projections import MAX_INTEREST_RATE, MAX_YEARS
+from .services.recurring import is_active, monthly_equivalent
+from .services.search import KINDS as SEARCH_KINDS
+from .services.trends import MAX_BUCKETS, PERIODS, bucket_count, default_start
+from .services.users import find_registration_conflicts
 
 class FinancialProfileSerializer(serializers.ModelSerializer):
     age = serializers.IntegerField(
@@ -72,6 +80,25 @@ class ExpenseSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Category must be at least 3 characters long")
         return value.strip()
 
+class ExpenseAnomalySerializer(serializers.ModelSerializer):
+    expense = ExpenseSerializer(read_only=True)
+    z_score = serializers.SerializerMethodField()
+    category_mean = serializers.SerializerMethodField()
+    category_std = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ExpenseAnomaly
+        fields = ['expense', 'z_score', 'category_mean', 'category_std', 'flagged_at']
+
+    def get_z_score(self, obj):
+        return round(obj.z_score, 2)
+
+    def get_category_mean(self, obj):
+        return round(obj.category_mean, 2)
+
+    def get_category_std(self, obj):
+        return round(obj.category_std, 2)
+
 class InvestmentSerializer(serializers.ModelSerializer):
     amount_invested = serializers.DecimalField(
         max_digits=12,
@@ -88,12 +115,18 @@ class InvestmentSerializer(serializers.ModelSerializer):
         decimal_places=2,
         required=False,
         allow_null=True,
-        validators=[MinValueValidator(0, message="Interest rate cannot be negative")]
+        validators=[
+            MinValueValidator(0, message="Interest rate cannot be negative"),
+            MaxValueValidator(MAX_INTEREST_RATE, message="Interest rate cannot exceed %(limit_value)s%%"),
+        ]
     )
     years = serializers.IntegerField(
         required=False,
         allow_null=True,
-        validators=[MinValueValidator(1, message="Years must be at least 1")]
+        validators=[
+            MinValueValidator(1, message="Years must be at least 1"),
+            MaxValueValidator(MAX_YEARS, message="Years cannot exceed %(limit_value)s"),
+        ]
     )
     date_invested = serializers.DateField()
 
@@ -124,6 +157,47 @@ class InvestmentSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError(errors)
         return data
 
+class BudgetSerializer(serializers.ModelSerializer):
+    monthly_limit = serializers.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        validators=[MinValueValidator(0.01, message="Monthly limit must be greater than 0")]
+    )
+
+    class Meta:
+        model = Budget
+        fields = ['id', 'category', 'monthly_limit']
+        read_only_fields = ['id']
+
+    def validate_category(self, value):
+        value = value.strip()
+        if len(value) < 3:
+            raise serializers.ValidationError("Category must be at least 3 characters long")
+        # Spellings differing only in case or spacing are the same category
+        budgets = Budget.objects.filter(user=self.context['request'].user, category_ref__key=normalize_label(value))
+        if self.instance is not None:
+            budgets = budgets.exclude(pk=self.instance.pk)
+        if budgets.exists():
+            raise serializers.ValidationError("You already have a budget for this category")
+        return value
+
+class BudgetStatusSerializer(serializers.ModelSerializer):
+    spent = serializers.DecimalField(max_digits=14, decimal_places=2, read_only=True)
+    remaining = serializers.DecimalField(max_digits=14, decimal_places=2, read_only=True)
+    transactions = serializers.IntegerField(read_only=True)
+    percent_used = serializers.SerializerMethodField()
+    over_budget = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Budget
+        fields = ['id', 'category', 'monthly_limit', 'spent', 'remaining', 'percent_used', 'over_budget', 'transactions']
+
+    def get_percent_used(self, obj):
+        return round(float(obj.spent / obj.monthly_limit * 100), 1)
+
+    def get_over_budget(self, obj):
+        return obj.spent > obj.monthly_limit
+
 class UserSerializer(serializers.ModelSerializer):
     email = serializers.EmailField(
         validators=[EmailValidator(message="Enter a valid email address")]
@@ -150,6 +224,21 @@ class UserDashboardSerializer(serializers.ModelSerializer):
                  'financial_profile', 'incomes', 'expenses', 'investments']
         read_only_fields = ['id', 'username', 'email']
 
+class RecurringTransactionSerializer(serializers.ModelSerializer):
+    monthly_amount = serializers.SerializerMethodField()
+    active = serializers.SerializerMethodField()
+
+    class Meta:
+        model = RecurringTransaction
+        fields = ['kind', 'label', 'cadence', 'interval_days', 'amount', 'monthly_amount', 'occurrences',
+                  'first_date', 'last_date', 'next_date', 'active']
+
+    def get_monthly_amount(self, obj):
+        return str(monthly_equivalent(obj))
+
+    def get_active(self, obj):
+        return is_active(obj, self.context['today'])
+
 class RegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(
         write_only=True,
@@ -180,14 +269,11 @@ class RegisterSerializer(serializers.ModelSerializer):
         if attrs['password'] != attrs['password2']:
             raise serializers.ValidationError({"password": "Password fields didn't match."})
         
-        # Validate username
-        username = attrs.get('username', '').lower()
-        if User.objects.filter(username__iexact=username).exists():
+        # Validate username and email (case-insensitive) in a single query
+        conflicts = find_registration_conflicts(attrs.get('username', ''), attrs.get('email', ''))
+        if 'username' in conflicts:
             raise serializers.ValidationError({"username": "A user with that username already exists."})
-        
-        # Validate email
-        email = attrs.get('email', '').lower()
-        if User.objects.filter(email__iexact=email).exists():
+        if 'email' in conflicts:
             raise serializers.ValidationError({"email": "A user with that email already exists."})
             
         return attrs
@@ -234,4 +320,80 @@ class AILoanAnalysisRequestSerializer(serializers.Serializer):
     existing_loan_emi = serializers.DecimalField(max_digits=12, decimal_places=2, required=False, default=0)
 
 class AILoanAnalysisResponseSerializer(serializers.Serializer):
-    advice = serializers.CharField()
\ No newline at end of file
+    advice = serializers.CharField()
+
+class TrendsQuerySerializer(serializers.Serializer):
+    period = serializers.ChoiceField(choices=list(PERIODS), default='month')
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    window = serializers.IntegerField(min_value=1, max_value=36, default=3,
+                                      help_text="Buckets per moving average")
+
+    def validate(self, data):
+        end = data.setdefault('end', date.today())
+        start = data.setdefault('start', default_start(end, data['period']))
+        if start > end:
+            raise serializers.ValidationError({"start": "Start date must not be after the end date."})
+        if bucket_count(start, end, data['period']) > MAX_BUCKETS:
+            raise serializers.ValidationError(
+                {"period": f"The range spans more than {MAX_BUCKETS} {data['period']} buckets; use a longer period."}
+            )
+        return data
+
+class BudgetStatusQuerySerializer(serializers.Serializer):
+    month = serializers.DateField(required=False, input_formats=['%Y-%m', ISO_8601],
+                                  help_text="Month as YYYY-MM; defaults to the current month")
+
+    def validate_month(self, value):
+        return value.replace(day=1)
+
+class PortfolioQuerySerializer(serializers.Serializer):
+    holdings = serializers.BooleanField(default=True, help_text="Include per-holding returns")
+
+class ProjectionQuerySerializer(serializers.Serializer):
+    holdings = serializers.BooleanField(default=False, help_text="Include each holding's own curves")
+
+class RecurringQuerySerializer(serializers.Serializer):
+    kind = serializers.ChoiceField(choices=RecurringTransaction.KIND_CHOICES, required=False,
+                                   help_text="Only income or only expense recurrences")
+    include_inactive = serializers.BooleanField(default=False, help_text="Include series that have stopped")
+
+class SearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(min_length=2, max_length=100,
+                              help_text="Text to find in expense categories, income sources and investment names")
+    kind = serializers.ChoiceField(choices=SEARCH_KINDS, required=False, help_text="Only search one kind of row")
+
+class SearchResultSerializer(serializers.Serializer):
+    kind = serializers.CharField()
+    id = serializers.IntegerField()
+    label = serializers.CharField(help_text="Category, source or investment name, as entered")
+    amount = serializers.DecimalField(max_digits=12, decimal_places=2, source='result_amount')
+    date = serializers.DateField(source='result_date')
+    score = serializers.FloatField(help_text="Relevance to the query, from 0 to 1")
+
+class GoalSimulationRequestSerializer(serializers.Serializer):
+    goal_amount = serializers.DecimalField(max_digits=14, decimal_places=2, min_value=Decimal(1))
+    target_age = serializers.IntegerField(min_value=19, max_value=100)
+    monthly_savings = serializers.DecimalField(
+        max_digits=12, decimal_places=2, min_value=Decimal(0), required=False,
+        help_text="Defaults to the financial profile's monthly savings"
+    )
+    current_savings = serializers.DecimalField(
+        max_digits=14, decimal_places=2, min_value=Decimal(0), required=False,
+        help_text="Defaults to the current value of all investments"
+    )
+    risk_tolerance = serializers.ChoiceField(
+        choices=["low", "medium", "high"], required=False,
+        help_text="Defaults to the financial profile's risk tolerance"
+    )
+    annual_step_up = serializers.DecimalField(
+        max_digits=5, decimal_places=2, min_value=Decimal(0), max_value=Decimal(50), default=0,
+        help_text="Yearly increase of the monthly savings, in percent"
+    )
+    paths = serializers.IntegerField(min_value=1000, required=False)
+    seed = serializers.IntegerField(min_value=0, required=False, help_text="Fix for reproducible results")
+
+    def validate_paths(self, value):
+        if value > settings.MONTE_CARLO['MAX_PATHS']:
+            raise serializers.ValidationError(f"At most {settings.MONTE_CARLO['MAX_PATHS']} paths are allowed")
+        return value
@@ -1,10 +1,19 @@
 import json
+import logging
+import time
 import requests
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 from django.shortcuts import get_object_or_404
 from django.contrib.auth.models import User
 from api.models import FinancialProfile, Income, Expense, Investment
+from api.services.model_router import candidate_models, get_routing_config, model_health
+from api.services.llm_metrics import llm_metrics
+from api.services.semantic_cache import chat_answer_cache, snapshot_key
 import os
 
+logger = logging.getLogger(__name__)
+
 API_KEY = os.getenv("GROQ_API_KEY")
 
 def get_user_financial_data(user_id):
@@ -41,14 +50,68 @@ def get_user_financial_data(user_id):
     {investment_details if investment_details else "No investment details provided."}
     """
 
-def query_ai_for_advice(user_id, user_message=None, mode="normal", context=None, loan_details=None):
-    """Queries AI for financial advice. Supports normal mode, chat mode, similar investments mode, and loan mode."""
-    api_url = "https://api.groq.com/openai/v1/chat/completions"
+def query_ai(messages, mode="normal", user_id=None, cache_hit=None):
+    """Sends messages to the model routed for this mode, falling back to the next model on errors or timeouts."""
+    api_url = settings.GROQ_API_URL
     headers = {
         "Authorization": f"Bearer {API_KEY}",
         "Content-Type": "application/json"
     }
+    timeout = get_routing_config()['TIMEOUT']
+    prompt_chars = sum(len(message.get("content") or "") for message in messages)
+
+    models = candidate_models(mode, prompt_chars)
+    if not models:
+        raise ImproperlyConfigured(f"AI_MODEL_ROUTING has no models for mode {mode!r}")
+    # A demoted model due a probe goes first, so the probe is actually made
+    probe = next((model for model in models if model_health.claim_probe(model)), None)
+    if probe is not None:
+        models.remove(probe)
+        models.insert(0, probe)
+
+    last_error = None
+    for attempt, model in enumerate(models):
+        # A cache miss is one per request, not one per fallback attempt
+        outcome = cache_hit if attempt == 0 else None
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": 0.7
+        }
+        started = time.monotonic()
+        ttfb = None
+        try:
+            # Streaming the body lets response.elapsed measure time to first byte separately from the download
+            response = requests.post(api_url, headers=headers, data=json.dumps(payload), timeout=timeout, stream=True)
+            ttfb = response.elapsed.total_seconds()
+            response.raise_for_status()
+            ai_response = response.json()
+        except (requests.RequestException, ValueError) as e:
+            latency = time.monotonic() - started
+            model_health.record(model, latency, ok=False)
+            llm_metrics.record_call(
+                mode, model, user_id=user_id, prompt_chars=prompt_chars, ttfb=ttfb,
+                latency=latency, retries=attempt, cache_hit=outcome, ok=False
+            )
+            logger.warning("AI model %s failed for mode %s: %s", model, mode, e)
+            last_error = e
+            continue
+
+        latency = time.monotonic() - started
+        usage = ai_response.get("usage") or {}
+        model_health.record(model, latency, ok=True)
+        llm_metrics.record_call(
+            mode, model, user_id=user_id, prompt_chars=prompt_chars,
+            prompt_tokens=usage.get("prompt_tokens"), completion_tokens=usage.get("completion_tokens"),
+            ttfb=ttfb, latency=latency, retries=attempt, cache_hit=outcome
+        )
+        # Extract AI response
+        return ai_response.get("choices", [{}])[0].get("message", {}).get("content", "No response from AI.")
+
+    raise last_error
 
+def query_ai_for_advice(user_id, user_message=None, mode="normal", context=None, loan_details=None):
+    """Queries AI for financial advice. Supports normal mode, chat mode, similar investments mode, and loan mode."""
     if mode == "normal":
         # Generate financial insights
         financial_data = get_user_financial_data(user_id)
@@ -60,6 +123,20 @@ def query_ai_for_advice(user_id, user_message=None, mode="normal", context=None,
     elif mode == "chat":
         # Initialize chat with user's financial context
         financial_context = get_user_financial_data(user_id)
+
+        # Near-duplicate questions about unchanged financial data reuse the earlier answer
+        snapshot = snapshot_key(financial_context)
+        if not context:
+            started = time.monotonic()
+            cached_answer = chat_answer_cache.lookup(user_id, snapshot, user_message)
+            if cached_answer is not None:
+                llm_metrics.record_call(
+                    mode, "cache", user_id=user_id, prompt_chars=len(user_message),
+                    latency=time.monotonic() - started, cache_hit=True
+                )
+                logger.info("AI chat cache hit for user %s", user_id)
+                return cached_answer
+
         messages = [
             {
                 "role": "system", 
@@ -73,6 +150,11 @@ def query_ai_for_advice(user_id, user_message=None, mode="normal", context=None,
             
         # Add current user message
         messages.append({"role": "user", "content": user_message})
+
+        answer = query_ai(messages, mode, user_id=user_id, cache_hit=None if context else False)
+        if not context and answer != "No response from AI.":
+            chat_answer_cache.store(user_id, snapshot, user_message, answer)
+        return answer
     
     elif mode == "similar_investments":
         # Get user's financial profile and investment data
@@ -103,7 +185,7 @@ Expected returns and key benefits in a single line.
                 {"role": "user", "content": prompt}
             ]
             
-            return query_ai(messages)
+            return query_ai(messages, mode, user_id=user_id)
         
         # Check if there are any stock investments
         stock_investments = [inv for inv in investments if inv.investment_type == 'stocks']
@@ -226,17 +308,7 @@ The user's current financial profile:
             {"role": "user", "content": prompt}
         ]
     
-    payload = {
-        "model": "llama-3.3-70b-versatile",
-        "messages": messages,
-        "temperature": 0.7
-    }
-
-    response = requests.post(api_url, headers=headers, data=json.dumps(payload))
-    ai_response = response.json()
-
-    # Extract AI response
-    return ai_response.get("choices", [{}])[0].get("message", {}).get("content", "No response from AI.")
+    return query_ai(messages, mode, user_id=user_id)
 
 def get_financial_advice(user_id, mode="normal", user_message=None, context=None, loan_details=None):
     """Handles financial insights (normal mode) or user chat (chat mode)."""
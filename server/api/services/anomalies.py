@@ -0,0 +1,166 @@
+"""Online per-category expense statistics, and flags for unusually large expenses.
+
+``CategoryStats`` keeps Welford's running count, mean and M2 per (user,
+category), updated as expenses are created, edited and deleted. A saved
+expense is scored against its category's statistics *before* it is added,
+so detection costs one row read, never a scan of the user's history.
+Expenses scoring at least ``Z_THRESHOLD`` standard deviations above the mean
+are recorded as ``ExpenseAnomaly`` rows.
+"""
+import math
+import threading
+from contextlib import contextmanager
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Count, F, Variance
+from api.models import CategoryStats, Expense, ExpenseAnomaly
+
+# Keeps a category of near-identical amounts from flagging every small rise
+MIN_RELATIVE_STD = 0.05
+
+_batch = threading.local()
+
+
+def add_sample(state, value):
+    count, mean, m2 = state
+    count += 1
+    delta = value - mean
+    mean += delta / count
+    return count, mean, m2 + delta * (value - mean)
+
+
+def remove_sample(state, value):
+    count, mean, m2 = state
+    if count <= 1:
+        return 0, 0.0, 0.0
+    previous_mean = (count * mean - value) / (count - 1)
+    # Rounding can leave a tiny negative sum of squares
+    return count - 1, previous_mean, max(m2 - (value - previous_mean) * (value - mean), 0.0)
+
+
+def z_score(state, value):
+    """How many standard deviations ``value`` is above the category mean, or None with too few samples."""
+    count, mean, m2 = state
+    if count < settings.EXPENSE_ANOMALIES['MIN_SAMPLES']:
+        return None
+    std = max(math.sqrt(m2 / (count - 1)), MIN_RELATIVE_STD * abs(mean))
+    return (value - mean) / std if std else None
+
+
+def _apply(operations):
+    # One locked read of every affected row, then one upsert. In a transaction of its own, as saves
+    # from the shell or scripts aren't in one and select_for_update needs one
+    keys = {(user_id, category) for user_id, category, *_ in operations}
+    with transaction.atomic(savepoint=False):
+        # A row has to exist to be locked: without it, two first samples of a category would both be
+        # written as the only one
+        CategoryStats.objects.bulk_create(
+            [CategoryStats(user_id=user_id, category_id=category, count=0, mean=0.0, m2=0.0)
+             for user_id, category in keys],
+            ignore_conflicts=True,
+        )
+        rows = CategoryStats.objects.select_for_update().filter(
+            user_id__in={user_id for user_id, _ in keys}, category_id__in={category for _, category in keys},
+        ).order_by('user_id', 'category_id').values_list('user_id', 'category_id', 'count', 'mean', 'm2')
+        states = {(user_id, category): state for user_id, category, *state in rows if (user_id, category) in keys}
+
+        threshold = settings.EXPENSE_ANOMALIES['Z_THRESHOLD']
+        flagged, cleared = {}, set()
+        for user_id, category, amount, expense_id, replaced in operations:
+            key = (user_id, category)
+            state = states.get(key, (0, 0.0, 0.0))
+            if expense_id is None:
+                states[key] = remove_sample(state, amount)
+                continue
+            score = z_score(state, amount)
+            if score is not None and score >= threshold:
+                count, mean, m2 = state
+                flagged[expense_id] = ExpenseAnomaly(
+                    expense_id=expense_id, user_id=user_id, z_score=score,
+                    category_mean=mean, category_std=math.sqrt(m2 / (count - 1)),
+                )
+            elif replaced:
+                cleared.add(expense_id)
+            states[key] = add_sample(state, amount)
+
+        CategoryStats.objects.bulk_create(
+            [CategoryStats(user_id=user_id, category_id=category, count=count, mean=mean, m2=m2)
+             for (user_id, category), (count, mean, m2) in states.items()],
+            update_conflicts=True, unique_fields=['user', 'category'], update_fields=['count', 'mean', 'm2'],
+        )
+        if flagged:
+            ExpenseAnomaly.objects.bulk_create(
+                flagged.values(), update_conflicts=True, unique_fields=['expense'],
+                update_fields=['z_score', 'category_mean', 'category_std', 'flagged_at'],
+            )
+        if cleared:
+            ExpenseAnomaly.objects.filter(expense_id__in=cleared).delete()
+
+
+def _record(operations):
+    pending = getattr(_batch, 'operations', None)
+    if pending is not None:
+        pending.extend(operations)
+    else:
+        _apply(operations)
+
+
+@contextmanager
+def batched_category_stats():
+    """Apply statistics updates together when the block exits, in the order they were made.
+
+    Use inside the transaction doing the writes, next to ``batched_spend_updates``.
+    """
+    if getattr(_batch, 'operations', None) is not None:
+        # Nested: the outermost block applies the updates
+        yield
+        return
+
+    _batch.operations = []
+    try:
+        yield
+    finally:
+        operations, _batch.operations = _batch.operations, None
+    if operations:
+        _apply(operations)
+
+
+def record_expense_stats(expense, previous=None):
+    """Score a saved expense against its category and add it to the statistics.
+
+    ``previous`` is its stored ``(category id, amount, date_spent)`` before an
+    update; that sample is removed first, so an edited expense is scored
+    against the others, and loses its flag if it no longer stands out.
+    """
+    operations = []
+    if previous is not None:
+        old_category, old_amount, _ = previous
+        operations.append((expense.user_id, old_category, float(old_amount), None, False))
+    operations.append((expense.user_id, expense.category_ref_id, float(expense.amount), expense.pk, previous is not None))
+    _record(operations)
+
+
+def discard_expense_stats(expense, stored):
+    category, amount, _ = stored
+    _record([(expense.user_id, category, float(amount), None, False)])
+
+
+def rebuild_category_stats(user_ids):
+    """Recompute the statistics of ``user_ids`` from their expenses, e.g. after bulk imports.
+
+    Existing flags are kept; imported rows aren't scored.
+    """
+    user_ids = list(user_ids)
+    CategoryStats.objects.filter(user_id__in=user_ids).delete()
+    rows = (
+        Expense.objects.filter(user_id__in=user_ids)
+        .values('user_id', category_id=F('category_ref'))
+        .annotate(count=Count('id'), mean=Avg('amount'), variance=Variance('amount'))
+        .order_by()
+    )
+    return len(CategoryStats.objects.bulk_create(
+        (CategoryStats(user_id=row['user_id'], category_id=row['category_id'], count=row['count'], mean=float(row['mean']),
+                       m2=float(row['variance'] or 0) * row['count'])
+         for row in rows.iterator()),
+        batch_size=5000,
+    ))
@@ -0,0 +1,125 @@
+"""Running per-category monthly spend totals, and budget status read from them.
+
+``CategorySpend`` holds one row per (user, category, month). Expense signals
+apply each create, update and delete to it as a delta, so reading budget
+status never sums the expense table.
+"""
+import threading
+from contextlib import contextmanager
+from decimal import Decimal
+from django.db import connection
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, TruncMonth
+from api.models import Budget, CategorySpend, Expense
+
+_batch = threading.local()
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def _apply(deltas):
+    # One upsert for every bucket: no read-then-create round trips, and
+    # concurrent writers to the same bucket serialize on its unique index
+    table = CategorySpend._meta.db_table
+    rows = [
+        (user_id, category, connection.ops.adapt_datefield_value(month), connection.ops.adapt_decimalfield_value(amount), count)
+        for (user_id, category, month), (amount, count) in deltas.items()
+    ]
+    sql = (
+        f"INSERT INTO {table} (user_id, category_id, month, total, transactions) "
+        f"VALUES {', '.join(['(%s, %s, %s, %s, %s)'] * len(rows))} "
+        f"ON CONFLICT (user_id, category_id, month) DO UPDATE SET "
+        f"total = {table}.total + EXCLUDED.total, transactions = {table}.transactions + EXCLUDED.transactions"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [value for row in rows for value in row])
+
+
+def record_spend(deltas):
+    """Add ``{(user_id, category id, month): (amount, count)}`` to the running totals.
+
+    Runs inside the caller's transaction, as one statement. Inside
+    ``batched_spend_updates`` the deltas are merged and applied together when
+    the block exits.
+    """
+    pending = getattr(_batch, 'deltas', None)
+    if pending is None:
+        deltas = {key: delta for key, delta in deltas.items() if any(delta)}
+        if deltas:
+            _apply(deltas)
+        return
+    for key, (amount, count) in deltas.items():
+        total, transactions = pending.get(key, (Decimal(0), 0))
+        pending[key] = (total + amount, transactions + count)
+
+
+@contextmanager
+def batched_spend_updates():
+    """Apply running-total changes in one statement when the block exits, instead of once per row.
+
+    Use inside the transaction doing the writes, next to ``batched_data_version_bumps``.
+    """
+    if getattr(_batch, 'deltas', None) is not None:
+        # Nested: the outermost block applies the deltas
+        yield
+        return
+
+    _batch.deltas = {}
+    try:
+        yield
+    finally:
+        deltas, _batch.deltas = _batch.deltas, None
+    record_spend(deltas)
+
+
+def expense_saved(expense, previous=None):
+    """Count a saved expense; ``previous`` is its stored ``(category id, amount, date_spent)`` before an update."""
+    new_key = (expense.user_id, expense.category_ref_id, month_start(expense.date_spent))
+    deltas = {new_key: (Decimal(str(expense.amount)), 1)}
+    if previous is not None:
+        old_category, old_amount, old_date = previous
+        old_key = (expense.user_id, old_category, month_start(old_date))
+        # Moving within one bucket nets out to a single update
+        total, count = deltas.get(old_key, (Decimal(0), 0))
+        deltas[old_key] = (total - Decimal(str(old_amount)), count - 1)
+    record_spend(deltas)
+
+
+def expense_deleted(expense, stored):
+    category, amount, day = stored
+    record_spend({(expense.user_id, category, month_start(day)): (-Decimal(str(amount)), -1)})
+
+
+def rebuild_category_spend(user_ids):
+    """Recompute the running totals of ``user_ids`` from their expenses.
+
+    For rows written without signals, e.g. ``bulk_create`` or ``COPY`` in seeding.
+    """
+    user_ids = list(user_ids)
+    CategorySpend.objects.filter(user_id__in=user_ids).delete()
+    rows = (
+        Expense.objects.filter(user_id__in=user_ids)
+        .annotate(month=TruncMonth('date_spent'))
+        .values('user_id', 'month', category_id=F('category_ref'))
+        .annotate(total=Sum('amount'), transactions=Count('id'))
+        .order_by()
+    )
+    return len(CategorySpend.objects.bulk_create((CategorySpend(**row) for row in rows.iterator()), batch_size=5000))
+
+
+def budget_status(user_id, month):
+    """The user's budgets annotated with what was spent against each in ``month``.
+
+    One query: each budget reads its running total through the
+    (user, category, month) unique index.
+    """
+    spend = CategorySpend.objects.filter(user_id=user_id, month=month, category=OuterRef('category_ref'))
+    return Budget.objects.filter(user_id=user_id).annotate(
+        spent=Coalesce(Subquery(spend.values('total')[:1]), Value(Decimal(0)),
+                       output_field=DecimalField(max_digits=14, decimal_places=2)),
+        transactions=Coalesce(Subquery(spend.values('transactions')[:1]), Value(0), output_field=IntegerField()),
+        remaining=ExpressionWrapper(F('monthly_limit') - F('spent'),
+                                    output_field=DecimalField(max_digits=14, decimal_places=2)),
+    ).order_by('category')
@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.cache import caches
+
+
+def _config():
+    return getattr(settings, 'DASHBOARD_CACHE', {})
+
+
+def _cache():
+    return caches[_config().get('ALIAS', 'default')]
+
+
+def _key(user_id):
+    return f"dashboard:{user_id}"
+
+
+def get_cached_dashboard(user_id, version, media_type):
+    """Return the rendered dashboard bytes if they were cached for this exact data version.
+
+    ``version`` is the ``(version, updated_at)`` pair from ``get_data_version``.
+    """
+    if not _config().get('ENABLED', True):
+        return None
+    entry = _cache().get(_key(user_id))
+    if entry and entry[0] == version and entry[1] == media_type:
+        return entry[2]
+    return None
+
+
+def store_dashboard(user_id, version, media_type, content):
+    if _config().get('ENABLED', True):
+        _cache().set(_key(user_id), (version, media_type, content))
+
+
+def invalidate_dashboard(user_id):
+    """Free the user's entry after a write; the version check alone already keeps reads correct."""
+    if _config().get('ENABLED', True):
+        _cache().delete(_key(user_id))
@@ -0,0 +1,57 @@
+import threading
+from contextlib import contextmanager
+from django.db.models import F
+from django.utils import timezone
+from api.models import UserDataVersion
+
+_batch = threading.local()
+
+
+def bump_data_version(user_id):
+    """Increment ``user_id``'s data version.
+
+    Runs inside the caller's transaction, so the new version becomes visible
+    atomically with the data it describes. Inside ``batched_data_version_bumps``
+    the bump is deferred and applied once per user.
+    """
+    pending = getattr(_batch, 'user_ids', None)
+    if pending is not None:
+        pending.add(user_id)
+        return
+
+    now = timezone.now()
+    if UserDataVersion.objects.filter(user_id=user_id).update(version=F('version') + 1, updated_at=now):
+        return
+    _, created = UserDataVersion.objects.get_or_create(user_id=user_id, defaults={'version': 1, 'updated_at': now})
+    if not created:
+        # Another request created the row first; still count this write
+        UserDataVersion.objects.filter(user_id=user_id).update(version=F('version') + 1, updated_at=now)
+
+
+@contextmanager
+def batched_data_version_bumps():
+    """Bump each affected user's version once when the block exits, instead of once per row.
+
+    Use inside the transaction doing the writes, e.g. for bulk creates::
+
+        with transaction.atomic(), batched_data_version_bumps():
+            ...
+    """
+    if getattr(_batch, 'user_ids', None) is not None:
+        # Nested: the outermost block applies the bumps
+        yield
+        return
+
+    _batch.user_ids = set()
+    try:
+        yield
+    finally:
+        user_ids, _batch.user_ids = _batch.user_ids, None
+    for user_id in user_ids:
+        bump_data_version(user_id)
+
+
+def get_data_version(user_id):
+    """Return ``(version, updated_at)`` for ``user_id``; ``(0, None)`` if they have never written."""
+    row = UserDataVersion.objects.filter(user_id=user_id).values_list('version', 'updated_at').first()
+    return row or (0, None)
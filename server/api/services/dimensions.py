@@ -0,0 +1,82 @@
+"""Interned expense categories and income sources.
+
+``ExpenseCategory`` and ``IncomeSource`` hold one row per normalized label,
+shared by all users. Transaction rows keep the label as entered, for display,
+and reference its dimension row. Aggregates group and join on those integer
+keys, so "Groceries" and "groceries " count as one category and indexes
+hold ints instead of strings.
+"""
+import threading
+from contextlib import contextmanager
+
+_batch = threading.local()
+
+
+def normalize_label(label):
+    """Dimension key for a label: case-folded, whitespace trimmed and collapsed."""
+    return ' '.join(label.split()).casefold()
+
+
+def dimension_model(model):
+    """The dimension table ``model`` (e.g. ``Expense``) interns its label in."""
+    return model._meta.get_field(model.DIMENSION_FIELD).related_model
+
+
+def ids_for(dimension, labels):
+    """``{label: id}`` for ``labels`` in ``dimension``, adding keys seen for the first time.
+
+    One query when every key exists, three otherwise; concurrent inserts of
+    the same new key resolve to the same row.
+    """
+    keys = {label: normalize_label(label) for label in set(labels)}
+    if not keys:
+        return {}
+    ids = dict(dimension.objects.filter(key__in=set(keys.values())).values_list('key', 'id'))
+    missing = {key: ' '.join(label.split()) for label, key in keys.items() if key not in ids}
+    if missing:
+        dimension.objects.bulk_create(
+            [dimension(key=key, name=name) for key, name in missing.items()], ignore_conflicts=True,
+        )
+        ids.update(dimension.objects.filter(key__in=list(missing)).values_list('key', 'id'))
+    return {label: ids[key] for label, key in keys.items()}
+
+
+def dimension_id(dimension, label):
+    cached = getattr(_batch, 'ids', None)
+    if cached is not None and (dimension, label) in cached:
+        return cached[(dimension, label)]
+    return ids_for(dimension, [label])[label]
+
+
+@contextmanager
+def batched_dimension_lookups(dimension, labels):
+    """Resolve ``labels`` in one lookup up front; saves inside the block reuse the ids.
+
+    Use around per-row saves of a bulk write, e.g. the API's bulk creates.
+    """
+    outer = getattr(_batch, 'ids', None)
+    _batch.ids = {**(outer or {}), **{(dimension, label): id for label, id in ids_for(dimension, labels).items()}}
+    try:
+        yield
+    finally:
+        _batch.ids = outer
+
+
+def assign_dimensions(model, objs):
+    """Point unsaved ``objs`` of ``model`` at their labels' dimension rows, for writes that skip ``save()``."""
+    pending = [obj for obj in objs if getattr(obj, f"{model.DIMENSION_FIELD}_id") is None]
+    ids = ids_for(dimension_model(model), [getattr(obj, model.LABEL_FIELD) for obj in pending])
+    for obj in pending:
+        setattr(obj, f"{model.DIMENSION_FIELD}_id", ids[getattr(obj, model.LABEL_FIELD)])
+    return objs
+
+
+def intern_label(instance):
+    """Set ``instance``'s dimension key from its label, unless the label is unchanged since it was loaded."""
+    model = type(instance)
+    label = getattr(instance, model.LABEL_FIELD)
+    attname = f"{model.DIMENSION_FIELD}_id"
+    if getattr(instance, attname) is not None and label == getattr(instance, '_interned_label', None):
+        return
+    setattr(instance, attname, dimension_id(dimension_model(model), label))
+    instance._interned_label = label
@@ -0,0 +1,102 @@
+import threading
+from collections import OrderedDict, defaultdict
+
+COUNTERS = (
+    'calls', 'errors', 'retries', 'cache_hits', 'cache_misses',
+    'prompt_chars', 'prompt_tokens', 'completion_tokens',
+)
+# Users with per-user aggregates; the least recently active are dropped beyond this
+MAX_TRACKED_USERS = 10000
+
+
+def _empty_aggregate():
+    aggregate = dict.fromkeys(COUNTERS, 0)
+    aggregate.update({'latency_total': 0.0, 'latency_max': 0.0, 'ttfb_total': 0.0, 'ttfb_samples': 0})
+    return aggregate
+
+
+def _add(aggregate, call):
+    aggregate['calls'] += 1
+    aggregate['errors'] += 0 if call['ok'] else 1
+    aggregate['retries'] += call['retries']
+    if call['cache_hit'] is True:
+        aggregate['cache_hits'] += 1
+    elif call['cache_hit'] is False:
+        aggregate['cache_misses'] += 1
+    aggregate['prompt_chars'] += call['prompt_chars']
+    aggregate['prompt_tokens'] += call['prompt_tokens'] or 0
+    aggregate['completion_tokens'] += call['completion_tokens'] or 0
+    aggregate['latency_total'] += call['latency']
+    aggregate['latency_max'] = max(aggregate['latency_max'], call['latency'])
+    if call['ttfb'] is not None:
+        aggregate['ttfb_total'] += call['ttfb']
+        aggregate['ttfb_samples'] += 1
+
+
+def _report(aggregate):
+    calls = aggregate['calls']
+    report = {key: aggregate[key] for key in COUNTERS}
+    report['latency_avg'] = round(aggregate['latency_total'] / calls, 4) if calls else None
+    report['latency_max'] = round(aggregate['latency_max'], 4)
+    report['ttfb_avg'] = (
+        round(aggregate['ttfb_total'] / aggregate['ttfb_samples'], 4) if aggregate['ttfb_samples'] else None
+    )
+    return report
+
+
+class LLMMetrics:
+    """In-process aggregation of LLM call statistics by mode/model and by user.
+
+    Per-user aggregates are kept for the ``max_users`` most recently active
+    users only, so a long-running process doesn't grow with its user count.
+    """
+
+    def __init__(self, max_users=MAX_TRACKED_USERS):
+        self._lock = threading.Lock()
+        self._max_users = max_users
+        self._by_mode = defaultdict(lambda: defaultdict(_empty_aggregate))
+        self._by_user = OrderedDict()
+
+    def record_call(self, mode, model, user_id=None, prompt_chars=0, prompt_tokens=None,
+                    completion_tokens=None, ttfb=None, latency=0.0, retries=0, cache_hit=None, ok=True):
+        """Record one LLM call; ``model`` is ``"cache"`` when the answer came from the chat cache."""
+        call = {
+            'prompt_chars': prompt_chars,
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'ttfb': ttfb,
+            'latency': latency,
+            'retries': retries,
+            'cache_hit': cache_hit,
+            'ok': ok,
+        }
+        with self._lock:
+            _add(self._by_mode[mode][model], call)
+            if user_id is not None:
+                if user_id not in self._by_user:
+                    self._by_user[user_id] = defaultdict(_empty_aggregate)
+                self._by_user.move_to_end(user_id)
+                _add(self._by_user[user_id][mode], call)
+                while len(self._by_user) > self._max_users:
+                    self._by_user.popitem(last=False)
+
+    def summary(self):
+        """Aggregates per mode, broken down by model."""
+        with self._lock:
+            return {
+                mode: {model: _report(aggregate) for model, aggregate in models.items()}
+                for mode, models in self._by_mode.items()
+            }
+
+    def user_summary(self, user_id):
+        """Aggregates per mode for a single user."""
+        with self._lock:
+            return {mode: _report(aggregate) for mode, aggregate in self._by_user.get(user_id, {}).items()}
+
+    def reset(self):
+        with self._lock:
+            self._by_mode.clear()
+            self._by_user.clear()
+
+
+llm_metrics = LLMMetrics()
@@ -0,0 +1,97 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubLLMServer:
+    """Local stand-in for the Groq chat completions API.
+
+    Answers OpenAI-style ``/chat/completions`` requests on localhost so routing,
+    retries and benchmarks can be exercised without network access. Per-model
+    ``delays`` (seconds) and ``failures`` (models that answer with HTTP 500)
+    make slow or broken upstream models easy to simulate.
+
+    Usage::
+
+        with StubLLMServer(delays={'llama-3.3-70b-versatile': 2}) as stub:
+            settings.GROQ_API_URL = stub.url
+    """
+
+    def __init__(self, reply="Stub advice.", delays=None, failures=None):
+        self.reply = reply
+        self.delays = dict(delays or {})
+        self.failures = set(failures or ())
+        self.requests = []
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/openai/v1/chat/completions"
+
+    @property
+    def models_called(self):
+        return [payload.get('model') for payload in self.requests]
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                payload = json.loads(self.rfile.read(length) or b'{}')
+                stub.requests.append(payload)
+                model = payload.get('model')
+
+                time.sleep(stub.delays.get(model, 0))
+                if model in stub.failures:
+                    status, body = 500, {"error": {"message": f"{model} unavailable"}}
+                else:
+                    prompt_tokens = sum(len(m.get('content', '').split()) for m in payload.get('messages', []))
+                    completion_tokens = len(stub.reply.split())
+                    status, body = 200, {
+                        "model": model,
+                        "choices": [{"message": {"role": "assistant", "content": stub.reply}}],
+                        "usage": {
+                            "prompt_tokens": prompt_tokens,
+                            "completion_tokens": completion_tokens,
+                            "total_tokens": prompt_tokens + completion_tokens,
+                        },
+                    }
+
+                data = json.dumps(body).encode()
+                try:
+                    self.send_response(status)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up waiting (timeout) before we answered.
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -0,0 +1,111 @@
+import threading
+import time
+from django.conf import settings
+
+DEFAULT_ROUTING = {
+    'ROUTES': {
+        'default': [
+            {'models': ['llama-3.3-70b-versatile', 'llama-3.1-8b-instant']},
+        ],
+    },
+    'TIMEOUT': 30,
+    'SLOW_LATENCY_SECONDS': 10.0,
+    'MAX_ERROR_RATE': 0.5,
+    'MIN_SAMPLES': 3,
+    'SMOOTHING': 0.3,
+    # A degraded model gets one probe call this often, so its averages can recover
+    'PROBE_INTERVAL_SECONDS': 60.0,
+}
+
+
+def get_routing_config():
+    """Return the AI_MODEL_ROUTING setting merged over the defaults."""
+    config = dict(DEFAULT_ROUTING)
+    config.update(getattr(settings, 'AI_MODEL_ROUTING', {}))
+    return config
+
+
+class ModelHealth:
+    """Thread-safe record of per-model latency and error rate.
+
+    Latency and error rate are exponentially weighted moving averages. A
+    demoted model is only tried after the healthy ones, so while they succeed it
+    would never be called again; instead the caller claims a probe of it once
+    per ``PROBE_INTERVAL_SECONDS`` (see ``claim_probe``) and tries it first, and
+    a model that recovers is promoted again after a few good calls.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, model, latency, ok):
+        alpha = get_routing_config()['SMOOTHING']
+        with self._lock:
+            stats = self._stats.setdefault(model, {'samples': 0, 'latency': latency, 'error_rate': 0.0})
+            stats['samples'] += 1
+            stats['last_call'] = time.monotonic()
+            stats['latency'] = (1 - alpha) * stats['latency'] + alpha * latency
+            stats['error_rate'] = (1 - alpha) * stats['error_rate'] + alpha * (0.0 if ok else 1.0)
+
+    @staticmethod
+    def _degraded(stats, config):
+        if not stats or stats['samples'] < config['MIN_SAMPLES']:
+            return False
+        return stats['latency'] > config['SLOW_LATENCY_SECONDS'] or stats['error_rate'] > config['MAX_ERROR_RATE']
+
+    def is_degraded(self, model):
+        config = get_routing_config()
+        with self._lock:
+            return self._degraded(self._stats.get(model), config)
+
+    def claim_probe(self, model):
+        """True if ``model`` is degraded and due a probe, which the caller must then make.
+
+        Claiming restarts the interval, so concurrent requests don't all probe the model at once.
+        """
+        config = get_routing_config()
+        with self._lock:
+            stats = self._stats.get(model)
+            if not self._degraded(stats, config):
+                return False
+            now = time.monotonic()
+            if now - stats['last_call'] < config['PROBE_INTERVAL_SECONDS']:
+                return False
+            stats['last_call'] = now
+            return True
+
+    def snapshot(self):
+        with self._lock:
+            return {model: dict(stats) for model, stats in self._stats.items()}
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+model_health = ModelHealth()
+
+
+def select_route(mode, prompt_chars):
+    """Pick the first routing rule for ``mode`` whose prompt size limit fits."""
+    routes = get_routing_config()['ROUTES']
+    rules = routes.get(mode) or routes['default']
+    for rule in rules:
+        limit = rule.get('max_prompt_chars')
+        if limit is None or prompt_chars <= limit:
+            return rule
+    return rules[-1]
+
+
+def candidate_models(mode, prompt_chars):
+    """Return the models to try for a request, healthiest first.
+
+    Models keep their configured order, but any model currently recorded as
+    slow or failing is moved behind the healthy ones so it is only used as a
+    last resort.
+    """
+    models = list(select_route(mode, prompt_chars)['models'])
+    healthy = [model for model in models if not model_health.is_degraded(model)]
+    degraded = [model for model in models if model not in healthy]
+    return healthy + degraded
@@ -0,0 +1,94 @@
+"""Monte Carlo simulation of reaching a savings goal by a target age.
+
+Each path draws one log-normal gross return per year, with mean and
+volatility set by the user's risk tolerance, and adds that year's monthly
+contributions (paid at the start of each month, growing at the year's
+rate). Paths are simulated as numpy vectors, one year per step, so 100k paths
+over a working life take a few hundred milliseconds.
+
+Large runs can be split over a process pool. Each worker simulates an equal
+share of independent paths; success counts are summed and percentile bands
+are averaged, which for equal chunks of i.i.d. paths matches the pooled
+percentiles to within sampling noise. This module doesn't touch the ORM, so
+workers start without setting up Django.
+"""
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from django.conf import settings
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def log_normal_parameters(mean, volatility):
+    """``(mu, sigma)`` of log gross returns whose gross return has this mean and standard deviation."""
+    sigma = np.sqrt(np.log1p((volatility / (1 + mean)) ** 2))
+    return np.log1p(mean) - sigma ** 2 / 2, sigma
+
+
+def simulate_paths(paths, years, initial, monthly_contribution, mean, volatility, goal, step_up=0.0, seed=None):
+    """Simulate ``paths`` paths; return ``(paths reaching goal, bands)``.
+
+    ``bands`` has one row per entry of ``PERCENTILES`` and one column per
+    year, holding the wealth percentiles at the end of that year.
+    """
+    rng = np.random.default_rng(seed)
+    mu, sigma = log_normal_parameters(mean, volatility)
+    wealth = np.full(paths, float(initial))
+    bands = np.empty((len(PERCENTILES), years))
+    contribution = float(monthly_contribution)
+    for year in range(years):
+        log_growth = rng.normal(mu, sigma, paths)
+        growth = np.exp(log_growth)
+        monthly = np.exp(log_growth / 12)
+        # Twelve start-of-month contributions compounding at the year's monthly rate
+        with np.errstate(divide='ignore', invalid='ignore'):
+            annuity = np.where(np.abs(monthly - 1) > 1e-12, (growth - 1) / (monthly - 1) * monthly, 12.0)
+        wealth = wealth * growth + contribution * annuity
+        bands[:, year] = np.percentile(wealth, PERCENTILES)
+        contribution *= 1 + step_up
+    return int(np.count_nonzero(wealth >= goal)), bands
+
+
+def _get_pool(workers):
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Workers never touch Django; forkserver/spawn avoid forking a threaded server
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context(method))
+            atexit.register(_pool.shutdown, cancel_futures=True)
+        return _pool
+
+
+def run_simulation(paths, years, initial, monthly_contribution, mean, volatility, goal, step_up=0.0, seed=None,
+                   workers=None):
+    """``simulate_paths``, split over ``MONTE_CARLO['WORKERS']`` processes when the run is big enough.
+
+    Returns ``(success probability, bands)``.
+    """
+    config = settings.MONTE_CARLO
+    workers = config['WORKERS'] if workers is None else workers
+    workers = max(1, min(workers, paths // config['MIN_PATHS_PER_WORKER']))
+    args = (years, initial, monthly_contribution, mean, volatility, goal, step_up)
+    if workers == 1:
+        successes, bands = simulate_paths(paths, *args, seed=seed)
+        return successes / paths, bands
+
+    # Independent, reproducible streams per worker
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    chunks = [paths * i // workers for i in range(workers + 1)]
+    pool = _get_pool(config['WORKERS'])
+    futures = [
+        pool.submit(simulate_paths, chunks[i + 1] - chunks[i], *args, seed=seeds[i])
+        for i in range(workers)
+    ]
+    results = [future.result() for future in futures]
+    successes = sum(result[0] for result in results)
+    bands = np.average([result[1] for result in results], axis=0, weights=np.diff(chunks))
+    return successes / paths, bands
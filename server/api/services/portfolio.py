@@ -0,0 +1,173 @@
+"""Absolute return, CAGR and XIRR for a user's investments, per holding, per type and overall.
+
+Each ``Investment`` row is held today at ``current_value``. Most rows are one
+lot, ``amount_invested`` paid out on ``date_invested``. A SIP's
+``amount_invested`` is its monthly instalment, as in ``services/projections.py``:
+one is paid on ``date_invested`` and on the same day of every month after,
+up to today or the end of its ``years``.
+
+Rates are computed on numpy arrays over all cash flows at once; XIRR for the
+portfolio, every type and every holding is solved together by one
+vectorized bisection. Money is summed as ``Decimal``, so totals are exact.
+"""
+from datetime import date
+from decimal import Decimal
+import numpy as np
+from api.models import Investment
+
+DAYS_PER_YEAR = 365.0
+# Returns over shorter periods are reported as absolute only, as fund statements do
+MIN_ANNUALIZED_DAYS = 365
+XIRR_BOUNDS = (-0.9999, 100.0)
+XIRR_ITERATIONS = 100
+
+
+def cagr(invested, current, years):
+    """Element-wise compound annual growth rate (NaN where ``years`` is zero)."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(years > 0, (current / invested) ** (1 / np.where(years > 0, years, 1)) - 1, np.nan)
+
+
+def xirr(groups, group_count, invested, years, current_totals):
+    """Annualized internal rate of return for each of ``group_count`` groups of cash flows.
+
+    Flow ``i`` of group ``groups[i]`` paid ``invested[i]`` ``years[i]`` ago; each
+    group is worth ``current_totals[g]`` today. The rate ``r`` solves
+    ``sum(invested * (1 + r) ** years) == current_total``, which is increasing
+    in ``r``, so bisection over all groups at once always converges. Groups
+    whose rate lies outside ``XIRR_BOUNDS`` get NaN.
+    """
+    def excess(rates):
+        grown = invested * (1 + rates[groups]) ** years
+        return np.bincount(groups, weights=grown, minlength=group_count) - current_totals
+
+    low = np.full(group_count, XIRR_BOUNDS[0])
+    high = np.full(group_count, XIRR_BOUNDS[1])
+    solvable = (excess(low) <= 0) & (excess(high) >= 0)
+    for _ in range(XIRR_ITERATIONS):
+        mid = (low + high) / 2
+        too_high = excess(mid) > 0
+        high = np.where(too_high, mid, high)
+        low = np.where(too_high, low, mid)
+    return np.where(solvable, (low + high) / 2, np.nan)
+
+
+def instalments(kinds, dates, years, today):
+    """``(flow holding index, flow date)`` arrays: one flow per lot, one per instalment paid so far per SIP.
+
+    An instalment falls on the day of month of ``date_invested``, or the last
+    day of a shorter month.
+    """
+    starts = np.array(dates, dtype='datetime64[D]')
+    start_months = starts.astype('datetime64[M]')
+    day_offsets = (starts - start_months.astype('datetime64[D]')).astype(int)
+    this_month = np.datetime64(today, 'M')
+    month_length = ((this_month + 1).astype('datetime64[D]') - this_month.astype('datetime64[D]')).astype(int)
+    # Months with an instalment due by today, counting this one once its day has come
+    due = (this_month - start_months).astype(int) + (today.day - 1 >= np.minimum(day_offsets, month_length - 1))
+    tenures = np.array([12 * term if term else np.iinfo(np.int64).max for term in years], dtype=np.int64)
+    counts = np.where(np.array(kinds) == 'sip', np.minimum(due, tenures), 1).clip(min=1)
+
+    holding = np.repeat(np.arange(len(dates)), counts)
+    months = start_months[holding] + (np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts))
+    lengths = ((months + 1).astype('datetime64[D]') - months.astype('datetime64[D]')).astype(int)
+    return holding, months.astype('datetime64[D]') + np.minimum(day_offsets[holding], lengths - 1)
+
+
+def _money(value):
+    return f"{value:.2f}"
+
+
+def _column(values, scale=1):
+    # Rounded to two places; NaN (not annualized, or no solution) becomes null
+    return [None if np.isnan(value) else value for value in np.round(values * scale, 2).tolist()]
+
+
+def get_portfolio_returns(user_id, include_holdings=True, today=None):
+    """Returns for ``user_id``'s whole portfolio, each investment type and optionally each holding.
+
+    Money is in rupees as decimal strings, rates in percent rounded to two
+    places. CAGR and XIRR are null when the amount-weighted holding period is
+    under ``MIN_ANNUALIZED_DAYS``.
+    """
+    today = today or date.today()
+    rows = list(
+        Investment.objects.filter(user_id=user_id).order_by('date_invested', 'id')
+        .values_list('id', 'name', 'investment_type', 'amount_invested', 'current_value', 'date_invested', 'years')
+    )
+    result = {'as_of': today, 'total': None, 'by_type': {}}
+    if include_holdings:
+        result['holdings'] = []
+    if not rows:
+        result['total'] = {'holdings': 0, 'amount_invested': _money(0), 'current_value': _money(0),
+                           'absolute_return': _money(0), 'return_pct': None, 'cagr_pct': None, 'xirr_pct': None}
+        return result
+
+    ids, names, kinds, amounts, values, dates, terms = zip(*rows)
+    types = [choice for choice, _ in Investment.INVESTMENT_TYPE_CHOICES]
+    types += sorted(set(kinds) - set(types))
+    holding, flow_dates = instalments(kinds, dates, terms, today)
+    counts = np.bincount(holding, minlength=len(rows))
+    invested = [amount * count for amount, count in zip(amounts, counts.tolist())]
+
+    # Group 0 is the whole portfolio, then one group per investment type, then
+    # one per holding; every flow belongs to three, so the flow arrays are stacked
+    type_index = {kind: i + 1 for i, kind in enumerate(types)}
+    first_holding = len(types) + 1
+    group_count = first_holding + len(rows)
+    flow_groups = np.concatenate((
+        np.zeros(len(holding), dtype=int),
+        np.array([type_index[kind] for kind in kinds])[holding],
+        first_holding + holding,
+    ))
+    flow_invested = np.tile(np.array(amounts, dtype=float)[holding], 3)
+    flow_years = np.tile((np.datetime64(today, 'D') - flow_dates).astype(float) / DAYS_PER_YEAR, 3)
+
+    holdings_per_group = np.zeros(group_count, dtype=int)
+    invested_totals = [Decimal(0)] * group_count
+    value_totals = [Decimal(0)] * group_count
+    for h, (kind, amount, value) in enumerate(zip(kinds, invested, values)):
+        for g in (0, type_index[kind], first_holding + h):
+            holdings_per_group[g] += 1
+            invested_totals[g] += amount
+            value_totals[g] += value
+
+    invested_array = np.array(invested_totals, dtype=float)
+    value_array = np.array(value_totals, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weighted_years = (
+            np.bincount(flow_groups, weights=flow_invested * flow_years, minlength=group_count) / invested_array
+        )
+        # Over the amount-weighted holding period, so staggered flows aren't annualized over the oldest one
+        annualized = weighted_years * DAYS_PER_YEAR >= MIN_ANNUALIZED_DAYS
+        rates = {
+            'return_pct': _column(value_array / invested_array - 1, 100),
+            'cagr_pct': _column(np.where(annualized, cagr(invested_array, value_array, weighted_years), np.nan), 100),
+            'xirr_pct': _column(
+                np.where(annualized, xirr(flow_groups, group_count, flow_invested, flow_years, value_array), np.nan),
+                100,
+            ),
+        }
+    summaries = [
+        {
+            'holdings': int(holdings_per_group[g]), 'amount_invested': _money(invested_totals[g]),
+            'current_value': _money(value_totals[g]), 'absolute_return': _money(value_totals[g] - invested_totals[g]),
+            **{name: column[g] for name, column in rates.items()},
+        }
+        for g in range(group_count)
+    ]
+    result['total'] = summaries[0]
+    result['by_type'] = {kind: summaries[type_index[kind]] for kind in types if holdings_per_group[type_index[kind]]}
+
+    if include_holdings:
+        days_held = (np.datetime64(today, 'D') - np.array(dates, dtype='datetime64[D]')).astype(int).tolist()
+        result['holdings'] = [
+            {
+                'id': id, 'name': name, 'investment_type': kind, 'date_invested': invested_on, 'days_held': days,
+                'instalments': int(count), **{key: value for key, value in summary.items() if key != 'holdings'},
+            }
+            for id, name, kind, invested_on, days, count, summary in zip(
+                ids, names, kinds, dates, days_held, counts.tolist(), summaries[first_holding:],
+            )
+        ]
+    return result
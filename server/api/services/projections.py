@@ -0,0 +1,148 @@
+"""Month-by-month projected value of SIP and FD holdings up to maturity.
+
+A SIP's ``amount_invested`` is its monthly instalment, paid at the start of
+each month for ``years`` years and growing at ``interest_rate`` per annum,
+compounded monthly. An FD's ``amount_invested`` is its principal, compounded
+quarterly at ``interest_rate`` as Indian banks do. Values are as of the end of
+each month, starting with the month of ``date_invested``; a matured holding
+keeps its maturity value.
+
+Terms are capped at ``MAX_YEARS`` and rates at ``MAX_INTEREST_RATE`` percent
+(see ``InvestmentSerializer``). Holdings saved before the caps that run past
+them, or whose value overflows, are left out.
+
+Holdings are projected together, a chunk at a time, as (holdings x months)
+arrays on a shared calendar axis, so aggregate curves are column sums.
+"""
+from datetime import date
+import numpy as np
+from django.db.models import FloatField
+from django.db.models.functions import Cast
+from api.models import Investment
+
+PROJECTED_TYPES = ('sip', 'fd')
+FD_COMPOUNDINGS_PER_YEAR = 4
+HOLDINGS_PER_CHUNK = 1024
+MAX_YEARS = 50
+MAX_INTEREST_RATE = 50
+
+
+def _month_index(day):
+    return day.year * 12 + day.month - 1
+
+
+def _month_start(index):
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def project(kinds, amounts, rates, tenures, starts, axis):
+    """``(invested, value)`` arrays of shape (holdings, months) for month indexes ``axis``.
+
+    ``kinds`` holds 'sip' or 'fd' per holding, ``rates`` are annual fractions,
+    ``tenures`` are in months and ``starts`` are month indexes.
+    """
+    is_sip = (kinds == 'sip')[:, None]
+    # Months completed by the end of each axis month, held at the tenure after maturity
+    offset = axis[None, :] - starts[:, None]
+    elapsed = np.clip(offset + 1, 0, tenures[:, None]).astype(float)
+    started = offset >= 0
+
+    monthly = (rates / 12)[:, None]
+    amounts = amounts[:, None]
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        # Annuity due: each instalment compounds from the start of its month
+        sip_value = np.where(
+            monthly > 0, amounts * ((1 + monthly) ** elapsed - 1) / monthly * (1 + monthly), amounts * elapsed,
+        )
+        fd_growth = (1 + rates[:, None] / FD_COMPOUNDINGS_PER_YEAR) ** (elapsed * FD_COMPOUNDINGS_PER_YEAR / 12)
+        fd_value = np.where(started, amounts * fd_growth, 0.0)
+    invested = np.where(is_sip, amounts * elapsed, np.where(started, amounts, 0.0))
+    value = np.where(is_sip, sip_value, fd_value)
+    return invested, value
+
+
+def _arrays(rows):
+    ids, names, kinds, amounts, rates, years, dates = zip(*rows)
+    return (
+        ids, names, kinds, np.array(kinds), np.array(amounts), np.array(rates) / 100, np.array(years) * 12,
+        np.array([_month_index(day) for day in dates]),
+    )
+
+
+def _column(values):
+    # Strings to the paisa, like the API's DecimalFields; "+ 0.0" turns a rounded -0.0 into 0.00
+    return [f"{value + 0.0:.2f}" for value in np.round(values, 2).tolist()]
+
+
+def get_projections(user_id, include_holdings=False):
+    """Projected invested amount and value per month for ``user_id``'s SIPs and FDs.
+
+    Returns aggregate curves for all of them and per type, each holding's
+    maturity, and with ``include_holdings`` each holding's own curves. Amounts
+    are rupees as decimal strings.
+    """
+    rows = list(
+        Investment.objects.filter(
+            user_id=user_id, investment_type__in=PROJECTED_TYPES, interest_rate__isnull=False, years__isnull=False,
+            years__lte=MAX_YEARS,
+        )
+        .order_by('date_invested', 'id')
+        .annotate(amount=Cast('amount_invested', FloatField()), rate=Cast('interest_rate', FloatField()))
+        .values_list('id', 'name', 'investment_type', 'amount', 'rate', 'years', 'date_invested')
+    )
+    result = {'months': [], 'total': {'invested': [], 'value': []}, 'by_type': {}, 'maturity': []}
+    if include_holdings:
+        result['holdings'] = []
+    if rows:
+        # Values only grow, so a holding whose maturity value is finite has a finite curve
+        _, _, _, kind_array, amounts, rates, tenures, starts = _arrays(rows)
+        _, matured = project(kind_array, amounts, rates, tenures, starts, np.array([(starts + tenures).max() - 1]))
+        rows = [row for row, finite in zip(rows, np.isfinite(matured[:, 0]).tolist()) if finite]
+    if not rows:
+        return result
+
+    ids, names, kinds, kind_array, amounts, rates, tenures, starts = _arrays(rows)
+    axis = np.arange(starts.min(), (starts + tenures).max())
+
+    totals = {kind: (np.zeros(len(axis)), np.zeros(len(axis))) for kind in PROJECTED_TYPES}
+    final_invested, final_value = np.empty(len(rows)), np.empty(len(rows))
+    curves = []
+    # Chunked so memory stays bounded however many holdings and months there are
+    for chunk in range(0, len(rows), HOLDINGS_PER_CHUNK):
+        part = slice(chunk, chunk + HOLDINGS_PER_CHUNK)
+        invested, value = project(kind_array[part], amounts[part], rates[part], tenures[part], starts[part], axis)
+        for kind, (kind_invested, kind_value) in totals.items():
+            of_kind = kind_array[part] == kind
+            kind_invested += invested[of_kind].sum(axis=0)
+            kind_value += value[of_kind].sum(axis=0)
+        # Every holding has matured by the last axis month
+        final_invested[part], final_value[part] = invested[:, -1], value[:, -1]
+        if include_holdings:
+            # Each holding's curves cover only its own tenure
+            for h, (first, tenure) in enumerate(zip((starts[part] - axis[0]).tolist(), tenures[part].tolist())):
+                curves.append((_column(invested[h, first:first + tenure]), _column(value[h, first:first + tenure])))
+
+    result['months'] = [_month_start(index) for index in axis.tolist()]
+    result['total'] = {
+        'invested': _column(sum(kind_invested for kind_invested, _ in totals.values())),
+        'value': _column(sum(kind_value for _, kind_value in totals.values())),
+    }
+    result['by_type'] = {
+        kind: {'invested': _column(kind_invested), 'value': _column(kind_value)}
+        for kind, (kind_invested, kind_value) in totals.items() if kind in kinds
+    }
+    start_months = [_month_start(index) for index in starts.tolist()]
+    maturity_months = [_month_start(index) for index in (starts + tenures - 1).tolist()]
+    result['maturity'] = [
+        {'id': id, 'investment_type': kind, 'maturity_month': month, 'invested': total_invested, 'value': total_value}
+        for id, kind, month, total_invested, total_value in zip(
+            ids, kinds, maturity_months, _column(final_invested), _column(final_value),
+        )
+    ]
+    if include_holdings:
+        result['holdings'] = [
+            {'id': id, 'name': name, 'investment_type': kind, 'start_month': start_month,
+             'invested': invested, 'value': value}
+            for id, name, kind, start_month, (invested, value) in zip(ids, names, kinds, start_months, curves)
+        ]
+    return result
@@ -0,0 +1,162 @@
+"""Recurring income and expenses (salary, rent, subscriptions) found in a user's history.
+
+Transactions of one kind are sorted once by normalized category or source,
+then amount, so each (label, amount band) group is a contiguous run. Each
+run is then checked for a regular gap between dates. Sorting dominates, so a
+whole history is scanned in O(n log n).
+
+Results are stored as ``RecurringTransaction`` rows along with the data
+version they were detected from. Readers re-detect only after the user's
+data has changed, and ``detect_recurring`` fills them for every user in
+batches. Storing locks the users' ``User`` rows, which unlike their data
+version rows always exist, so concurrent scans of one user store one set of
+results between them.
+"""
+import calendar
+import statistics
+from collections import Counter
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import groupby
+from operator import itemgetter
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import FloatField
+from django.db.models.functions import Cast
+from api.models import Expense, Income, RecurrenceScan, RecurringTransaction
+from api.services.dimensions import normalize_label
+
+# (name, period in days, tolerance in days, calendar months per step or 0)
+CADENCES = (
+    ('weekly', 7.0, 1.0, 0),
+    ('biweekly', 14.0, 2.0, 0),
+    ('monthly', 30.44, 4.0, 1),
+    ('quarterly', 91.31, 8.0, 3),
+    ('yearly', 365.25, 12.0, 12),
+)
+PERIODS = {name: (days, tolerance) for name, days, tolerance, _ in CADENCES}
+DAYS_PER_MONTH = 30.44
+MIN_OCCURRENCES = 3
+# A band spans amounts up to this much above its smallest, e.g. a salary varying by a few percent
+AMOUNT_TOLERANCE = 0.15
+# Share of gaps that must match the cadence; the rest can be missed or extra payments
+MIN_REGULARITY = 0.75
+
+SOURCES = (
+    ('income', Income, 'source', 'date_received'),
+    ('expense', Expense, 'category', 'date_spent'),
+)
+
+
+def add_months(day, months):
+    index = day.year * 12 + day.month - 1 + months
+    year, month = divmod(index, 12)
+    return date(year, month + 1, min(day.day, calendar.monthrange(year, month + 1)[1]))
+
+
+def _series(band):
+    # band: (key, amount, date, label) tuples of one label and amount band
+    if len(band) < MIN_OCCURRENCES:
+        return None
+    days = sorted(day for _, _, day, _ in band)
+    gaps = [(later - earlier).days for earlier, later in zip(days, days[1:])]
+    interval = statistics.median(gaps)
+    for name, period, tolerance, months in CADENCES:
+        if abs(interval - period) <= tolerance:
+            break
+    else:
+        return None
+    regular = sum(abs(gap - period) <= tolerance for gap in gaps)
+    if regular < MIN_REGULARITY * len(gaps) or regular + 1 < MIN_OCCURRENCES:
+        return None
+    return {
+        'label': Counter(' '.join(label.split()) for *_, label in band).most_common(1)[0][0],
+        'cadence': name,
+        'interval_days': float(interval),
+        'amount': Decimal(f"{statistics.median(amount for _, amount, _, _ in band):.2f}"),
+        'occurrences': len(band),
+        'first_date': days[0],
+        'last_date': days[-1],
+        'next_date': add_months(days[-1], months) if months else days[-1] + timedelta(days=period),
+    }
+
+
+def find_recurrences(transactions):
+    """Recurring series among ``(label, amount, date)`` transactions of one kind.
+
+    Returns a list of dicts with the series' most common label, cadence,
+    median interval and amount, occurrence count, first and last date, and
+    the date the next one is due.
+    """
+    found = []
+    ordered = sorted((normalize_label(label), amount, day, label) for label, amount, day in transactions)
+    for _, group in groupby(ordered, key=itemgetter(0)):
+        band = []
+        for item in group:
+            if band and item[1] > band[0][1] * (1 + AMOUNT_TOLERANCE):
+                found.append(_series(band))
+                band = []
+            band.append(item)
+        found.append(_series(band))
+    return [series for series in found if series is not None]
+
+
+def monthly_equivalent(recurrence):
+    """The recurrence's amount per average month, for forecasting."""
+    return Decimal(f"{float(recurrence.amount) * DAYS_PER_MONTH / PERIODS[recurrence.cadence][0]:.2f}")
+
+
+def is_active(recurrence, today):
+    """Still recurring: the next occurrence isn't overdue by more than the cadence's tolerance."""
+    return recurrence.next_date + timedelta(days=PERIODS[recurrence.cadence][1]) >= today
+
+
+def detect_recurrences(versions):
+    """Re-detect the recurrences of every user in ``{user_id: data version}``, replacing stored ones.
+
+    Pass the versions read *before* this call, so a write racing with the scan
+    leaves it stale rather than marking old results current. Users whose
+    stored results are already newer, from a concurrent scan, keep them.
+    Returns the number of recurrences stored.
+    """
+    user_ids = list(versions)
+    history = {user_id: {kind: [] for kind, *_ in SOURCES} for user_id in user_ids}
+    for kind, model, label_field, date_field in SOURCES:
+        rows = (
+            model.objects.filter(user_id__in=user_ids)
+            # Cast in SQL: building a Decimal per row costs more than the detection itself
+            .annotate(value=Cast('amount', FloatField()))
+            .values_list('user_id', label_field, 'value', date_field)
+            .order_by()
+        )
+        for user_id, label, amount, day in rows.iterator(chunk_size=5000):
+            history[user_id][kind].append((label, amount, day))
+
+    recurrences = [
+        RecurringTransaction(user_id=user_id, kind=kind, **series)
+        for user_id, kinds in history.items()
+        for kind, transactions in kinds.items()
+        for series in find_recurrences(transactions)
+    ]
+    with transaction.atomic():
+        # Concurrent scans of a user replace its results one after the other, never side by side
+        list(User.objects.select_for_update().filter(id__in=user_ids).order_by('id').values_list('id', flat=True))
+        scanned = RecurrenceScan.objects.filter(user_id__in=user_ids).values_list('user_id', 'data_version')
+        newer = {user_id for user_id, version in scanned if version > versions[user_id]}
+        if newer:
+            versions = {user_id: version for user_id, version in versions.items() if user_id not in newer}
+            recurrences = [recurrence for recurrence in recurrences if recurrence.user_id not in newer]
+        RecurringTransaction.objects.filter(user_id__in=list(versions)).delete()
+        RecurringTransaction.objects.bulk_create(recurrences, batch_size=5000)
+        RecurrenceScan.objects.bulk_create(
+            [RecurrenceScan(user_id=user_id, data_version=version) for user_id, version in versions.items()],
+            update_conflicts=True, unique_fields=['user'], update_fields=['data_version', 'scanned_at'],
+        )
+    return len(recurrences)
+
+
+def get_recurrences(user_id, version):
+    """``user_id``'s recurrences as of data ``version``, detected again first if their data has changed."""
+    if not RecurrenceScan.objects.filter(user_id=user_id, data_version=version).exists():
+        detect_recurrences({user_id: version})
+    return RecurringTransaction.objects.filter(user_id=user_id).order_by('kind', 'next_date', 'label')
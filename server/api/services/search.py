@@ -0,0 +1,113 @@
+"""Search a user's expenses, incomes and investments by category, source or name.
+
+Matching happens per distinct label, not per row. Expense categories and
+income sources are interned (see ``services/dimensions.py``), so the label
+lookups scan the small dimension tables and the user's own rows are then
+fetched by ``(user, label id)`` index ranges. Investment names are matched
+over the user's own holdings.
+
+On PostgreSQL, labels match by ``pg_trgm`` word similarity (typos like
+"grocerys" find "Groceries"), served by GIN trigram indexes. Elsewhere they
+match by substring only. Either way each label is scored once in Python with
+the same trigram measure, so rankings don't depend on the database.
+"""
+import re
+from django.db import connection
+from django.db.models import Case, CharField, F, FloatField, Q, Value, When
+from api.models import Expense, Income, Investment
+from api.services.dimensions import dimension_model, normalize_label
+
+KINDS = ('expense', 'income', 'investment')
+# Best-scoring labels per kind that a search returns rows for
+MAX_LABELS = 50
+
+_WORD = re.compile(r'[^\W_]+')
+
+
+def trigrams(text):
+    """``pg_trgm``'s trigrams: per lower-cased word, padded with two spaces before and one after."""
+    grams = set()
+    for word in _WORD.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def score(query, label):
+    """Relevance of ``label`` to ``query`` in [0, 1].
+
+    The mean of word similarity (how much of the query appears in the label)
+    and similarity (how much the two overlap overall), so an exact match
+    outranks a longer label containing the query, which outranks a typo.
+    """
+    wanted, found = trigrams(query), trigrams(label)
+    if not wanted or not found:
+        return 0.0
+    shared = len(wanted & found)
+    return round((shared / len(wanted) + shared / len(wanted | found)) / 2, 3)
+
+
+def _matching(queryset, field, query, substring='icontains'):
+    # Dimension keys are already case-folded, so they match with ``contains``, which their index can serve
+    if connection.vendor == 'postgresql':
+        return queryset.filter(Q(**{f"{field}__trigram_word_similar": query}) | Q(**{f"{field}__{substring}": query}))
+    return queryset.filter(**{f"{field}__{substring}": query})
+
+
+def _ranked(query, labels):
+    """``{label: score}`` for the ``MAX_LABELS`` best-scoring ``labels``."""
+    scores = sorted(((score(query, label), label) for label in labels), reverse=True)[:MAX_LABELS]
+    return {label: value for value, label in scores if value > 0}
+
+
+def _ranked_dimension_ids(model, user_id, key):
+    """``{dimension id: score}`` for the best labels among those the user's ``model`` rows use."""
+    used = model.objects.filter(user_id=user_id).values(model.DIMENSION_FIELD)
+    labels = dict(_matching(dimension_model(model).objects.filter(id__in=used), 'key', key, 'contains')
+                  .values_list('key', 'id'))
+    return {labels[label]: rank for label, rank in _ranked(key, labels).items()}
+
+
+def _rows(queryset, kind, label, amount, day, ranked, key):
+    return queryset.filter(**{f"{key}__in": list(ranked)}).values('id').annotate(
+        kind=Value(kind, output_field=CharField()),
+        label=F(label),
+        result_amount=F(amount),
+        result_date=F(day),
+        score=Case(*(When(**{key: value}, then=Value(rank)) for value, rank in ranked.items()),
+                   default=Value(0.0), output_field=FloatField()),
+    )
+
+
+def search_transactions(user_id, query, kinds=KINDS):
+    """The user's rows of ``kinds`` whose label matches ``query``, best match first, then newest.
+
+    Returns an unevaluated queryset of dicts (``id``, ``kind``, ``label``,
+    ``result_amount``, ``result_date``, ``score``), ready to count and slice
+    for pagination, or ``None`` when nothing matches. Each kind costs one
+    query for its labels.
+    """
+    key = normalize_label(query)
+    parts = []
+    if 'expense' in kinds:
+        ranked = _ranked_dimension_ids(Expense, user_id, key)
+        if ranked:
+            parts.append(_rows(Expense.objects.filter(user_id=user_id), 'expense', 'category', 'amount',
+                               'date_spent', ranked, 'category_ref'))
+    if 'income' in kinds:
+        ranked = _ranked_dimension_ids(Income, user_id, key)
+        if ranked:
+            parts.append(_rows(Income.objects.filter(user_id=user_id), 'income', 'source', 'amount',
+                               'date_received', ranked, 'source_ref'))
+    if 'investment' in kinds:
+        holdings = Investment.objects.filter(user_id=user_id)
+        names = _matching(holdings, 'name', key).values_list('name', flat=True).distinct()
+        ranked = _ranked(key, names)
+        if ranked:
+            parts.append(_rows(holdings, 'investment', 'name', 'amount_invested', 'date_invested', ranked, 'name'))
+
+    if not parts:
+        return None
+    first, *rest = parts
+    results = first.union(*rest, all=True) if rest else first
+    return results.order_by('-score', '-result_date', 'kind', '-id')
@@ -0,0 +1,249 @@
+"""Deterministic synthetic data for local development and performance testing.
+
+Every user's data is derived from ``(seed, user index)`` alone, so a dataset
+is reproducible regardless of batch size, write method or how many worker
+processes produced it.
+"""
+import csv
+import io
+import math
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection, connections
+from api.models import (
+    FinancialProfile, Income, Expense, Investment, Budget, CategorySpend, CategoryStats, ExpenseAnomaly,
+    RecurringTransaction, RecurrenceScan,
+)
+from api.services.anomalies import rebuild_category_stats
+from api.services.budgets import rebuild_category_spend
+from api.services.dimensions import assign_dimensions
+
+SEED_USER_PREFIX = "seed_user_"
+SEED_PASSWORD = "SeedPass123!"
+HISTORY_DAYS = 730
+
+FIRST_NAMES = ["Aarav", "Diya", "Vihaan", "Ananya", "Arjun", "Isha", "Kabir", "Meera", "Rohan", "Saanvi", "Vivaan", "Zara"]
+LAST_NAMES = ["Sharma", "Iyer", "Patel", "Reddy", "Gupta", "Nair", "Singh", "Menon", "Rao", "Das", "Kapoor", "Joshi"]
+
+# (category, relative frequency, typical amount as a share of salary or in ₹)
+EXPENSE_CATEGORIES = [
+    ("Rent", 0.06, 0.28),
+    ("Groceries", 0.24, 2500),
+    ("Transport", 0.16, 800),
+    ("Utilities", 0.08, 2200),
+    ("Dining", 0.15, 900),
+    ("Entertainment", 0.1, 1200),
+    ("Healthcare", 0.07, 2500),
+    ("Shopping", 0.14, 3000),
+]
+INCOME_SOURCES = [("Salary", 0.7), ("Freelancing", 0.12), ("Dividends", 0.08), ("Rental Income", 0.05), ("Bonus", 0.05)]
+INVESTMENTS = {
+    "stocks": (0.35, ["Reliance Industries", "TCS", "HDFC Bank", "Infosys", "ITC", "Larsen & Toubro"]),
+    "sip": (0.3, ["SBI Bluechip Fund", "Axis Midcap Fund", "Parag Parikh Flexi Cap", "Nifty 50 Index Fund"]),
+    "fd": (0.2, ["SBI Fixed Deposit", "HDFC Fixed Deposit", "Post Office Time Deposit"]),
+    "gold": (0.15, ["Gold ETF", "Sovereign Gold Bond", "Digital Gold"]),
+}
+# Share of a user's rows going to each model
+ROW_MIX = {Income: 0.2, Expense: 0.7, Investment: 0.1}
+
+
+def user_rng(seed, index):
+    return random.Random(f"{seed}:{index}")
+
+
+def money(value):
+    return Decimal(max(value, 1)).quantize(Decimal("0.01"))
+
+
+def build_user(index, password_hash):
+    username = f"{SEED_USER_PREFIX}{index:07d}"
+    return User(
+        username=username,
+        email=f"{username}@example.com",
+        first_name=FIRST_NAMES[index % len(FIRST_NAMES)],
+        last_name=LAST_NAMES[(index // len(FIRST_NAMES)) % len(LAST_NAMES)],
+        password=password_hash,
+    )
+
+
+def build_profile(user, rng):
+    age = int(min(max(rng.gauss(36, 11), 18), 75))
+    salary = int(min(max(rng.lognormvariate(math.log(60000), 0.6), 15000), 1_000_000)) // 100 * 100
+    if age < 30:
+        weights = (0.15, 0.35, 0.5)
+    elif age < 50:
+        weights = (0.25, 0.45, 0.3)
+    else:
+        weights = (0.5, 0.4, 0.1)
+    return FinancialProfile(
+        user=user,
+        age=age,
+        monthly_salary=salary,
+        monthly_savings=int(salary * rng.uniform(0.05, 0.35)) // 100 * 100,
+        risk_tolerance=rng.choices(["low", "medium", "high"], weights)[0],
+    )
+
+
+def transaction_rows(user, count, rng, monthly_salary, today=None):
+    """Yield ``count`` unsaved Income, Expense and Investment rows for ``user``."""
+    today = today or date.today()
+    user_id = user.pk  # Assigning the id skips the related-object descriptor on every row
+    categories, category_weights, typical = zip(*EXPENSE_CATEGORIES)
+    sources, source_weights = zip(*INCOME_SOURCES)
+    investment_types = list(INVESTMENTS)
+    investment_weights = [INVESTMENTS[kind][0] for kind in investment_types]
+    models = rng.choices(list(ROW_MIX), list(ROW_MIX.values()), k=count)
+
+    for model in models:
+        day = today - timedelta(days=rng.randrange(HISTORY_DAYS))
+        if model is Income:
+            source = rng.choices(sources, source_weights)[0]
+            if source == "Salary":
+                amount = monthly_salary * rng.uniform(0.97, 1.03)
+            else:
+                amount = rng.lognormvariate(math.log(monthly_salary * 0.2), 0.7)
+            yield Income(user_id=user_id, source=source, amount=money(amount), date_received=day)
+        elif model is Expense:
+            i = rng.choices(range(len(categories)), category_weights)[0]
+            median = typical[i] * monthly_salary if typical[i] < 1 else typical[i]
+            yield Expense(
+                user_id=user_id, category=categories[i], amount=money(rng.lognormvariate(math.log(median), 0.5)), date_spent=day,
+            )
+        else:
+            kind = rng.choices(investment_types, investment_weights)[0]
+            invested = money(rng.lognormvariate(math.log(25000), 0.8))
+            held_years = (today - day).days / 365
+            growth = {"stocks": rng.gauss(0.12, 0.2), "sip": rng.gauss(0.11, 0.1), "fd": 0.07, "gold": rng.gauss(0.09, 0.08)}[kind]
+            fixed_term = kind in ("sip", "fd")
+            yield Investment(
+                user_id=user_id,
+                name=rng.choice(INVESTMENTS[kind][1]),
+                investment_type=kind,
+                amount_invested=invested,
+                current_value=money(float(invested) * max(1 + growth, 0.2) ** held_years),
+                date_invested=day,
+                interest_rate=Decimal(str(round(rng.uniform(6.5, 12.5) if kind == "sip" else rng.uniform(6.0, 7.75), 2)))
+                if fixed_term else None,
+                years=rng.choice([3, 5, 10, 15]) if fixed_term else None,
+            )
+
+
+def copy_rows(model, objs):
+    """Write ``objs`` with Postgres ``COPY ... FROM STDIN`` (psycopg2 or psycopg 3)."""
+    fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for obj in objs:
+        writer.writerow(["" if value is None else value for value in (getattr(obj, f.attname) for f in fields)])
+    sql = f"COPY {model._meta.db_table} ({', '.join(f.column for f in fields)}) FROM STDIN WITH (FORMAT csv)"
+    with connection.cursor() as cursor:
+        raw = cursor.cursor
+        if hasattr(raw, 'copy_expert'):
+            buffer.seek(0)
+            raw.copy_expert(sql, buffer)
+        else:
+            with raw.copy(sql) as copy:
+                copy.write(buffer.getvalue())
+
+
+def write_rows(rows, batch_size, method="bulk"):
+    """Write an iterable of unsaved rows (of mixed models) in batches; returns rows written per model."""
+    pending = {}
+    written = {}
+
+    def flush(model):
+        objs = pending.pop(model, [])
+        if not objs:
+            return
+        if hasattr(model, 'DIMENSION_FIELD'):
+            # Neither bulk_create nor COPY runs the save hook that interns labels
+            assign_dimensions(model, objs)
+        if method == "copy":
+            copy_rows(model, objs)
+        else:
+            model.objects.bulk_create(objs, batch_size=batch_size)
+        written[model] = written.get(model, 0) + len(objs)
+
+    for obj in rows:
+        batch = pending.setdefault(type(obj), [])
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            flush(type(obj))
+    for model in list(pending):
+        flush(model)
+    return written
+
+
+def seed_users(start, stop, rows_per_user, seed, batch_size=5000, method="bulk", password_hash=None):
+    """Create seed users ``start`` to ``stop - 1`` with their profiles and rows.
+
+    Users that already exist are skipped. Returns the number of rows written per model name.
+    """
+    password_hash = password_hash or make_password(SEED_PASSWORD)
+    totals = {}
+    # Enough users per chunk that each one fills roughly one batch of rows
+    users_per_chunk = max(1, min(1000, batch_size // max(rows_per_user, 1)))
+    for chunk_start in range(start, stop, users_per_chunk):
+        indexes = range(chunk_start, min(chunk_start + users_per_chunk, stop))
+        candidates = {index: build_user(index, password_hash) for index in indexes}
+        existing = set(User.objects.filter(username__in=[u.username for u in candidates.values()])
+                       .values_list('username', flat=True))
+        new = {index: user for index, user in candidates.items() if user.username not in existing}
+        if not new:
+            continue
+
+        User.objects.bulk_create(new.values())
+        if any(user.pk is None for user in new.values()):
+            # Backends that can't return ids from bulk inserts
+            ids = dict(User.objects.filter(username__in=[u.username for u in new.values()]).values_list('username', 'id'))
+            for user in new.values():
+                user.pk = ids[user.username]
+
+        rngs = {index: user_rng(seed, index) for index in new}
+        profiles = [build_profile(user, rngs[index]) for index, user in new.items()]
+        FinancialProfile.objects.bulk_create(profiles)
+        totals[FinancialProfile.__name__] = totals.get(FinancialProfile.__name__, 0) + len(profiles)
+
+        rows = (
+            row
+            for (index, user), profile in zip(new.items(), profiles)
+            for row in transaction_rows(user, rows_per_user, rngs[index], profile.monthly_salary)
+        )
+        for model, count in write_rows(rows, batch_size, method).items():
+            totals[model.__name__] = totals.get(model.__name__, 0) + count
+        # Bulk writes skip the signals that maintain the running totals and statistics
+        spend_rows = rebuild_category_spend(user.pk for user in new.values())
+        totals[CategorySpend.__name__] = totals.get(CategorySpend.__name__, 0) + spend_rows
+        stats_rows = rebuild_category_stats(user.pk for user in new.values())
+        totals[CategoryStats.__name__] = totals.get(CategoryStats.__name__, 0) + stats_rows
+        totals[User.__name__] = totals.get(User.__name__, 0) + len(new)
+    return totals
+
+
+def seed_users_in_worker(*args, **kwargs):
+    """``seed_users`` for a forked worker process, on its own database connection."""
+    try:
+        return seed_users(*args, **kwargs)
+    finally:
+        connections.close_all()
+
+
+def delete_users_data(user_ids):
+    """Delete users and all their rows.
+
+    Uses raw deletes for the financial tables: cascading millions of rows
+    through the ORM collector is far too slow.
+    """
+    user_ids = list(user_ids)
+    with connection.cursor() as cursor:
+        for start in range(0, len(user_ids), 10_000):
+            batch = user_ids[start:start + 10_000]
+            placeholders = ", ".join(["%s"] * len(batch))
+            for model in (ExpenseAnomaly, Income, Expense, Investment, FinancialProfile, Budget, CategorySpend, CategoryStats,
+                          RecurringTransaction, RecurrenceScan):
+                cursor.execute(f"DELETE FROM {model._meta.db_table} WHERE user_id IN ({placeholders})", batch)
+    for start in range(0, len(user_ids), 10_000):
+        User.objects.filter(id__in=user_ids[start:start + 10_000]).delete()
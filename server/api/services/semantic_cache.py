@@ -0,0 +1,162 @@
+import hashlib
+import math
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from django.conf import settings
+
+DEFAULT_CACHE_CONFIG = {
+    'ENABLED': True,
+    'SIMILARITY_THRESHOLD': 0.85,
+    'MAX_ENTRIES_PER_USER': 50,
+    'MAX_USERS': 1000,
+    'NGRAM_SIZE': 3,
+    'DIMENSIONS': 2 ** 18,
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+# Words that don't change what a question asks; everything else, numbers included, must match for a hit
+STOPWORDS = frozenset("""
+    a an the i me my mine we us our you your it its this that these those
+    am is are was were be been being do does did have has had
+    can could should would will shall may might must
+    to of in on at for with by from about into as and or if so
+    please tell know
+""".split())
+
+
+def get_cache_config():
+    """Return the AI_CHAT_CACHE setting merged over the defaults."""
+    config = dict(DEFAULT_CACHE_CONFIG)
+    config.update(getattr(settings, 'AI_CHAT_CACHE', {}))
+    return config
+
+
+def vectorize(text, ngram_size=3, dimensions=2 ** 18):
+    """Embed text as an L2-normalised sparse vector of hashed word and character n-grams.
+
+    Word tokens carry the meaning of the question while character n-grams make
+    the vector robust to typos, plurals and punctuation differences.
+    """
+    tokens = _TOKEN_RE.findall(text.lower())
+    features = {}
+    for token in tokens:
+        features[f"w:{token}"] = features.get(f"w:{token}", 0) + 1.0
+        padded = f" {token} "
+        for i in range(max(1, len(padded) - ngram_size + 1)):
+            gram = f"c:{padded[i:i + ngram_size]}"
+            features[gram] = features.get(gram, 0) + 0.5
+
+    vector = {}
+    for feature, weight in features.items():
+        index = zlib.crc32(feature.encode()) % dimensions
+        vector[index] = vector.get(index, 0.0) + weight
+
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    if not norm:
+        return {}
+    return {index: weight / norm for index, weight in vector.items()}
+
+
+def content_words(text):
+    """The question's words minus stopwords, with plurals folded, e.g. ``{"afford", "10", "lakh", "loan"}``.
+
+    Vectors of questions that differ in one word ("save" and "spend", "10
+    lakh" and "50 lakh", "good" and "bad") are close enough to clear any
+    useful threshold, so a hit also needs the same set of content words.
+    """
+    return frozenset(
+        token[:-1] if len(token) > 3 and token.endswith('s') and not token.endswith('ss') else token
+        for token in _TOKEN_RE.findall(text.lower()) if token not in STOPWORDS
+    )
+
+
+def cosine_similarity(a, b):
+    """Cosine similarity of two normalised sparse vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(index, 0.0) for index, weight in a.items())
+
+
+def snapshot_key(financial_context):
+    """Fingerprint of the financial data an answer was generated from."""
+    return hashlib.sha1(financial_context.encode()).hexdigest()
+
+
+class SemanticAnswerCache:
+    """In-memory nearest-neighbour cache of AI chat answers.
+
+    Answers are stored per user together with the snapshot of financial data
+    they were based on; a new snapshot discards that user's old answers. Users
+    and, within a user, answers are evicted least recently used first.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._users = OrderedDict()
+
+    def lookup(self, user_id, snapshot, question):
+        """Return the cached answer closest to ``question`` if it clears the similarity threshold.
+
+        Only answers to questions with the same content words (see ``content_words``) are candidates.
+        """
+        config = get_cache_config()
+        if not config['ENABLED']:
+            return None
+        query = vectorize(question, config['NGRAM_SIZE'], config['DIMENSIONS'])
+        if not query:
+            return None
+        words = content_words(question)
+
+        with self._lock:
+            bucket = self._users.get(user_id)
+            if bucket is None or bucket['snapshot'] != snapshot:
+                return None
+            self._users.move_to_end(user_id)
+
+            best_key, best_score = None, config['SIMILARITY_THRESHOLD']
+            for key, entry in bucket['entries'].items():
+                if entry['words'] != words:
+                    continue
+                score = cosine_similarity(query, entry['vector'])
+                if score >= best_score:
+                    best_key, best_score = key, score
+            if best_key is None:
+                return None
+            bucket['entries'].move_to_end(best_key)
+            return bucket['entries'][best_key]['answer']
+
+    def store(self, user_id, snapshot, question, answer):
+        config = get_cache_config()
+        if not config['ENABLED']:
+            return
+        vector = vectorize(question, config['NGRAM_SIZE'], config['DIMENSIONS'])
+        if not vector:
+            return
+
+        with self._lock:
+            bucket = self._users.get(user_id)
+            if bucket is None or bucket['snapshot'] != snapshot:
+                bucket = {'snapshot': snapshot, 'entries': OrderedDict()}
+                self._users[user_id] = bucket
+            self._users.move_to_end(user_id)
+
+            entries = bucket['entries']
+            entries[question.strip().lower()] = {'vector': vector, 'words': content_words(question), 'answer': answer}
+            entries.move_to_end(question.strip().lower())
+            while len(entries) > config['MAX_ENTRIES_PER_USER']:
+                entries.popitem(last=False)
+            while len(self._users) > config['MAX_USERS']:
+                self._users.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._users.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+
+
+chat_answer_cache = SemanticAnswerCache()
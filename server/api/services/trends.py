@@ -0,0 +1,133 @@
+"""Income, expense and net savings bucketed by day, week or month.
+
+Bucketing runs in the database (one ``GROUP BY date_trunc(...)`` per model),
+so only one row per non-empty bucket ever reaches Python. Moving averages
+and bucket-over-bucket changes are then computed on numpy arrays.
+"""
+from datetime import date, timedelta
+import numpy as np
+from django.db.models import DateField, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+from api.models import Income, Expense
+
+PERIODS = {'day': TruncDay, 'week': TruncWeek, 'month': TruncMonth}
+# How far back the range starts when the client doesn't give one
+DEFAULT_SPANS = {'day': 30, 'week': 12, 'month': 12}
+MAX_BUCKETS = 1000
+
+
+def bucket_start(day, period):
+    """First day of the bucket containing ``day`` (weeks start on Monday, like ``date_trunc``)."""
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    if period == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def shift(day, period, count):
+    """Move a bucket start ``count`` buckets forward (or back, if negative)."""
+    if period == 'day':
+        return day + timedelta(days=count)
+    if period == 'week':
+        return day + timedelta(weeks=count)
+    months = day.year * 12 + day.month - 1 + count
+    return date(months // 12, months % 12 + 1, 1)
+
+
+def default_start(end, period):
+    return shift(bucket_start(end, period), period, 1 - DEFAULT_SPANS[period])
+
+
+def bucket_count(start, end, period):
+    start, end = bucket_start(start, period), bucket_start(end, period)
+    if period == 'day':
+        return (end - start).days + 1
+    if period == 'week':
+        return (end - start).days // 7 + 1
+    return (end.year - start.year) * 12 + end.month - start.month + 1
+
+
+def bucket_totals(queryset, date_field, period, start, end):
+    """``{bucket start: total amount}`` for the non-empty buckets of ``queryset``."""
+    return dict(
+        queryset.filter(**{f"{date_field}__range": (start, end)})
+        .annotate(bucket=PERIODS[period](date_field, output_field=DateField()))
+        .values('bucket')
+        .annotate(total=Sum('amount'))
+        .order_by()
+        .values_list('bucket', 'total')
+    )
+
+
+def moving_average(values, window):
+    """Trailing mean over ``window`` buckets; the first buckets average what they have."""
+    sums = np.cumsum(np.concatenate(([0.0], values)))
+    ends = np.arange(1, len(values) + 1)
+    starts = np.maximum(ends - window, 0)
+    return (sums[ends] - sums[starts]) / (ends - starts)
+
+
+def changes(values):
+    """Change from the previous bucket, absolute and in percent (NaN where undefined)."""
+    change = np.full(len(values), np.nan)
+    change_pct = np.full(len(values), np.nan)
+    if len(values) > 1:
+        previous = values[:-1]
+        change[1:] = values[1:] - previous
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change_pct[1:] = np.where(previous != 0, change[1:] / np.abs(previous) * 100, np.nan)
+    return change, change_pct
+
+
+def _money(value):
+    # A string to the paisa, like the API's DecimalFields; "+ 0.0" turns a rounded -0.0 into 0.00
+    return None if np.isnan(value) else f"{round(value, 2) + 0.0:.2f}"
+
+
+def _series(values, money=True):
+    # NaN (no previous bucket, or a change from zero) becomes null
+    if money:
+        return [_money(value) for value in values.tolist()]
+    return [None if np.isnan(value) else value for value in np.round(values, 2).tolist()]
+
+
+def get_trends(user_id, period='month', start=None, end=None, window=3):
+    """Bucketed income, expense and net savings for ``user_id`` between ``start`` and ``end``.
+
+    Buckets with no transactions are included as zeros so every series has
+    one value per bucket. For monthly buckets ``change`` is the
+    month-over-month delta. Amounts are decimal strings, as elsewhere in the
+    API; ``change_pct`` is a number.
+    """
+    end = end or date.today()
+    start = start or default_start(end, period)
+    first = bucket_start(start, period)
+    buckets = [shift(first, period, i) for i in range(bucket_count(start, end, period))]
+    index = {bucket: i for i, bucket in enumerate(buckets)}
+
+    series = {}
+    for name, model, date_field in (('income', Income, 'date_received'), ('expense', Expense, 'date_spent')):
+        values = np.zeros(len(buckets))
+        for bucket, total in bucket_totals(model.objects.filter(user_id=user_id), date_field, period, start, end).items():
+            values[index[bucket]] = float(total)
+        series[name] = values
+    series['net'] = series['income'] - series['expense']
+
+    result = {
+        'period': period,
+        'start': start,
+        'end': end,
+        'window': window,
+        'buckets': buckets,
+        'totals': {name: _money(values.sum()) for name, values in series.items()},
+    }
+    for name, values in series.items():
+        change, change_pct = changes(values)
+        result[name] = {
+            'values': _series(values),
+            'moving_average': _series(moving_average(values, window)),
+            'change': _series(change),
+            'change_pct': _series(change_pct, money=False),
+        }
+    return result
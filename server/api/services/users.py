@@ -0,0 +1,46 @@
+from django.contrib.auth.models import User
+from django.db.models import CharField, Func, Q
+from django.db.models.functions import Lower
+
+
+class BlankAsNull(Func):
+    """``NULLIF(column, '')`` with the literal inlined so it matches the index expression."""
+    template = "NULLIF(%(expressions)s, '')"
+    arity = 1
+    output_field = CharField()
+
+
+def users_by_login_keys():
+    """User queryset annotated with the lower-cased keys covered by the functional unique indexes.
+
+    Filtering on ``username_lower`` / ``email_lower`` compiles to
+    ``LOWER(column) = %s``, which the ``auth_user_username_lower_uniq`` and
+    ``auth_user_email_lower_uniq`` indexes serve directly, unlike ``__iexact``
+    (``UPPER(column) = UPPER(%s)`` on Postgres).
+    """
+    return User.objects.alias(
+        username_lower=Lower('username'),
+        # Must match the index expression exactly; blank emails are indexed as NULL
+        email_lower=Lower(BlankAsNull('email')),
+    )
+
+
+def get_user_by_username(username):
+    """Fetch a user by case-insensitive username in a single indexed query, or None."""
+    return users_by_login_keys().filter(username_lower=username.lower()).first()
+
+
+def find_registration_conflicts(username, email):
+    """Return the set of fields ('username', 'email') already taken, using one indexed query."""
+    username, email = username.lower(), email.lower()
+    matches = users_by_login_keys().filter(
+        Q(username_lower=username) | Q(email_lower=email)
+    ).values_list('username', 'email')
+
+    conflicts = set()
+    for existing_username, existing_email in matches:
+        if existing_username.lower() == username:
+            conflicts.add('username')
+        if existing_email.lower() == email:
+            conflicts.add('email')
+    return conflicts
@@ -0,0 +1,97 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from .authentication import user_cache
+from .models import Budget, FinancialProfile, Income, Expense, Investment, UserDataVersion
+from .services.anomalies import discard_expense_stats, record_expense_stats
+from .services.budgets import expense_deleted, expense_saved
+from .services.dashboard_cache import invalidate_dashboard
+from .services.dimensions import intern_label
+from .services.data_version import bump_data_version
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Drop the authenticated-user cache entry whenever a user changes."""
+    user_cache.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def bump_user_data_version(sender, instance, created, **kwargs):
+    """The dashboard includes the user's own fields, so profile edits change its version too."""
+    if created:
+        UserDataVersion.objects.create(user=instance, version=1, updated_at=instance.date_joined)
+    else:
+        bump_data_version(instance.pk)
+        invalidate_dashboard(instance.pk)
+
+
+@receiver(post_save, sender=FinancialProfile)
+@receiver(post_save, sender=Income)
+@receiver(post_save, sender=Expense)
+@receiver(post_save, sender=Investment)
+@receiver(post_delete, sender=FinancialProfile)
+@receiver(post_delete, sender=Income)
+@receiver(post_delete, sender=Expense)
+@receiver(post_delete, sender=Investment)
+def bump_financial_data_version(sender, instance, origin=None, **kwargs):
+    """Bump the owner's data version and drop their cached dashboard on any write to their financial rows."""
+    if isinstance(origin, User):
+        # Cascading from the user's own deletion; their version row is going away too
+        return
+    bump_data_version(instance.user_id)
+    invalidate_dashboard(instance.user_id)
+
+
+@receiver(pre_save, sender=Income)
+@receiver(pre_save, sender=Expense)
+@receiver(pre_save, sender=Budget)
+def intern_category_or_source(sender, instance, raw=False, **kwargs):
+    """Point the row at its label's dimension entry, adding the entry for a new label."""
+    if raw:
+        return
+    intern_label(instance)
+
+
+@receiver(pre_save, sender=Expense)
+@receiver(pre_delete, sender=Expense)
+def remember_stored_expense(sender, instance, raw=False, origin=None, **kwargs):
+    """Read the stored values the expense's aggregates move from, under a row lock in a transaction.
+
+    The values an instance was loaded with are stale once another write has
+    changed the row, and moving the spend totals and category statistics from
+    them would leave both off for good. Instances the detail view loaded with
+    ``select_for_update`` are already current.
+    """
+    if raw or instance.pk is None or isinstance(origin, User) or getattr(instance, '_stored_values_locked', False):
+        return
+    rows = Expense.objects.filter(pk=instance.pk)
+    if transaction.get_connection().in_atomic_block:
+        rows = rows.select_for_update()
+    stored = rows.values_list('category_ref_id', 'amount', 'date_spent').first()
+    if stored is not None:
+        instance._stored_values = stored
+
+
+@receiver(post_save, sender=Expense)
+def update_expense_aggregates_on_save(sender, instance, created, raw=False, **kwargs):
+    """Move the expense from its stored values to its new ones in the spend totals and category statistics."""
+    if raw:
+        return
+    previous = None if created else getattr(instance, '_stored_values', None)
+    expense_saved(instance, previous)
+    record_expense_stats(instance, previous)
+    # A second save of the same instance starts from what was just written
+    instance._stored_values = (instance.category_ref_id, instance.amount, instance.date_spent)
+
+
+@receiver(post_delete, sender=Expense)
+def update_expense_aggregates_on_delete(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, User):
+        # The user's aggregates cascade away with them
+        return
+    stored = getattr(instance, '_stored_values', (instance.category_ref_id, instance.amount, instance.date_spent))
+    expense_deleted(instance, stored)
+    discard_expense_stats(instance, stored)
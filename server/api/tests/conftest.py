@@ -0,0 +1,14 @@
+import pytest
+from rest_framework.test import APIClient
+from api.tests.test_utils import create_test_user
+
+@pytest.fixture
+def user(db):
+    return create_test_user()['user']
+
+@pytest.fixture
+def auth_client(user):
+    """An API client logged in as ``user``; modules can override ``user`` to seed data."""
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
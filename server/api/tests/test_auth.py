@@ -1,8 +1,12 @@
+from importlib import import_module
+from django.apps import apps
 from django.test import TestCase
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 class AuthenticationTest(TestCase):
     def setUp(self):
@@ -62,6 +66,54 @@ class AuthenticationTest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('email', response.data)
 
+    def test_user_registration_duplicate_username_different_case(self):
+        """Test user registration with a username differing only in case"""
+        self.client.post(self.register_url, self.user_data)
+
+        data = self.user_data.copy()
+        data['username'] = 'TestUser'
+        data['email'] = 'another@example.com'
+        response = self.client.post(self.register_url, data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('username', response.data)
+
+    def test_user_registration_duplicate_email_different_case(self):
+        """Test user registration with an email differing only in case"""
+        self.client.post(self.register_url, self.user_data)
+
+        data = self.user_data.copy()
+        data['username'] = 'anotheruser'
+        data['email'] = 'TEST@Example.com'
+        response = self.client.post(self.register_url, data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('email', response.data)
+
+    def test_lower_case_unique_indexes_exist(self):
+        """Test the functional indexes backing case-insensitive lookups are installed"""
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, User._meta.db_table)
+        self.assertIn('auth_user_username_lower_uniq', constraints)
+        self.assertIn('auth_user_email_lower_uniq', constraints)
+
+    def test_index_migration_reports_case_insensitive_duplicates(self):
+        """Test the index migration names the users it can't index, instead of failing on the index"""
+        migration = import_module('api.migrations.0002_user_lower_unique_indexes')
+        with connection.cursor() as cursor:
+            # Rolled back with the test, like the users
+            cursor.execute('DROP INDEX auth_user_username_lower_uniq')
+            cursor.execute('DROP INDEX auth_user_email_lower_uniq')
+        first = User.objects.create_user(username='Clash', email='clash@example.com')
+        second = User.objects.create_user(username='clash', email='other@example.com')
+        User.objects.create_user(username='blank1', email='')
+        User.objects.create_user(username='blank2', email='')
+
+        with self.assertRaisesMessage(RuntimeError, f"username 'clash': id={first.id} 'Clash', id={second.id} 'clash'"):
+            migration.check_case_insensitive_duplicates(apps, None)
+
+        second.username = 'clash2'
+        second.save()
+        migration.check_case_insensitive_duplicates(apps, None)
+
     def test_user_registration_invalid_email(self):
         """Test user registration with invalid email format"""
         data = self.user_data.copy()
@@ -122,6 +174,39 @@ class AuthenticationTest(TestCase):
         })
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_login_fetches_user_once(self):
+        """Test login resolves and authenticates the user with a single query"""
+        User.objects.create_user(
+            username='TestUser',
+            password='testpass123',
+            email='test@example.com'
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.login_url, {
+                'username': 'testuser',
+                'password': 'testpass123'
+            })
+        user_queries = [q['sql'] for q in queries.captured_queries if 'auth_user' in q['sql']]
+        self.assertEqual(len(user_queries), 1)
+        self.assertIn('LOWER("auth_user"."username")', user_queries[0])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['user']['username'], 'TestUser')
+
+    def test_login_wrong_password(self):
+        """Test login with an existing username and a wrong password"""
+        User.objects.create_user(
+            username='testuser',
+            password='testpass123',
+            email='test@example.com'
+        )
+
+        response = self.client.post(self.login_url, {
+            'username': 'testuser',
+            'password': 'wrongpass123'
+        })
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
     def test_login_with_inactive_user(self):
         """Test login with inactive user account"""
         user = User.objects.create_user(
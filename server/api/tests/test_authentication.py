@@ -0,0 +1,73 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from api.authentication import user_cache
+from api.tests.test_utils import create_test_user
+
+pytestmark = pytest.mark.django_db
+
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    user_cache.clear()
+    yield
+    user_cache.clear()
+
+@pytest.fixture
+def auth_user(db):
+    return create_test_user()
+
+@pytest.fixture
+def auth_client(auth_user):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {auth_user["access_token"]}')
+    return client
+
+def user_queries(queries):
+    return [q['sql'] for q in queries.captured_queries if 'FROM "auth_user"' in q['sql']]
+
+def test_repeat_requests_skip_user_lookup(auth_client):
+    url = reverse("expense-list")
+    with CaptureQueriesContext(connection) as first:
+        assert auth_client.get(url).status_code == 200
+    with CaptureQueriesContext(connection) as second:
+        assert auth_client.get(url).status_code == 200
+
+    assert len(user_queries(first)) == 1
+    assert user_queries(second) == []
+
+def test_user_change_invalidates_cache(auth_client, auth_user):
+    url = reverse("expense-list")
+    auth_client.get(url)
+
+    user = auth_user['user']
+    user.is_active = False
+    user.save()
+
+    assert auth_client.get(url).status_code == 401
+
+def test_deleted_user_is_rejected(auth_client, auth_user):
+    url = reverse("expense-list")
+    auth_client.get(url)
+    auth_user['user'].delete()
+    assert auth_client.get(url).status_code == 401
+
+def test_expired_entries_are_reloaded(auth_client, settings):
+    settings.AUTH_USER_CACHE = {'TTL': -1}
+    url = reverse("expense-list")
+    auth_client.get(url)
+    with CaptureQueriesContext(connection) as queries:
+        auth_client.get(url)
+    assert len(user_queries(queries)) == 1
+
+def test_cached_user_is_a_copy(auth_client, auth_user):
+    auth_client.get(reverse("expense-list"))
+    cached = user_cache.get(auth_user['user'].id)
+    cached.first_name = "Changed"
+    assert user_cache.get(auth_user['user'].id).first_name == "Test"
+
+def test_disabled_cache_stays_empty(auth_client, auth_user, settings):
+    settings.AUTH_USER_CACHE = {'ENABLED': False}
+    auth_client.get(reverse("expense-list"))
+    assert user_cache.get(auth_user['user'].id) is None
@@ -0,0 +1,160 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+from django.db import connection
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from api.models import Budget, CategorySpend, Expense
+from api.services.budgets import rebuild_category_spend
+from api.tests.test_utils import create_test_user
+
+pytestmark = pytest.mark.django_db
+
+def spend(user):
+    return {
+        (row.category.name, row.month): (row.total, row.transactions)
+        for row in CategorySpend.objects.filter(user=user).exclude(transactions=0).select_related('category')
+    }
+
+def test_expense_api_writes_maintain_running_totals(auth_client, user):
+    url = reverse("expense-list")
+    created = auth_client.post(url,
+                               {"category": "Groceries", "amount": "250.00", "date_spent": "2024-01-15"}, format="json")
+    auth_client.post(url, [{"category": "Groceries", "amount": "100.50", "date_spent": "2024-01-20"},
+                           {"category": "Rent", "amount": "20000.00", "date_spent": "2024-02-01"}], format="json")
+    assert spend(user) == {
+        ("Groceries", date(2024, 1, 1)): (Decimal("350.50"), 2),
+        ("Rent", date(2024, 2, 1)): (Decimal("20000.00"), 1),
+    }
+
+    # Moving an expense to another category and month takes it out of its old bucket
+    detail = reverse("expense-detail", kwargs={"pk": created.data["id"]})
+    auth_client.patch(detail, {"category": "Dining", "date_spent": "2024-02-10", "amount": "300.00"}, format="json")
+    assert spend(user) == {
+        ("Groceries", date(2024, 1, 1)): (Decimal("100.50"), 1),
+        ("Dining", date(2024, 2, 1)): (Decimal("300.00"), 1),
+        ("Rent", date(2024, 2, 1)): (Decimal("20000.00"), 1),
+    }
+
+    auth_client.delete(detail)
+    assert spend(user) == {
+        ("Groceries", date(2024, 1, 1)): (Decimal("100.50"), 1),
+        ("Rent", date(2024, 2, 1)): (Decimal("20000.00"), 1),
+    }
+
+def test_saving_an_expense_not_loaded_from_the_database(user):
+    expense = Expense.objects.create(user=user, category="Groceries", amount=Decimal("250.00"), date_spent=date(2024, 1, 15))
+    Expense(id=expense.id, user=user, category="Groceries", amount=Decimal("75.00"), date_spent=date(2024, 1, 15)).save()
+
+    assert spend(user) == {("Groceries", date(2024, 1, 1)): (Decimal("75.00"), 1)}
+
+def test_rebuild_matches_incremental_totals(user):
+    for day, amount in [(date(2024, 1, 5), "10.00"), (date(2024, 1, 25), "20.00"), (date(2024, 3, 1), "5.25")]:
+        Expense.objects.create(user=user, category="Dining", amount=Decimal(amount), date_spent=day)
+    Expense.objects.filter(amount=Decimal("20.00")).get().delete()
+    incremental = spend(user)
+
+    rebuild_category_spend([user.pk])
+
+    assert spend(user) == incremental
+
+def test_budget_crud(auth_client, user):
+    response = auth_client.post(reverse("budget-list"),
+                                {"category": " Groceries ", "monthly_limit": "8000.00"}, format="json")
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.data["category"] == "Groceries"
+
+    duplicate = auth_client.post(reverse("budget-list"),
+                                 {"category": "groceries", "monthly_limit": "100.00"}, format="json")
+    assert duplicate.status_code == status.HTTP_400_BAD_REQUEST
+
+    detail = reverse("budget-detail", kwargs={"pk": response.data["id"]})
+    assert auth_client.patch(detail, {"monthly_limit": "9000.00"}, format="json").data["monthly_limit"] == "9000.00"
+    assert auth_client.delete(detail).status_code == status.HTTP_204_NO_CONTENT
+    assert not Budget.objects.filter(user=user).exists()
+
+def test_budget_writes_run_in_a_transaction(auth_client, user):
+    budget = Budget.objects.create(user=user, category="Groceries", monthly_limit=Decimal("8000.00"))
+    detail = reverse("budget-detail", kwargs={"pk": budget.pk})
+    in_transaction = []
+
+    def record(sender, **kwargs):
+        # The test's own transaction is the outer block; a write wrapped in atomic() adds a savepoint
+        in_transaction.append(bool(connection.savepoint_ids))
+
+    post_save.connect(record, sender=Budget)
+    post_delete.connect(record, sender=Budget)
+    try:
+        auth_client.patch(detail, {"category": "Travel"}, format="json")
+        auth_client.delete(detail)
+    finally:
+        post_save.disconnect(record, sender=Budget)
+        post_delete.disconnect(record, sender=Budget)
+    assert in_transaction == [True, True]
+
+def test_budgets_are_private(auth_client):
+    other = create_test_user(username="other", email="other@example.com")['user']
+    budget = Budget.objects.create(user=other, category="Rent", monthly_limit=Decimal("1000.00"))
+
+    assert auth_client.get(reverse("budget-list")).data == []
+    assert auth_client.get(reverse("budget-detail", kwargs={"pk": budget.pk})).status_code == status.HTTP_404_NOT_FOUND
+
+def test_status_reports_spent_against_each_budget(auth_client, user):
+    Budget.objects.create(user=user, category="Groceries", monthly_limit=Decimal("500.00"))
+    Budget.objects.create(user=user, category="Rent", monthly_limit=Decimal("20000.00"))
+    Budget.objects.create(user=user, category="Travel", monthly_limit=Decimal("1000.00"))
+    for category, amount, day in [("Groceries", "400.00", date(2024, 1, 3)), ("Groceries", "250.00", date(2024, 1, 9)),
+                                  ("Rent", "15000.00", date(2024, 1, 1)), ("Groceries", "90.00", date(2024, 2, 1))]:
+        Expense.objects.create(user=user, category=category, amount=Decimal(amount), date_spent=day)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = auth_client.get(reverse("budget-status"), {"month": "2024-01"})
+
+    assert len(queries) == 1
+    assert response.data["month"] == date(2024, 1, 1)
+    assert [dict(row) | {"id": None} for row in response.data["budgets"]] == [
+        {"id": None, "category": "Groceries", "monthly_limit": "500.00", "spent": "650.00", "remaining": "-150.00",
+         "percent_used": 130.0, "over_budget": True, "transactions": 2},
+        {"id": None, "category": "Rent", "monthly_limit": "20000.00", "spent": "15000.00", "remaining": "5000.00",
+         "percent_used": 75.0, "over_budget": False, "transactions": 1},
+        {"id": None, "category": "Travel", "monthly_limit": "1000.00", "spent": "0.00", "remaining": "1000.00",
+         "percent_used": 0.0, "over_budget": False, "transactions": 0},
+    ]
+    assert response.data["total_limit"] == "21500.00"
+    assert response.data["total_spent"] == "15650.00"
+
+def test_status_defaults_to_the_current_month(auth_client, user):
+    Budget.objects.create(user=user, category="Dining", monthly_limit=Decimal("100.00"))
+    Expense.objects.create(user=user, category="Dining", amount=Decimal("40.00"), date_spent=date.today())
+
+    response = auth_client.get(reverse("budget-status"))
+
+    assert response.data["month"] == date.today().replace(day=1)
+    assert response.data["budgets"][0]["spent"] == "40.00"
+
+def test_status_rejects_a_bad_month(auth_client):
+    assert auth_client.get(reverse("budget-status"), {"month": "January"}).status_code == status.HTTP_400_BAD_REQUEST
+
+def test_expense_writes_lock_the_row_they_read(auth_client, user):
+    expense = Expense.objects.create(user=user, category="Groceries", amount=Decimal("300.00"), date_spent=date(2024, 1, 15))
+    detail = reverse("expense-detail", kwargs={"pk": expense.pk})
+    locked = []
+    select_for_update = QuerySet.select_for_update
+
+    def spy(queryset, *args, **kwargs):
+        locked.append(queryset.model)
+        return select_for_update(queryset, *args, **kwargs)
+
+    with patch.object(QuerySet, "select_for_update", spy):
+        auth_client.get(detail)
+        assert Expense not in locked
+        auth_client.patch(detail, {"amount": "400.00"}, format="json")
+        auth_client.put(detail, {"category": "Groceries", "amount": "350.00", "date_spent": "2024-01-15"}, format="json")
+        auth_client.delete(detail)
+    # The row is read under lock once each for PATCH, PUT and DELETE
+    assert locked.count(Expense) == 3
+    assert spend(user) == {}
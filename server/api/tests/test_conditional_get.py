@@ -0,0 +1,79 @@
+import pytest
+from datetime import date
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from api.models import FinancialProfile, Expense, Income
+from api.services.data_version import get_data_version
+from api.tests.test_utils import create_test_user
+
+pytestmark = pytest.mark.django_db
+
+CONDITIONAL_ROUTES = ["user-dashboard", "income-list", "expense-list", "investment-list"]
+
+@pytest.fixture
+def user(db):
+    user = create_test_user()['user']
+    FinancialProfile.objects.create(user=user, age=30, monthly_salary=80000, monthly_savings=20000, risk_tolerance="medium")
+    Expense.objects.create(user=user, category="Rent", amount=15000, date_spent=date.today())
+    return user
+
+@pytest.mark.parametrize("route", CONDITIONAL_ROUTES)
+def test_unchanged_data_returns_304_after_one_query(auth_client, route):
+    first = auth_client.get(reverse(route))
+    assert first.status_code == status.HTTP_200_OK
+    assert first.has_header("ETag") and first.has_header("Last-Modified")
+    assert "private" in first["Cache-Control"] and "no-cache" in first["Cache-Control"]
+
+    with CaptureQueriesContext(connection) as queries:
+        second = auth_client.get(reverse(route), HTTP_IF_NONE_MATCH=first["ETag"])
+    assert second.status_code == status.HTTP_304_NOT_MODIFIED
+    assert second.content == b""
+    assert len(queries) == 1
+
+def test_last_modified_revalidation(auth_client):
+    first = auth_client.get(reverse("user-dashboard"))
+    second = auth_client.get(reverse("user-dashboard"), HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+    assert second.status_code == status.HTTP_304_NOT_MODIFIED
+
+def test_writes_change_the_etag(auth_client, user):
+    etag = auth_client.get(reverse("expense-list"))["ETag"]
+
+    auth_client.post(reverse("income-list"), {"source": "Freelance", "amount": "500.00",
+                                              "date_received": str(date.today())}, format="json")
+    response = auth_client.get(reverse("expense-list"), HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"] != etag
+
+    # Writes outside the API (admin, shell, commands) count too
+    etag = response["ETag"]
+    Income.objects.filter(user=user).first().delete()
+    assert auth_client.get(reverse("expense-list"), HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
+
+def test_etag_is_per_user(auth_client, user):
+    other = create_test_user(username="other", email="other@example.com")['user']
+    other_client = APIClient()
+    other_client.force_authenticate(user=other)
+
+    etag = auth_client.get(reverse("expense-list"))["ETag"]
+    assert other_client.get(reverse("expense-list"), HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
+
+def test_bulk_create_bumps_version_once(auth_client, user):
+    before, _ = get_data_version(user.pk)
+    payload = [{"category": "Groceries", "amount": "250.00", "date_spent": str(date.today())}] * 5
+    assert auth_client.post(reverse("expense-list"), payload, format="json").status_code == status.HTTP_201_CREATED
+    assert get_data_version(user.pk)[0] == before + 1
+
+def test_rolled_back_write_keeps_version(user):
+    before = get_data_version(user.pk)
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            Expense.objects.create(user=user, category="Travel", amount=900, date_spent=date.today())
+            raise RuntimeError
+    assert get_data_version(user.pk) == before
+
+def test_deleting_user_cascades_cleanly(user):
+    user.delete()
+    assert get_data_version(user.pk) == (0, None)
@@ -0,0 +1,89 @@
+import pytest
+from datetime import date
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from api.models import FinancialProfile, Expense
+from api.services.dashboard_cache import get_cached_dashboard, store_dashboard
+from api.tests.test_utils import create_test_user
+
+pytestmark = pytest.mark.django_db
+
+@pytest.fixture(autouse=True)
+def clear_dashboard_cache():
+    caches['dashboard'].clear()
+    yield
+    caches['dashboard'].clear()
+
+@pytest.fixture
+def user(db):
+    user = create_test_user()['user']
+    FinancialProfile.objects.create(user=user, age=30, monthly_salary=80000, monthly_savings=20000, risk_tolerance="medium")
+    Expense.objects.create(user=user, category="Rent", amount=15000, date_spent=date.today())
+    return user
+
+def test_cache_hit_skips_orm_and_returns_same_body(auth_client):
+    first = auth_client.get(reverse("user-dashboard"))
+    with CaptureQueriesContext(connection) as queries:
+        second = auth_client.get(reverse("user-dashboard"))
+
+    assert second.status_code == status.HTTP_200_OK
+    assert second.content == first.content
+    assert second["Content-Type"] == first["Content-Type"]
+    assert second.data['expenses'][0]['category'] == "Rent"
+    # Only the data-version lookup
+    assert len(queries) == 1
+
+def test_writes_invalidate_cached_dashboard(auth_client, user):
+    auth_client.get(reverse("user-dashboard"))
+
+    auth_client.post(reverse("expense-list"), {"category": "Groceries", "amount": "250.00",
+                                               "date_spent": str(date.today())}, format="json")
+    assert len(auth_client.get(reverse("user-dashboard")).data['expenses']) == 2
+
+    auth_client.patch(reverse("user-detail", args=[user.pk]), {"first_name": "Renamed"}, format="json")
+    # As the JWT user cache would after the save signal
+    auth_client.force_authenticate(user=User.objects.get(pk=user.pk))
+    assert auth_client.get(reverse("user-dashboard")).data['first_name'] == "Renamed"
+
+def test_disabled_cache_always_renders(auth_client, settings):
+    settings.DASHBOARD_CACHE = {'ENABLED': False, 'ALIAS': 'dashboard'}
+    auth_client.get(reverse("user-dashboard"))
+    with CaptureQueriesContext(connection) as queries:
+        auth_client.get(reverse("user-dashboard"))
+    assert len(queries) > 1
+
+def test_stale_version_is_a_miss():
+    store_dashboard(1, (3, None), "application/json", b"{}")
+    assert get_cached_dashboard(1, (3, None), "application/json") == b"{}"
+    assert get_cached_dashboard(1, (4, None), "application/json") is None
+    assert get_cached_dashboard(1, (3, None), "application/json; indent=4") is None
+
+def test_entries_are_evicted_at_max_entries(settings):
+    settings.CACHES = {
+        **settings.CACHES,
+        'dashboard': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'dashboard-eviction',
+            'OPTIONS': {'MAX_ENTRIES': 3, 'CULL_FREQUENCY': 3},
+        },
+    }
+    for user_id in range(1, 5):
+        store_dashboard(user_id, (1, None), "application/json", b"{}")
+
+    assert get_cached_dashboard(1, (1, None), "application/json") is None
+    assert all(get_cached_dashboard(user_id, (1, None), "application/json") for user_id in range(2, 5))
+
+def test_file_backend(auth_client, settings, tmp_path):
+    settings.CACHES = {
+        **settings.CACHES,
+        'dashboard': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': str(tmp_path)},
+    }
+    first = auth_client.get(reverse("user-dashboard"))
+    with CaptureQueriesContext(connection) as queries:
+        second = auth_client.get(reverse("user-dashboard"))
+    assert second.content == first.content
+    assert len(queries) == 1
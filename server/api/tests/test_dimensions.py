@@ -0,0 +1,68 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from api.models import Budget, Expense, ExpenseCategory, Income, IncomeSource
+from api.services.dimensions import assign_dimensions, ids_for, normalize_label
+
+pytestmark = pytest.mark.django_db
+
+def test_normalize_label():
+    assert normalize_label("  Eating   Out ") == "eating out"
+    assert normalize_label("GROCERIES") == normalize_label("groceries")
+    assert normalize_label("Straße") == normalize_label("STRASSE")
+
+def test_spellings_share_one_category(auth_client, user):
+    url = reverse("expense-list")
+    first = auth_client.post(url,
+                             {"category": "Groceries", "amount": "100.00", "date_spent": "2024-01-05"}, format="json")
+    auth_client.post(url, [{"category": "groceries", "amount": "50.00", "date_spent": "2024-01-09"},
+                           {"category": "GROCERIES  ", "amount": "25.00", "date_spent": "2024-01-12"}],
+                     format="json")
+
+    # The API still takes and returns plain strings, as entered
+    assert first.data["category"] == "Groceries"
+    assert sorted(auth_client.get(url).data, key=lambda item: item["id"])[1]["category"] == "groceries"
+    category = ExpenseCategory.objects.get()
+    assert (category.key, category.name) == ("groceries", "Groceries")
+    assert set(Expense.objects.values_list('category_ref', flat=True)) == {category.id}
+
+    Budget.objects.create(user=user, category="groceries", monthly_limit=Decimal("500.00"))
+    status_response = auth_client.get(reverse("budget-status"), {"month": "2024-01"})
+    [groceries] = status_response.data["budgets"]
+    assert groceries["spent"] == "175.00"
+    assert groceries["transactions"] == 3
+
+def test_income_sources_are_interned(auth_client):
+    url = reverse("income-list")
+    auth_client.post(url, {"source": "Salary", "amount": "90000.00", "date_received": "2024-01-01"}, format="json")
+    auth_client.post(url, {"source": " salary", "amount": "90000.00", "date_received": "2024-02-01"}, format="json")
+    auth_client.post(url, {"source": "Bonus", "amount": "5000.00", "date_received": "2024-02-01"}, format="json")
+
+    assert sorted(IncomeSource.objects.values_list('key', flat=True)) == ["bonus", "salary"]
+    assert Income.objects.values('source_ref').distinct().count() == 2
+
+def test_updates_look_up_a_category_only_when_it_changes(auth_client, user):
+    expense = Expense.objects.create(user=user, category="Rent", amount=Decimal("20000.00"), date_spent=date(2024, 1, 1))
+    detail = reverse("expense-detail", kwargs={"pk": expense.pk})
+
+    with CaptureQueriesContext(connection) as captured:
+        auth_client.patch(detail, {"amount": "21000.00"}, format="json")
+    assert not [query for query in captured if "api_expensecategory" in query['sql']]
+
+    auth_client.patch(detail, {"category": "Housing"}, format="json")
+    expense.refresh_from_db()
+    assert expense.category_ref.name == "Housing"
+
+def test_assign_dimensions_for_bulk_writes(user):
+    rows = assign_dimensions(Expense, [
+        Expense(user=user, category=category, amount=Decimal("10.00"), date_spent=date(2024, 1, 1))
+        for category in ["Dining", "dining", "Transport"]
+    ])
+    Expense.objects.bulk_create(rows)
+
+    ids = ids_for(ExpenseCategory, ["DINING", "transport"])
+    assert [row.category_ref_id for row in rows] == [ids["DINING"], ids["DINING"], ids["transport"]]
+    assert ExpenseCategory.objects.count() == 2
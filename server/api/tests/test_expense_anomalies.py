@@ -0,0 +1,161 @@
+import math
+import pytest
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+from django.db import connection
+from django.db.models import QuerySet
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from api.models import CategoryStats, Expense, ExpenseAnomaly
+from api.services.anomalies import add_sample, rebuild_category_stats, remove_sample
+from api.services.dimensions import assign_dimensions
+from api.tests.test_utils import create_test_user
+
+pytestmark = pytest.mark.django_db
+
+AMOUNTS = ["100.00", "110.00", "90.00", "105.00", "95.00"]
+
+def post_expenses(client, amounts, category="Groceries"):
+    response = client.post(
+        reverse("expense-list"),
+        [{"category": category, "amount": amount, "date_spent": "2024-01-15"} for amount in amounts],
+        format="json",
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    return [item["id"] for item in response.data]
+
+def stats(user, category="Groceries"):
+    row = CategoryStats.objects.get(user=user, category__name=category)
+    return row.count, row.mean, row.m2
+
+def assert_matches(user, amounts, category="Groceries"):
+    count, mean, m2 = stats(user, category)
+    values = [float(amount) for amount in amounts]
+    expected_mean = sum(values) / len(values)
+    assert count == len(values)
+    assert mean == pytest.approx(expected_mean)
+    assert m2 == pytest.approx(sum((value - expected_mean) ** 2 for value in values))
+
+def test_welford_remove_undoes_add():
+    state = (0, 0.0, 0.0)
+    for value in [12.5, 40.0, 7.25, 19.0]:
+        state = add_sample(state, value)
+    count, mean, m2 = remove_sample(add_sample(state, 1000.0), 1000.0)
+    assert count == state[0]
+    assert mean == pytest.approx(state[1])
+    assert m2 == pytest.approx(state[2])
+    assert remove_sample((1, 50.0, 0.0), 50.0) == (0, 0.0, 0.0)
+
+def test_writes_maintain_category_stats(auth_client, user):
+    ids = post_expenses(auth_client, AMOUNTS)
+    auth_client.post(reverse("expense-list"), {"category": "Rent", "amount": "20000.00", "date_spent": "2024-01-01"},
+                     format="json")
+    assert_matches(user, AMOUNTS)
+    assert_matches(user, ["20000.00"], "Rent")
+
+    # Moving an expense to another category takes it out of the old statistics
+    auth_client.patch(reverse("expense-detail", kwargs={"pk": ids[0]}), {"category": "Rent", "amount": "21000.00"},
+                      format="json")
+    assert_matches(user, AMOUNTS[1:])
+    assert_matches(user, ["20000.00", "21000.00"], "Rent")
+
+    auth_client.delete(reverse("expense-detail", kwargs={"pk": ids[1]}))
+    assert_matches(user, AMOUNTS[2:])
+
+def test_stale_instances_do_not_skew_stats(auth_client, user):
+    ids = post_expenses(auth_client, AMOUNTS)
+    # Two writers load the same expense; each must move it from what the other committed, not from 100.00
+    first, second = Expense.objects.get(pk=ids[0]), Expense.objects.get(pk=ids[0])
+    first.amount = Decimal("300.00")
+    first.save()
+    second.amount = Decimal("400.00")
+    second.save()
+    assert_matches(user, ["400.00"] + AMOUNTS[1:])
+
+    first.delete()
+    assert_matches(user, AMOUNTS[1:])
+
+@pytest.mark.django_db(transaction=True)
+def test_stats_lock_existing_rows_in_a_transaction_of_their_own():
+    user = create_test_user()['user']
+    seen = []
+    select_for_update = QuerySet.select_for_update
+
+    def spy(queryset, *args, **kwargs):
+        if queryset.model is CategoryStats:
+            seen.append((connection.in_atomic_block, CategoryStats.objects.filter(user=user).exists()))
+        return select_for_update(queryset, *args, **kwargs)
+
+    # Saved outside any transaction, as from the shell, for a category with no statistics yet
+    with patch.object(QuerySet, "select_for_update", spy):
+        Expense.objects.create(user=user, category="Groceries", amount=Decimal("100.00"), date_spent=date(2024, 1, 15))
+    assert seen == [(True, True)]
+    assert stats(user) == (1, 100.0, 0.0)
+
+def test_unusually_large_expense_is_flagged(auth_client, user):
+    post_expenses(auth_client, AMOUNTS)
+    [normal, large] = post_expenses(auth_client, ["120.00", "500.00"])
+
+    anomaly = ExpenseAnomaly.objects.get()
+    assert anomaly.expense_id == large
+    # Scored against the six expenses before it
+    earlier = [float(amount) for amount in AMOUNTS + ["120.00"]]
+    mean = sum(earlier) / len(earlier)
+    std = math.sqrt(sum((value - mean) ** 2 for value in earlier) / (len(earlier) - 1))
+    assert anomaly.category_mean == pytest.approx(mean)
+    assert anomaly.category_std == pytest.approx(std)
+    assert anomaly.z_score == pytest.approx((500 - mean) / std)
+    assert not ExpenseAnomaly.objects.filter(expense_id=normal).exists()
+
+def test_too_few_samples_are_not_scored(auth_client):
+    post_expenses(auth_client, AMOUNTS[:4] + ["5000.00"])
+    assert not ExpenseAnomaly.objects.exists()
+
+def test_editing_a_flagged_expense_clears_or_moves_its_flag(auth_client, user):
+    post_expenses(auth_client, AMOUNTS)
+    [large] = post_expenses(auth_client, ["500.00"])
+    detail = reverse("expense-detail", kwargs={"pk": large})
+
+    auth_client.patch(detail, {"amount": "102.00"}, format="json")
+    assert not ExpenseAnomaly.objects.exists()
+
+    auth_client.patch(detail, {"amount": "900.00"}, format="json")
+    assert ExpenseAnomaly.objects.get().expense_id == large
+
+    auth_client.delete(detail)
+    assert not ExpenseAnomaly.objects.exists()
+    assert_matches(user, AMOUNTS)
+
+def test_anomalies_endpoint_lists_own_flags(auth_client, user):
+    post_expenses(auth_client, AMOUNTS)
+    [large] = post_expenses(auth_client, ["500.00"])
+    other = create_test_user(username="other", email="other@example.com")
+    other_client = APIClient()
+    other_client.force_authenticate(user=other['user'])
+    post_expenses(other_client, AMOUNTS + ["800.00"])
+
+    response = auth_client.get(reverse("expense-anomalies"))
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data) == 1
+    flagged = response.data[0]
+    assert flagged["expense"] == {"id": large, "category": "Groceries", "amount": "500.00", "date_spent": "2024-01-15"}
+    assert flagged["z_score"] > 3
+    assert flagged["category_mean"] == 100.0
+    assert set(flagged) == {"expense", "z_score", "category_mean", "category_std", "flagged_at"}
+
+def test_anomalies_require_authentication():
+    assert APIClient().get(reverse("expense-anomalies")).status_code == status.HTTP_401_UNAUTHORIZED
+
+def test_rebuild_matches_incremental_stats(auth_client, user):
+    post_expenses(auth_client, AMOUNTS)
+    post_expenses(auth_client, ["20000.00", "18000.00"], "Rent")
+    Expense.objects.bulk_create(assign_dimensions(Expense, [
+        Expense(user=user, category="Groceries", amount=Decimal("80.00"), date_spent=date(2024, 2, 1)),
+    ]))
+    incremental = stats(user, "Rent")
+
+    assert rebuild_category_stats([user.pk]) == 2
+    assert_matches(user, AMOUNTS + ["80.00"])
+    assert stats(user, "Rent") == pytest.approx(incremental)
@@ -0,0 +1,64 @@
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+from django.urls import reverse
+from rest_framework import serializers
+from rest_framework.test import APIClient
+from api.fast_serialization import compile_representation, values_representation
+from api.models import Income, Expense, Investment
+from api.renderers import FastJSONRenderer
+from api.serializers import IncomeSerializer, ExpenseSerializer, InvestmentSerializer
+from api.tests.test_utils import create_test_user
+
+pytestmark = pytest.mark.django_db
+
+@pytest.fixture
+def user(db):
+    user = create_test_user()['user']
+    today = date.today()
+    for i, amount in enumerate([Decimal("0.10"), Decimal("1250.5"), Decimal("9999999999.99"), Decimal("42")]):
+        Income.objects.create(user=user, source=f"Freelance ₹{i}", amount=amount, date_received=today - timedelta(days=i))
+        Expense.objects.create(user=user, category=f"Café {i}", amount=amount, date_spent=today - timedelta(days=i))
+    Investment.objects.create(user=user, name="Nifty SIP", investment_type="sip", amount_invested=Decimal("5000"),
+                              current_value=Decimal("5321.7"), date_invested=today, interest_rate=Decimal("12.5"), years=10)
+    Investment.objects.create(user=user, name="Gold ETF", investment_type="gold", amount_invested=Decimal("0.01"),
+                              current_value=Decimal("0"), date_invested=today - timedelta(days=400))
+    return user
+
+@pytest.mark.parametrize("serializer_class, related_name", [
+    (IncomeSerializer, "incomes"),
+    (ExpenseSerializer, "expenses"),
+    (InvestmentSerializer, "investments"),
+])
+def test_values_representation_matches_serializer(user, serializer_class, related_name):
+    queryset = getattr(user, related_name).order_by("id")
+    expected = serializer_class(queryset, many=True).data
+    actual = values_representation(serializer_class(), queryset)
+
+    assert actual == expected
+    assert FastJSONRenderer().render(actual) == FastJSONRenderer().render(expected)
+
+@pytest.mark.parametrize("route, serializer_class, related_name", [
+    ("income-list", IncomeSerializer, "incomes"),
+    ("expense-list", ExpenseSerializer, "expenses"),
+    ("investment-list", InvestmentSerializer, "investments"),
+])
+def test_list_endpoint_body_is_unchanged(user, route, serializer_class, related_name):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    response = client.get(reverse(route))
+
+    expected = serializer_class(getattr(user, related_name).all(), many=True).data
+    assert sorted(response.data, key=lambda row: row["id"]) == sorted(expected, key=lambda row: row["id"])
+
+def test_serializers_without_plain_columns_fall_back(user):
+    class ExpenseWithOwner(serializers.ModelSerializer):
+        owner = serializers.CharField(source="user.username")
+
+        class Meta:
+            model = Expense
+            fields = ["id", "owner"]
+
+    assert compile_representation(ExpenseWithOwner()) is None
+    data = values_representation(ExpenseWithOwner(), Expense.objects.order_by("id"))
+    assert data[0]["owner"] == user.username
@@ -0,0 +1,96 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+from django.urls import reverse
+from rest_framework import status
+from api.models import FinancialProfile, Investment
+from api.services.monte_carlo import run_simulation, simulate_paths
+
+@pytest.fixture
+def profile(user):
+    return FinancialProfile.objects.create(user=user, age=30, monthly_salary=100000, monthly_savings=20000,
+                                           risk_tolerance="medium")
+
+def test_zero_volatility_compounds_deterministically():
+    successes, bands = simulate_paths(100, 2, 1000, 0, mean=0.10, volatility=0.0, goal=1209)
+
+    assert successes == 100
+    assert bands[:, -1] == pytest.approx([1210.0] * 5)
+
+def test_contributions_and_step_up():
+    # No growth: twelve contributions a year, the second year's 10% larger
+    _, bands = simulate_paths(10, 2, 0, 100, mean=0.0, volatility=0.0, goal=1, step_up=0.10)
+
+    assert bands[2] == pytest.approx([1200.0, 2520.0])
+
+def test_bands_widen_with_risk():
+    _, low = simulate_paths(20_000, 20, 100000, 10000, 0.07, 0.06, goal=1, seed=1)
+    _, high = simulate_paths(20_000, 20, 100000, 10000, 0.12, 0.18, goal=1, seed=1)
+
+    assert (low[:, -1] == sorted(low[:, -1])).all()
+    assert high[-1, -1] - high[0, -1] > low[-1, -1] - low[0, -1]
+
+def test_seed_makes_runs_reproducible():
+    first = run_simulation(5000, 10, 1000, 100, 0.1, 0.12, goal=30000, seed=7, workers=1)
+    second = run_simulation(5000, 10, 1000, 100, 0.1, 0.12, goal=30000, seed=7, workers=1)
+
+    assert first[0] == second[0]
+    assert (first[1] == second[1]).all()
+
+def test_process_pool_matches_a_single_process(settings):
+    settings.MONTE_CARLO = {**settings.MONTE_CARLO, 'WORKERS': 2, 'MIN_PATHS_PER_WORKER': 10_000}
+
+    pooled, pooled_bands = run_simulation(40_000, 15, 50000, 5000, 0.1, 0.12, goal=2_500_000, seed=3)
+    single, single_bands = run_simulation(40_000, 15, 50000, 5000, 0.1, 0.12, goal=2_500_000, seed=3, workers=1)
+
+    assert pooled == pytest.approx(single, abs=0.02)
+    assert pooled_bands == pytest.approx(single_bands, rel=0.03)
+
+def test_endpoint_defaults_to_the_profile(auth_client, user, profile):
+    Investment.objects.create(user=user, name="Index Fund", investment_type="stocks", amount_invested=Decimal("100000"),
+                              current_value=Decimal("150000"), date_invested=date(2023, 1, 1))
+
+    response = auth_client.post(reverse("analytics-goal-simulation"),
+                                {"goal_amount": "10000000.00", "target_age": 50, "paths": 5000, "seed": 1},
+                                format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.data
+    assert data["years"] == 20
+    assert data["inputs"]["goal_amount"] == "10000000.00"
+    assert data["inputs"]["current_savings"] == "150000.00"
+    assert data["inputs"]["monthly_savings"] == "20000.00"
+    assert data["inputs"]["risk_tolerance"] == "medium"
+    assert data["ages"][0] == 31 and data["ages"][-1] == 50
+    assert len(data["bands"]["p50"]) == 20
+    assert 0 <= data["success_probability"] <= 1
+
+def test_endpoint_overrides_and_probability_ordering(auth_client, profile):
+    url = reverse("analytics-goal-simulation")
+    payload = {"target_age": 45, "paths": 5000, "seed": 1, "current_savings": "0", "risk_tolerance": "low"}
+
+    modest = auth_client.post(url, {**payload, "goal_amount": "1000000.00"}, format="json").data
+    ambitious = auth_client.post(url, {**payload, "goal_amount": "50000000.00"}, format="json").data
+
+    assert modest["inputs"]["risk_tolerance"] == "low"
+    assert modest["inputs"]["current_savings"] == "0.00"
+    assert modest["success_probability"] == 1.0
+    assert ambitious["success_probability"] == 0.0
+
+@pytest.mark.parametrize("payload", [
+    {"goal_amount": "1000000.00", "target_age": 30},
+    {"goal_amount": "1000000.00", "target_age": 60, "paths": 10_000_000},
+    {"goal_amount": "-5", "target_age": 60},
+    {"goal_amount": "1000000.00", "target_age": 60, "seed": -1},
+])
+def test_endpoint_rejects_invalid_requests(auth_client, profile, payload):
+    response = auth_client.post(reverse("analytics-goal-simulation"), payload, format="json")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+def test_endpoint_requires_a_profile(auth_client):
+    response = auth_client.post(reverse("analytics-goal-simulation"),
+                                {"goal_amount": "1000.00", "target_age": 60}, format="json")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "profile" in response.data["error"]
@@ -0,0 +1,101 @@
+import os
+import pytest
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from api.models import FinancialProfile
+from api.services.ai_advisor import get_financial_advice, query_ai
+from api.services.llm_metrics import LLMMetrics, llm_metrics
+from api.services.llm_stub import StubLLMServer
+from api.services.model_router import model_health
+from api.services.semantic_cache import chat_answer_cache
+from api.tests.test_utils import create_test_user
+
+@pytest.fixture(autouse=True)
+def stub(settings):
+    os.environ["GROQ_API_KEY"] = "test-api-key"
+    settings.AI_MODEL_ROUTING = {'ROUTES': {'default': [{'models': ['big', 'small']}]}, 'TIMEOUT': 2}
+    llm_metrics.reset()
+    model_health.reset()
+    chat_answer_cache.clear()
+    with StubLLMServer(reply="three word reply") as server:
+        settings.GROQ_API_URL = server.url
+        yield server
+    llm_metrics.reset()
+    chat_answer_cache.clear()
+    del os.environ["GROQ_API_KEY"]
+
+def test_call_records_usage_and_timings(stub):
+    query_ai([{"role": "user", "content": "how should I save"}], mode="normal", user_id=7)
+
+    stats = llm_metrics.summary()["normal"]["big"]
+    assert stats["calls"] == 1
+    assert stats["errors"] == 0
+    assert stats["prompt_chars"] == len("how should I save")
+    assert stats["prompt_tokens"] == 4
+    assert stats["completion_tokens"] == 3
+    assert stats["ttfb_avg"] is not None
+    assert stats["latency_avg"] >= stats["ttfb_avg"]
+    assert llm_metrics.user_summary(7)["normal"]["calls"] == 1
+
+def test_fallback_records_error_and_retry(stub):
+    stub.failures.add("big")
+    query_ai([{"role": "user", "content": "hi"}], mode="normal")
+
+    summary = llm_metrics.summary()["normal"]
+    assert summary["big"]["errors"] == 1
+    assert summary["small"]["calls"] == 1
+    assert summary["small"]["retries"] == 1
+
+def test_fallback_records_one_cache_miss_per_request(stub):
+    stub.failures.add("big")
+    query_ai([{"role": "user", "content": "hi"}], mode="chat", cache_hit=False)
+
+    summary = llm_metrics.summary()["chat"]
+    assert summary["big"]["cache_misses"] + summary["small"]["cache_misses"] == 1
+
+def test_per_user_aggregates_are_bounded():
+    metrics = LLMMetrics(max_users=2)
+    for user_id in (1, 2, 1, 3):
+        metrics.record_call("chat", "big", user_id=user_id)
+    # User 2 was least recently active
+    assert metrics.user_summary(2) == {}
+    assert metrics.user_summary(1)["chat"]["calls"] == 2
+    assert metrics.user_summary(3)["chat"]["calls"] == 1
+    assert metrics.summary()["chat"]["big"]["calls"] == 4
+
+@pytest.mark.django_db
+def test_chat_cache_hits_and_misses_are_recorded(stub):
+    user = create_test_user()['user']
+    FinancialProfile.objects.create(user=user, age=30, monthly_salary=50000, monthly_savings=10000, risk_tolerance='medium')
+
+    get_financial_advice(user.id, mode="chat", user_message="Should I invest in SIP?")
+    get_financial_advice(user.id, mode="chat", user_message="Should I invest in SIP?")
+
+    summary = llm_metrics.summary()["chat"]
+    assert summary["big"]["cache_misses"] == 1
+    assert summary["cache"]["cache_hits"] == 1
+    assert llm_metrics.user_summary(user.id)["chat"]["calls"] == 2
+
+@pytest.mark.django_db
+class TestMetricsEndpoints:
+    def test_metrics_require_admin(self):
+        client = APIClient()
+        client.force_authenticate(user=create_test_user()['user'])
+        assert client.get(reverse("ai-metrics")).status_code == status.HTTP_403_FORBIDDEN
+        assert client.get(reverse("ai-user-metrics", args=[1])).status_code == status.HTTP_403_FORBIDDEN
+
+    def test_admin_can_read_metrics(self, stub):
+        admin = User.objects.create_user(username="admin", password="adminpass123", is_staff=True)
+        query_ai([{"role": "user", "content": "hi"}], mode="loan", user_id=admin.id)
+        client = APIClient()
+        client.force_authenticate(user=admin)
+
+        response = client.get(reverse("ai-metrics"))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["modes"]["loan"]["big"]["calls"] == 1
+
+        response = client.get(reverse("ai-user-metrics", args=[admin.id]))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["modes"]["loan"]["calls"] == 1
@@ -0,0 +1,127 @@
+import copy
+import json
+import logging
+import logging.config
+import threading
+from api.log_handlers import JSONFormatter, QueueingHandler, SamplingFilter
+
+def make_logger(name, handler):
+    logger = logging.getLogger(name)
+    logger.handlers = [handler]
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    return logger
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.written = []
+
+    def emit(self, record):
+        self.written.append((threading.current_thread(), self.format(record)))
+
+def test_records_are_formatted_and_written_by_background_thread():
+    handler = QueueingHandler("api.tests.test_log_handlers.RecordingHandler")
+    logger = make_logger("test.queueing", handler)
+
+    logger.info("Fetching expenses for user %s", 42)
+    handler.flush()
+
+    [(writer, message)] = handler.target.written
+    assert message == "Fetching expenses for user 42"
+    assert writer is not threading.current_thread()
+    handler.close()
+
+def test_records_are_queued_without_the_callers_objects(tmp_path):
+    path = tmp_path / "app.log"
+    handler = QueueingHandler("logging.FileHandler", filename=str(path))
+    handler.setFormatter(JSONFormatter())
+    handler.listener.stop()
+    logger = make_logger("test.prepared", handler)
+
+    items = ["rent"]
+    logger.info("Items %s", items)
+    try:
+        raise ValueError("bad amount")
+    except ValueError:
+        logger.exception("Save failed")
+    # Changed after the calls, before the listener formats the records
+    items.append("groceries")
+    queued = list(handler.queue.queue)
+    handler.listener.start()
+    handler.close()
+
+    assert [(record.args, record.exc_info) for record in queued] == [(None, None), (None, None)]
+    first, second = map(json.loads, path.read_text().splitlines())
+    assert first["message"] == "Items ['rent']"
+    assert second["message"] == "Save failed"
+    assert "ValueError: bad amount" in second["exc_info"]
+
+def test_file_target(tmp_path):
+    path = tmp_path / "app.log"
+    handler = QueueingHandler("logging.FileHandler", filename=str(path))
+    handler.setFormatter(JSONFormatter())
+    logger = make_logger("test.file", handler)
+
+    logger.info("Fetching expenses for user %s", 42)
+    handler.close()
+
+    assert json.loads(path.read_text())["message"] == "Fetching expenses for user 42"
+
+def test_full_queue_drops_instead_of_blocking(tmp_path):
+    handler = QueueingHandler("logging.FileHandler", queue_size=1, filename=str(tmp_path / "app.log"))
+    handler.listener.stop()
+    handler._running = False
+    logger = make_logger("test.dropping", handler)
+
+    for i in range(5):
+        logger.info("message %s", i)
+    assert handler.dropped == 4
+    handler.close()
+
+def test_sampling_keeps_one_in_n():
+    sampler = SamplingFilter(every={"test.sampling": {"Fetching expenses": 3}})
+    records = [
+        logging.LogRecord("test.sampling", logging.INFO, __file__, 1, "Fetching expenses for user %s", (i,), None)
+        for i in range(9)
+    ]
+    assert sum(sampler.filter(record) for record in records) == 3
+
+    other = logging.LogRecord("test.sampling", logging.INFO, __file__, 1, "Expense %s created", (1,), None)
+    assert all(sampler.filter(other) for _ in range(5))
+
+    elsewhere = logging.LogRecord("test.other", logging.INFO, __file__, 1, "Fetching expenses for user %s", (1,), None)
+    assert all(sampler.filter(elsewhere) for _ in range(5))
+
+def test_sampling_is_shared_by_handlers_using_the_real_config(tmp_path, settings):
+    config = copy.deepcopy(settings.LOGGING)
+    # The real handlers and shared filter, writing to files we can read back
+    config["handlers"]["file"]["filename"] = str(tmp_path / "file.log")
+    config["handlers"]["console"].update(target="logging.FileHandler", filename=str(tmp_path / "console.log"))
+    every = settings.LOG_SAMPLE_EVERY
+    logging.config.dictConfig(config)
+    try:
+        logger = logging.getLogger("api.views.expense_views")
+        for i in range(10 * every):
+            logger.info("ExpenseListCreateView: Fetching expenses for user %s", i)
+        logger.info("Expense %s created", 1)
+        for handler in logging.getLogger("api").handlers:
+            handler.flush()
+
+        for name in ("file.log", "console.log"):
+            lines = (tmp_path / name).read_text().splitlines()
+            assert len(lines) == 10 + 1
+        assert "_sampled" not in json.loads((tmp_path / "file.log").read_text().splitlines()[0])
+    finally:
+        for handler in logging.getLogger("api").handlers:
+            handler.close()
+        logging.config.dictConfig(settings.LOGGING)
+
+def test_json_formatter_includes_extra_fields():
+    record = logging.LogRecord("api.views", logging.WARNING, __file__, 1, "User %s failed", (7,), None)
+    record.status_code = 400
+    entry = json.loads(JSONFormatter().format(record))
+    assert entry["message"] == "User 7 failed"
+    assert entry["level"] == "WARNING"
+    assert entry["logger"] == "api.views"
+    assert entry["status_code"] == 400
@@ -0,0 +1,144 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import pytest
+from datetime import date
+from django.urls import reverse
+from rest_framework.test import APIClient
+from api.metrics import RequestMetrics, request_metrics
+from api.models import Expense
+from api.tests.test_utils import create_test_user
+
+pytestmark = pytest.mark.django_db
+
+@pytest.fixture(autouse=True)
+def clean_metrics(settings):
+    settings.METRICS_DIR = None
+    settings.METRICS_AUTH_TOKEN = None
+    settings.DEBUG = True
+    request_metrics.reset()
+    yield
+    request_metrics.reset()
+
+@pytest.fixture
+def auth_client(db):
+    user = create_test_user()['user']
+    Expense.objects.create(user=user, category="Rent", amount=15000, date_spent=date.today())
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+def metric_value(body, line_prefix):
+    for line in body.splitlines():
+        if line.startswith(line_prefix):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{line_prefix} not found in metrics")
+
+def test_requests_are_recorded_per_route(auth_client):
+    auth_client.get(reverse("expense-list"))
+    auth_client.get(reverse("expense-list"))
+    auth_client.get(reverse("expense-detail", args=[999]))
+
+    stats = request_metrics.snapshot()
+    listing = stats[("expense-list", "GET")]
+    assert listing['count'] == 2
+    assert listing['db_queries'] >= 2
+    assert listing['response_bytes'] > 0
+    assert listing['status'] == {"200": 2}
+    assert stats[("expense-detail", "GET")]['status'] == {"404": 1}
+
+def test_metrics_endpoint_renders_prometheus_text(auth_client, client):
+    auth_client.get(reverse("expense-list"))
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+    body = response.content.decode()
+    assert metric_value(body, 'http_request_duration_seconds_count{route="expense-list",method="GET"}') == 1
+    assert metric_value(body, 'http_request_duration_seconds_bucket{route="expense-list",method="GET",le="+Inf"}') == 1
+    assert metric_value(body, 'http_requests_total{route="expense-list",method="GET",status="200"}') == 1
+    assert metric_value(body, 'http_db_queries_total{route="expense-list",method="GET"}') >= 1
+
+def test_shards_from_other_threads_are_merged():
+    def record():
+        request_metrics.record("expense-list", "GET", 200, 0.02, 3, 0.001, 100)
+
+    threads = [threading.Thread(target=record) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    record()
+
+    stats = request_metrics.snapshot()[("expense-list", "GET")]
+    assert stats['count'] == 5
+    assert stats['db_queries'] == 15
+
+def test_threads_share_a_fixed_set_of_shards():
+    metrics = RequestMetrics(shards=4)
+    threads = [
+        threading.Thread(target=metrics.record, args=("expense-list", "GET", 200, 0.02, 1, 0.001, 10))
+        for _ in range(50)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(metrics._shards) == 4
+    assert metrics.snapshot()[("expense-list", "GET")]['count'] == 50
+
+def test_worker_files_are_merged(settings, tmp_path, client):
+    settings.METRICS_DIR = str(tmp_path)
+    request_metrics.record("expense-list", "GET", 200, 0.02, 3, 0.001, 100)
+    other_worker = [{
+        "route": "expense-list", "method": "GET", "count": 2, "latency_sum": 0.5,
+        "latency_buckets": [0] * 11 + [2], "db_queries": 4, "db_time": 0.01,
+        "response_bytes": 10, "status": {"200": 1, "500": 1},
+    }]
+    (tmp_path / f"{os.getppid()}.json").write_text(json.dumps(other_worker))
+
+    stats = request_metrics.collect()[("expense-list", "GET")]
+    assert stats['count'] == 3
+    assert stats['db_queries'] == 7
+    assert stats['status'] == {"200": 2, "500": 1}
+
+def test_exited_workers_files_are_removed(settings, tmp_path):
+    settings.METRICS_DIR = str(tmp_path)
+    exited = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True)
+    stale = tmp_path / f"{exited.stdout.strip()}.json"
+    stale.write_text(json.dumps([{
+        "route": "expense-list", "method": "GET", "count": 5, "latency_sum": 0.5, "latency_buckets": [0] * 11 + [5],
+        "db_queries": 5, "db_time": 0.01, "response_bytes": 10, "status": {"200": 5},
+    }]))
+
+    assert ("expense-list", "GET") not in request_metrics.collect()
+    assert not stale.exists()
+    assert (tmp_path / f"{os.getpid()}.json").exists()
+
+def test_totals_are_flushed_in_the_background(settings, tmp_path):
+    settings.METRICS_DIR = str(tmp_path)
+    settings.METRICS_FLUSH_INTERVAL = 0.05
+    metrics = RequestMetrics()
+    for _ in range(3):
+        metrics.record("expense-list", "GET", 200, 0.02, 3, 0.001, 100)
+    assert metrics._flusher_pid == os.getpid()
+
+    path = tmp_path / f"{os.getpid()}.json"
+    for _ in range(50):
+        if path.exists():
+            break
+        time.sleep(0.02)
+    assert json.loads(path.read_text())[0]["count"] == 3
+
+def test_metrics_token(settings, client):
+    settings.METRICS_AUTH_TOKEN = "secret"
+    assert client.get("/metrics").status_code == 403
+    assert client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret").status_code == 200
+
+def test_metrics_closed_without_token_outside_debug(settings, client):
+    settings.DEBUG = False
+    assert client.get("/metrics").status_code == 403
@@ -0,0 +1,112 @@
+import os
+import time
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from api.services.ai_advisor import query_ai
+from api.services.llm_stub import StubLLMServer
+from api.services.model_router import candidate_models, model_health
+
+LARGE = "llama-3.3-70b-versatile"
+SMALL = "llama-3.1-8b-instant"
+
+@pytest.fixture(autouse=True)
+def routing(settings):
+    os.environ["GROQ_API_KEY"] = "test-api-key"
+    settings.AI_MODEL_ROUTING = {
+        'ROUTES': {
+            'default': [{'models': [LARGE, SMALL]}],
+            'chat': [
+                {'max_prompt_chars': 100, 'models': [SMALL, LARGE]},
+                {'models': [LARGE, SMALL]},
+            ],
+        },
+        'TIMEOUT': 0.5,
+        'SLOW_LATENCY_SECONDS': 0.2,
+        'MAX_ERROR_RATE': 0.5,
+        'MIN_SAMPLES': 2,
+        'SMOOTHING': 0.5,
+    }
+    model_health.reset()
+    yield settings
+    model_health.reset()
+    del os.environ["GROQ_API_KEY"]
+
+@pytest.fixture
+def stub(routing):
+    with StubLLMServer() as server:
+        routing.GROQ_API_URL = server.url
+        yield server
+
+def test_short_chat_prompt_uses_small_model(stub):
+    assert query_ai([{"role": "user", "content": "Should I invest in SIP?"}], mode="chat") == "Stub advice."
+    assert stub.models_called == [SMALL]
+
+def test_long_chat_prompt_uses_large_model(stub):
+    query_ai([{"role": "user", "content": "x" * 500}], mode="chat")
+    assert stub.models_called == [LARGE]
+
+def test_unknown_mode_uses_default_route(stub):
+    query_ai([{"role": "user", "content": "hi"}], mode="loan")
+    assert stub.models_called == [LARGE]
+
+def test_failing_model_falls_back(stub):
+    stub.failures.add(LARGE)
+    assert query_ai([{"role": "user", "content": "hi"}], mode="normal") == "Stub advice."
+    assert stub.models_called == [LARGE, SMALL]
+    assert model_health.snapshot()[LARGE]['error_rate'] > 0
+
+def test_slow_model_times_out_and_falls_back(stub):
+    stub.delays[LARGE] = 1.0
+    assert query_ai([{"role": "user", "content": "hi"}], mode="normal") == "Stub advice."
+    assert stub.models_called == [LARGE, SMALL]
+
+def test_degraded_model_is_demoted(stub):
+    stub.delays[LARGE] = 0.3
+    for _ in range(2):
+        query_ai([{"role": "user", "content": "hi"}], mode="normal")
+    assert candidate_models("normal", 2) == [SMALL, LARGE]
+
+    stub.requests.clear()
+    query_ai([{"role": "user", "content": "hi"}], mode="normal")
+    assert stub.models_called == [SMALL]
+
+def test_demoted_model_recovers_after_probe(routing, stub):
+    routing.AI_MODEL_ROUTING = {**routing.AI_MODEL_ROUTING, 'PROBE_INTERVAL_SECONDS': 0.1}
+    stub.delays[LARGE] = 0.3
+    for _ in range(2):
+        query_ai([{"role": "user", "content": "hi"}], mode="normal")
+    assert candidate_models("normal", 2) == [SMALL, LARGE]
+
+    # Healthy again, and called once the probe interval has passed; ranking the models doesn't use up the probe
+    del stub.delays[LARGE]
+    time.sleep(0.15)
+    assert candidate_models("normal", 2) == candidate_models("normal", 2) == [SMALL, LARGE]
+    stub.requests.clear()
+    query_ai([{"role": "user", "content": "hi"}], mode="normal")
+    assert stub.models_called == [LARGE]
+    assert candidate_models("normal", 2) == [LARGE, SMALL]
+
+def test_probe_goes_first_once_per_interval(routing, stub):
+    routing.AI_MODEL_ROUTING = {
+        **routing.AI_MODEL_ROUTING, 'ROUTES': {'default': [{'models': [SMALL, LARGE]}]}, 'PROBE_INTERVAL_SECONDS': 0.1,
+    }
+    stub.failures.add(SMALL)
+    for _ in range(2):
+        query_ai([{"role": "user", "content": "hi"}], mode="normal")
+
+    time.sleep(0.15)
+    stub.requests.clear()
+    for _ in range(2):
+        query_ai([{"role": "user", "content": "hi"}], mode="normal")
+    # The first request probes the demoted model, still failing, then falls back; the second doesn't
+    assert stub.models_called == [SMALL, LARGE, LARGE]
+
+def test_route_without_models_raises(routing):
+    routing.AI_MODEL_ROUTING = {**routing.AI_MODEL_ROUTING, 'ROUTES': {'default': [{'models': []}]}}
+    with pytest.raises(ImproperlyConfigured):
+        query_ai([{"role": "user", "content": "hi"}], mode="normal")
+
+def test_all_models_failing_raises(stub):
+    stub.failures.update({LARGE, SMALL})
+    with pytest.raises(Exception):
+        query_ai([{"role": "user", "content": "hi"}], mode="normal")
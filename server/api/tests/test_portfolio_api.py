@@ -0,0 +1,123 @@
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from api.models import Investment
+from api.services.portfolio import get_portfolio_returns
+
+pytestmark = pytest.mark.django_db
+
+TODAY = date(2025, 1, 1)
+
+def lot(user, kind, invested, current, days_ago, today=TODAY):
+    return Investment.objects.create(
+        user=user, name=f"{kind} lot", investment_type=kind, amount_invested=Decimal(invested),
+        current_value=Decimal(current), date_invested=today - timedelta(days=days_ago),
+        interest_rate=Decimal("7.00") if kind in ("sip", "fd") else None, years=5 if kind in ("sip", "fd") else None,
+    )
+
+def test_single_lot_cagr_and_xirr(user):
+    lot(user, "stocks", "100000.00", "121000.00", 730)
+
+    result = get_portfolio_returns(user.id, today=TODAY)
+
+    assert result["total"] == {
+        "holdings": 1, "amount_invested": "100000.00", "current_value": "121000.00", "absolute_return": "21000.00",
+        "return_pct": 21.0, "cagr_pct": 10.0, "xirr_pct": 10.0,
+    }
+    holding = result["holdings"][0]
+    assert holding["days_held"] == 730
+    assert holding["cagr_pct"] == holding["xirr_pct"] == 10.0
+
+def test_xirr_accounts_for_staggered_lots(user):
+    # 1000 two years ago and 1000 one year ago, both compounding at 10%
+    lot(user, "stocks", "1000.00", "1210.00", 730)
+    lot(user, "stocks", "1000.00", "1100.00", 365)
+
+    result = get_portfolio_returns(user.id, today=TODAY)
+
+    assert result["by_type"]["stocks"]["xirr_pct"] == 10.0
+    assert result["total"]["return_pct"] == 15.5
+
+def test_sip_is_a_monthly_instalment(user):
+    # 1000 a month through 2023, as in the projections; every instalment has grown at 10% a year since
+    start = date(2023, 1, 31)
+    paid = [date(2023, month, 28 if month == 2 else 30 if month in (4, 6, 9, 11) else 31) for month in range(1, 13)]
+    value = sum(1000 * 1.1 ** ((TODAY - day).days / 365) for day in paid)
+    sip = Investment.objects.create(
+        user=user, name="Index SIP", investment_type="sip", amount_invested=Decimal("1000.00"),
+        current_value=Decimal(f"{value:.2f}"), date_invested=start, interest_rate=Decimal("12.00"), years=1,
+    )
+
+    [holding] = get_portfolio_returns(user.id, today=TODAY)["holdings"]
+
+    assert holding["id"] == sip.id
+    assert holding["instalments"] == 12
+    assert holding["amount_invested"] == "12000.00"
+    assert holding["xirr_pct"] == 10.0
+
+def test_running_sip_counts_instalments_due_so_far(user):
+    Investment.objects.create(
+        user=user, name="Open SIP", investment_type="sip", amount_invested=Decimal("500.00"),
+        current_value=Decimal("2100.00"), date_invested=date(2024, 9, 15), interest_rate=Decimal("12.00"), years=10,
+    )
+
+    assert get_portfolio_returns(user.id, today=date(2024, 12, 14))["total"]["amount_invested"] == "1500.00"
+    assert get_portfolio_returns(user.id, today=date(2024, 12, 15))["total"]["amount_invested"] == "2000.00"
+
+def test_groups_by_investment_type(user):
+    lot(user, "stocks", "1000.00", "2000.00", 730)
+    lot(user, "gold", "1000.00", "1000.00", 730)
+    lot(user, "gold", "500.00", "400.00", 400)
+
+    result = get_portfolio_returns(user.id, today=TODAY)
+
+    assert set(result["by_type"]) == {"stocks", "gold"}
+    assert result["by_type"]["stocks"]["cagr_pct"] == 41.42
+    assert result["by_type"]["gold"]["holdings"] == 2
+    assert result["by_type"]["gold"]["absolute_return"] == "-100.00"
+    assert result["by_type"]["gold"]["xirr_pct"] < 0
+    assert result["total"]["holdings"] == 3
+
+def test_short_holdings_are_not_annualized(user):
+    lot(user, "stocks", "1000.00", "1100.00", 30)
+
+    result = get_portfolio_returns(user.id, today=TODAY)
+
+    assert result["total"]["return_pct"] == 10.0
+    assert result["total"]["cagr_pct"] is None
+    assert result["total"]["xirr_pct"] is None
+    assert result["holdings"][0]["cagr_pct"] is None
+
+def test_total_loss(user):
+    lot(user, "stocks", "1000.00", "0.00", 800)
+
+    result = get_portfolio_returns(user.id, today=TODAY)
+
+    assert result["total"]["cagr_pct"] == -100.0
+    assert result["total"]["xirr_pct"] is None
+
+def test_endpoint(user):
+    lot(user, "fd", "50000.00", "53500.00", 365, today=date.today())
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    response = client.get(reverse("analytics-portfolio"))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["total"]["xirr_pct"] == 7.0
+    assert len(response.data["holdings"]) == 1
+
+    response = client.get(reverse("analytics-portfolio"), {"holdings": "false"})
+    assert "holdings" not in response.data
+
+def test_empty_portfolio(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    response = client.get(reverse("analytics-portfolio"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["total"]["holdings"] == 0
+    assert response.data["by_type"] == {}
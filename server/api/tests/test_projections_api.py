@@ -0,0 +1,129 @@
+import math
+import pytest
+from datetime import date
+from decimal import Decimal
+from django.urls import reverse
+from rest_framework import status
+from api.models import Investment
+from api.services import projections
+from api.services.projections import get_projections
+
+pytestmark = pytest.mark.django_db
+
+def holding(user, kind, amount, rate, years, start):
+    return Investment.objects.create(
+        user=user, name=f"{kind} {start}", investment_type=kind, amount_invested=Decimal(amount),
+        current_value=Decimal(amount), date_invested=start, interest_rate=Decimal(rate), years=years,
+    )
+
+def test_sip_curve(user):
+    holding(user, "sip", "1000.00", "12.00", 1, date(2024, 1, 15))
+
+    result = get_projections(user.id)
+
+    assert result["months"][0] == date(2024, 1, 1)
+    assert len(result["months"]) == 12
+    assert result["total"]["invested"][0] == "1000.00"
+    assert result["total"]["value"][0] == "1010.00"
+    assert result["total"]["invested"][-1] == "12000.00"
+    assert result["total"]["value"][-1] == "12809.33"
+    assert result["maturity"][0]["maturity_month"] == date(2024, 12, 1)
+
+def test_fd_compounds_quarterly(user):
+    holding(user, "fd", "100000.00", "8.00", 1, date(2024, 1, 1))
+
+    value = get_projections(user.id)["total"]["value"]
+
+    assert value[2] == "102000.00"
+    assert value[-1] == "108243.22"
+
+def test_curves_are_aligned_on_a_calendar_axis(user):
+    holding(user, "sip", "1000.00", "0.00", 1, date(2024, 1, 1))
+    holding(user, "fd", "100000.00", "8.00", 1, date(2024, 7, 1))
+
+    result = get_projections(user.id)
+
+    assert result["months"][0] == date(2024, 1, 1)
+    assert result["months"][-1] == date(2025, 6, 1)
+    # In December the SIP has matured and the FD is six months old
+    december = result["months"].index(date(2024, 12, 1))
+    assert result["by_type"]["sip"]["value"][december] == "12000.00"
+    assert result["by_type"]["fd"]["value"][december] == "104040.00"
+    assert result["total"]["value"][december] == "116040.00"
+    # A matured SIP keeps its value; the FD hadn't started in January
+    assert result["by_type"]["sip"]["value"][-1] == "12000.00"
+    assert result["by_type"]["fd"]["invested"][0] == "0.00"
+
+def test_only_sip_and_fd_with_terms_are_projected(user):
+    holding(user, "sip", "1000.00", "10.00", 2, date(2024, 1, 1))
+    Investment.objects.create(user=user, name="Stocks", investment_type="stocks", amount_invested=Decimal("100.00"),
+                              current_value=Decimal("100.00"), date_invested=date(2024, 1, 1))
+    Investment.objects.create(user=user, name="Old FD", investment_type="fd", amount_invested=Decimal("100.00"),
+                              current_value=Decimal("100.00"), date_invested=date(2024, 1, 1))
+
+    result = get_projections(user.id, include_holdings=True)
+
+    assert [row["name"] for row in result["holdings"]] == ["sip 2024-01-01"]
+    assert set(result["by_type"]) == {"sip"}
+
+def test_holdings_past_the_caps_are_left_out(user, monkeypatch):
+    kept = holding(user, "sip", "1000.00", "10.00", 2, date(2024, 1, 1))
+    # Saved before the serializer capped terms and rates: a term past year 9999, and values past a float
+    holding(user, "fd", "1000.00", "8.00", 10000, date(2024, 1, 1))
+    holding(user, "sip", "1000.00", "999.99", 500, date(2024, 1, 1))
+    holding(user, "fd", "1000.00", "999.99", 500, date(2024, 1, 1))
+    monkeypatch.setattr(projections, "MAX_YEARS", 1000)
+
+    result = get_projections(user.id, include_holdings=True)
+
+    assert [row["id"] for row in result["holdings"]] == [kept.id]
+    assert len(result["months"]) == 24
+    assert all(math.isfinite(float(value)) for value in result["total"]["value"])
+
+@pytest.mark.parametrize("field, value", [("years", 10000), ("years", 51), ("interest_rate", "50.01")])
+def test_terms_and_rates_are_capped(auth_client, field, value):
+    data = {"name": "Long SIP", "investment_type": "sip", "amount_invested": "1000.00", "current_value": "1000.00",
+            "date_invested": "2024-01-01", "interest_rate": "12.00", "years": 10}
+    response = auth_client.post(reverse("investment-list"), {**data, field: value}, format="json")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert field in response.data
+
+def test_holding_curves_cover_their_own_tenure(user):
+    holding(user, "sip", "500.00", "10.00", 1, date(2023, 6, 1))
+    holding(user, "fd", "1000.00", "7.00", 2, date(2024, 3, 1))
+
+    result = get_projections(user.id, include_holdings=True)
+
+    sip, fd = result["holdings"]
+    assert (sip["start_month"], len(sip["value"])) == (date(2023, 6, 1), 12)
+    assert (fd["start_month"], len(fd["value"])) == (date(2024, 3, 1), 24)
+    assert fd["value"][-1] == result["maturity"][1]["value"]
+
+def test_chunking_does_not_change_results(user, monkeypatch):
+    for month in range(1, 8):
+        holding(user, "sip" if month % 2 else "fd", f"{month * 1000}.00", "9.50", month % 3 + 1, date(2024, month, 1))
+    expected = get_projections(user.id, include_holdings=True)
+
+    monkeypatch.setattr(projections, "HOLDINGS_PER_CHUNK", 2)
+
+    assert get_projections(user.id, include_holdings=True) == expected
+
+def test_endpoint_supports_conditional_get(auth_client, user):
+    holding(user, "sip", "1000.00", "12.00", 1, date(2024, 1, 15))
+
+    response = auth_client.get(reverse("investment-projections"), {"holdings": "true"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["total"]["value"][-1] == "12809.33"
+    assert len(response.data["holdings"]) == 1
+
+    cached = auth_client.get(reverse("investment-projections"),
+                             {"holdings": "true"}, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+
+def test_endpoint_without_projectable_holdings(auth_client):
+    response = auth_client.get(reverse("investment-projections"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["months"] == []
+    assert "holdings" not in response.data
@@ -0,0 +1,209 @@
+"""Query budgets for every route in ``api/urls.py``.
+
+Each user is seeded with many rows of every model, so an N+1 in a view or
+serializer blows through its budget instead of passing unnoticed. Failures list
+every captured SQL statement.
+"""
+import pytest
+from datetime import date, timedelta
+from contextlib import contextmanager
+from unittest.mock import patch
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+from rest_framework.test import APIClient
+from api.models import FinancialProfile, Income, Expense, Investment, Budget
+from api.services.ai_advisor import get_financial_advice
+from api.services.anomalies import rebuild_category_stats
+from api.services.budgets import rebuild_category_spend
+from api.services.data_version import get_data_version
+from api.services.dimensions import assign_dimensions
+from api.services.recurring import detect_recurrences
+from api.services.semantic_cache import chat_answer_cache
+from api.tests.test_utils import create_test_user
+
+ROWS_PER_MODEL = 200
+
+BULK_ITEMS = 10
+PASSWORD = "testpass123"
+
+
+def ids(ctx, model):
+    return {"pk": ctx[model].pk}
+
+
+# (url name, method, url kwargs, payload, who, max queries). ``who`` is the
+# seeded "owner", a "newcomer" with no rows, a staff "admin" or "anonymous";
+# kwargs and payloads may be callables taking the fixture context. Bulk
+# creates still insert one row per item, inside a savepoint. Reads of
+# conditional endpoints and every write add one data-version query; expense
+# writes add one more for the category running total and two for the category
+# statistics (once per bulk request), and updates and deletes one more to
+# clear or cascade the expense's anomaly flag. Creates look up their category
+# or source once per request; these payloads use new labels, which take two
+# more queries to add the dimension row.
+BUDGETS = [
+    ("register", "post", None, {"username": "newuser", "email": "new@example.com", "password": "StrongPass123!",
+                                "password2": "StrongPass123!", "first_name": "New", "last_name": "User"},
+     "anonymous", 4),
+    ("login", "post", None, {"username": "owner", "password": PASSWORD}, "anonymous", 1),
+    ("token_refresh", "post", None, lambda ctx: {"refresh": ctx["refresh"]}, "anonymous", 1),
+
+    ("user-dashboard", "get", None, None, "owner", 5),
+    ("analytics-trends", "get", None, {"period": "month", "start": "2023-01-01"}, "owner", 2),
+    ("analytics-portfolio", "get", None, None, "owner", 1),
+    ("analytics-recurring", "get", None, None, "owner", 3),
+    ("analytics-goal-simulation", "post", None, {"goal_amount": "5000000.00", "target_age": 60, "paths": 1000},
+     "owner", 2),
+
+    ("user-financial-profile", "get", None, None, "owner", 1),
+    ("financial-profile-create", "post", None,
+     {"age": 25, "monthly_salary": 50000, "monthly_savings": 10000, "risk_tolerance": "low"}, "newcomer", 5),
+    ("financial-profile", "get", lambda ctx: ids(ctx, "profile"), None, "owner", 1),
+    ("financial-profile", "patch", lambda ctx: ids(ctx, "profile"), {"monthly_savings": 25000}, "owner", 5),
+    ("financial-profile", "delete", lambda ctx: ids(ctx, "profile"), None, "owner", 5),
+
+    ("income-list", "get", None, None, "owner", 2),
+    ("income-list", "post", None, {"source": "Freelance", "amount": "1500.00", "date_received": "2024-01-15"}, "owner", 7),
+    ("income-list", "post", None,
+     [{"source": "Freelance", "amount": "1500.00", "date_received": "2024-01-15"}] * BULK_ITEMS, "owner", 6 + BULK_ITEMS),
+    ("income-detail", "get", lambda ctx: ids(ctx, "income"), None, "owner", 1),
+    ("income-detail", "patch", lambda ctx: ids(ctx, "income"), {"amount": "2000.00"}, "owner", 5),
+    ("income-detail", "delete", lambda ctx: ids(ctx, "income"), None, "owner", 5),
+
+    ("expense-list", "get", None, None, "owner", 2),
+    ("expense-list", "post", None, {"category": "Groceries", "amount": "250.00", "date_spent": "2024-01-15"}, "owner", 11),
+    ("expense-list", "post", None,
+     [{"category": "Groceries", "amount": "250.00", "date_spent": "2024-01-15"}] * BULK_ITEMS, "owner", 10 + BULK_ITEMS),
+    ("expense-anomalies", "get", None, None, "owner", 1),
+    ("expense-detail", "get", lambda ctx: ids(ctx, "expense"), None, "owner", 1),
+    ("expense-detail", "patch", lambda ctx: ids(ctx, "expense"), {"amount": "300.00"}, "owner", 10),
+    ("expense-detail", "delete", lambda ctx: ids(ctx, "expense"), None, "owner", 10),
+
+    ("investment-list", "get", None, None, "owner", 2),
+    ("investment-list", "post", None,
+     {"name": "Index Fund", "investment_type": "stocks", "amount_invested": "5000.00",
+      "current_value": "5200.00", "date_invested": "2024-01-15"}, "owner", 4),
+    ("investment-list", "post", None,
+     [{"name": "Index Fund", "investment_type": "stocks", "amount_invested": "5000.00",
+       "current_value": "5200.00", "date_invested": "2024-01-15"}] * BULK_ITEMS, "owner", 3 + BULK_ITEMS),
+    ("investment-projections", "get", None, {"holdings": "true"}, "owner", 2),
+    ("investment-detail", "get", lambda ctx: ids(ctx, "investment"), None, "owner", 1),
+    ("investment-detail", "patch", lambda ctx: ids(ctx, "investment"), {"current_value": "6000.00"}, "owner", 5),
+    ("investment-detail", "delete", lambda ctx: ids(ctx, "investment"), None, "owner", 5),
+
+    ("budget-list", "get", None, None, "owner", 1),
+    ("budget-list", "post", None, {"category": "Category 2", "monthly_limit": "8000.00"}, "owner", 5),
+    ("budget-detail", "get", lambda ctx: ids(ctx, "budget"), None, "owner", 1),
+    ("budget-detail", "patch", lambda ctx: ids(ctx, "budget"), {"monthly_limit": "6000.00"}, "owner", 4),
+    ("budget-detail", "delete", lambda ctx: ids(ctx, "budget"), None, "owner", 4),
+    ("budget-status", "get", None, None, "owner", 1),
+
+    # Label matches per kind, then the count and the page
+    ("search", "get", None, {"q": "Category"}, "owner", 5),
+
+    ("user-list-create", "get", None, None, "owner", 1),
+    ("user-list-create", "get", None, None, "admin", 1),
+    ("user-detail", "get", lambda ctx: {"pk": ctx["owner"].pk}, None, "owner", 1),
+    ("user-detail", "patch", lambda ctx: {"pk": ctx["owner"].pk}, {"first_name": "Renamed"}, "owner", 3),
+
+    ("ai-insights", "get", None, None, "owner", 6),
+    ("ai-chat", "post", None, {"message": "How much should I save each month?"}, "owner", 6),
+    ("ai-similar-investments", "get", None, None, "owner", 7),
+    ("ai-loan-analysis", "post", None,
+     {"loan_type": "home", "loan_amount": "2500000.00", "interest_rate": "8.50", "loan_tenure": 20}, "owner", 9),
+    ("ai-metrics", "get", None, None, "admin", 0),
+    ("ai-user-metrics", "get", lambda ctx: {"user_id": ctx["owner"].pk}, None, "admin", 0),
+]
+
+
+def seed_user(username):
+    user = create_test_user(username=username, email=f"{username}@example.com")['user']
+    FinancialProfile.objects.create(user=user, age=30, monthly_salary=80000, monthly_savings=20000, risk_tolerance="medium")
+    today = date.today()
+    Income.objects.bulk_create(assign_dimensions(Income, [
+        Income(user=user, source=f"Source {i % 5}", amount=1000 + i, date_received=today - timedelta(days=i))
+        for i in range(ROWS_PER_MODEL)
+    ]))
+    Expense.objects.bulk_create(assign_dimensions(Expense, [
+        Expense(user=user, category=f"Category {i % 8}", amount=100 + i, date_spent=today - timedelta(days=i))
+        for i in range(ROWS_PER_MODEL)
+    ]))
+    Investment.objects.bulk_create(
+        Investment(user=user, name=f"Fund {i}", investment_type=("stocks", "sip", "fd", "gold")[i % 4],
+                   amount_invested=5000, current_value=5500, date_invested=today - timedelta(days=i),
+                   interest_rate=7 if i % 4 == 1 else None, years=5 if i % 4 == 1 else None)
+        for i in range(ROWS_PER_MODEL)
+    )
+    return user
+
+
+@pytest.fixture
+def ctx(db, settings):
+    settings.PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+    owner = seed_user("owner")
+    seed_user("neighbour")
+    newcomer = create_test_user(username="newcomer", email="newcomer@example.com")['user']
+    admin = User.objects.create_user(username="admin", email="admin@example.com", password=PASSWORD, is_staff=True)
+    Budget.objects.create(user=owner, category="Category 1", monthly_limit=5000)
+    rebuild_category_spend([owner.pk])
+    rebuild_category_stats([owner.pk])
+    # Recurrences as the batch command leaves them; detection itself is covered in test_recurring_api
+    detect_recurrences({owner.pk: get_data_version(owner.pk)[0]})
+    chat_answer_cache.clear()
+    return {
+        "owner": owner,
+        "newcomer": newcomer,
+        "admin": admin,
+        "anonymous": None,
+        "profile": owner.financial_profile,
+        "income": owner.incomes.first(),
+        "expense": owner.expenses.first(),
+        "investment": owner.investments.first(),
+        "budget": owner.budgets.first(),
+        "refresh": create_test_user(username="refresher", email="refresher@example.com")['refresh_token'],
+    }
+
+
+@contextmanager
+def assert_max_queries(max_queries, label):
+    with CaptureQueriesContext(connection) as captured:
+        yield
+    if len(captured) > max_queries:
+        statements = "\n".join(f"{i}. {query['sql']}" for i, query in enumerate(captured.captured_queries, 1))
+        pytest.fail(f"{label} ran {len(captured)} queries, budget is {max_queries}:\n{statements}", pytrace=False)
+
+
+def resolve(value, ctx):
+    return value(ctx) if callable(value) else value
+
+
+@pytest.mark.parametrize(
+    "name, method, kwargs, payload, who, max_queries",
+    [pytest.param(*budget, id=f"{budget[0]}-{budget[1]}-{budget[4]}") for budget in BUDGETS],
+)
+def test_query_budget(ctx, name, method, kwargs, payload, who, max_queries):
+    client = APIClient()
+    if ctx[who] is not None:
+        # A fresh instance, as the authentication class would hand the view
+        client.force_authenticate(user=User.objects.get(pk=ctx[who].pk))
+    url = reverse(name, kwargs=resolve(kwargs, ctx))
+
+    # The view module may hold a mock left behind by other tests; route
+    # through the real advisor and stub only the outbound LLM call.
+    with patch("api.views.ai_views.get_financial_advice", get_financial_advice), \
+            patch("api.services.ai_advisor.query_ai", return_value="Keep saving."):
+        with assert_max_queries(max_queries, f"{method.upper()} {url}"):
+            response = getattr(client, method)(url, resolve(payload, ctx), format="json")
+
+    assert response.status_code < 400, response.content
+
+
+def test_every_route_has_a_budget():
+    # Imported here: loading the URLconf at collection time would bind the
+    # real advisor into api.views.ai_views before other tests patch it.
+    from api import urls as api_urls
+
+    named_routes = {pattern.name for pattern in api_urls.urlpatterns if isinstance(pattern, URLPattern)}
+    assert named_routes - {budget[0] for budget in BUDGETS} == set()
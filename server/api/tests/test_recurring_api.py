@@ -0,0 +1,158 @@
+import pytest
+from io import StringIO
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import QuerySet
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from api.models import Expense, Income, RecurrenceScan, RecurringTransaction, UserDataVersion
+from api.services.data_version import get_data_version
+from api.services.recurring import add_months, detect_recurrences, find_recurrences
+from api.tests.test_utils import create_test_user
+
+pytestmark = pytest.mark.django_db
+
+def months_back(count, day=None):
+    """The same day in each of the last ``count`` months, oldest first."""
+    start = (day or date.today()).replace(day=5)
+    return [add_months(start, -i) for i in reversed(range(count))]
+
+def seed_history(user):
+    for i, day in enumerate(months_back(6)):
+        Income.objects.create(user=user, source="Salary" if i % 3 else " salary ", amount=Decimal(90000 + i * 500),
+                              date_received=day)
+        Expense.objects.create(user=user, category="Rent", amount=Decimal("20000.00"), date_spent=day)
+        Expense.objects.create(user=user, category="Subscriptions", amount=Decimal("649.00"), date_spent=day)
+        Expense.objects.create(user=user, category="Subscriptions", amount=Decimal("199.00"),
+                               date_spent=day + timedelta(days=10))
+    # Irregular spending isn't recurring, however often it happens
+    for offset in (1, 3, 4, 9, 20, 22, 40, 41, 70):
+        Expense.objects.create(user=user, category="Groceries", amount=Decimal("1500.00"),
+                               date_spent=date.today() - timedelta(days=offset))
+    # A gym membership that stopped a year ago
+    for day in months_back(4, date.today() - timedelta(days=365)):
+        Expense.objects.create(user=user, category="Gym", amount=Decimal("2000.00"), date_spent=day)
+
+def test_find_recurrences_groups_by_label_and_amount_band():
+    transactions = [("Salary", 90000.0 + i, add_months(date(2024, 1, 31), i)) for i in range(5)]
+    transactions += [(" SALARY", 91000.0, date(2024, 6, 30)), ("Bonus", 50000.0, date(2024, 3, 15))]
+    transactions += [("Netflix", 649.0, date(2024, 1, 1) + timedelta(weeks=2 * i)) for i in range(4)]
+
+    found = sorted(find_recurrences(transactions), key=lambda series: series['label'])
+    assert [(series['label'], series['cadence'], series['occurrences']) for series in found] == [
+        ("Netflix", "biweekly", 4),
+        ("Salary", "monthly", 6),
+    ]
+    salary = found[1]
+    assert salary['first_date'] == date(2024, 1, 31)
+    assert salary['last_date'] == date(2024, 6, 30)
+    # Monthly series step by calendar month, keeping the day where the month has it
+    assert salary['next_date'] == date(2024, 7, 30)
+    assert add_months(date(2024, 1, 31), 1) == date(2024, 2, 29)
+
+def test_recurring_endpoint(auth_client, user):
+    seed_history(user)
+
+    response = auth_client.get(reverse("analytics-recurring"))
+    assert response.status_code == status.HTTP_200_OK
+    found = {(item["kind"], item["label"], item["amount"]): item for item in response.data["recurring"]}
+    assert set(found) == {
+        ("income", "Salary", "91250.00"),
+        ("expense", "Rent", "20000.00"),
+        ("expense", "Subscriptions", "649.00"),
+        ("expense", "Subscriptions", "199.00"),
+    }
+    rent = found[("expense", "Rent", "20000.00")]
+    assert rent["cadence"] == "monthly"
+    assert rent["occurrences"] == 6
+    assert rent["next_date"] == add_months(months_back(1)[0], 1).isoformat()
+    assert rent["active"] is True
+    assert response.data["monthly_income"] == "91250.00"
+    assert response.data["monthly_expense"] == "20848.00"
+
+    everything = auth_client.get(reverse("analytics-recurring"), {"include_inactive": "true"})
+    gym = [item for item in everything.data["recurring"] if item["label"] == "Gym"]
+    assert len(gym) == 1 and gym[0]["active"] is False
+
+    incomes = auth_client.get(reverse("analytics-recurring"), {"kind": "income"})
+    assert [item["label"] for item in incomes.data["recurring"]] == ["Salary"]
+
+def test_results_are_reused_until_data_changes(auth_client, user):
+    seed_history(user)
+    url = reverse("analytics-recurring")
+    auth_client.get(url)
+    stored = list(RecurringTransaction.objects.values_list('id', flat=True))
+
+    with CaptureQueriesContext(connection) as reused:
+        auth_client.get(url)
+    assert len(reused) == 3
+    assert list(RecurringTransaction.objects.values_list('id', flat=True)) == stored
+
+    for day in months_back(3):
+        Expense.objects.create(user=user, category="Internet", amount=Decimal("999.00"), date_spent=day)
+    labels = {item["label"] for item in auth_client.get(url).data["recurring"]}
+    assert "Internet" in labels
+
+def test_detection_query_count_does_not_grow_with_history(auth_client, user):
+    seed_history(user)
+    url = reverse("analytics-recurring")
+    with CaptureQueriesContext(connection) as small:
+        auth_client.get(url)
+    for day in months_back(24):
+        Expense.objects.create(user=user, category="Insurance", amount=Decimal("3000.00"), date_spent=day)
+    with CaptureQueriesContext(connection) as large:
+        auth_client.get(url)
+    assert len(large) == len(small)
+
+def test_concurrent_scans_take_turns_and_keep_the_newest(user):
+    seed_history(user)
+    version = get_data_version(user.pk)[0]
+    # Users created before data versions existed, or bulk-created when seeding, have no version row to lock
+    UserDataVersion.objects.filter(user=user).delete()
+    locked = []
+    select_for_update = QuerySet.select_for_update
+
+    def spy(queryset, *args, **kwargs):
+        locked.append(queryset.model)
+        return select_for_update(queryset, *args, **kwargs)
+
+    with patch.object(QuerySet, "select_for_update", spy):
+        detect_recurrences({user.pk: version})
+    assert locked == [User]
+    stored = list(RecurringTransaction.objects.values_list('id', flat=True))
+
+    # A scan that read an older version finishing after the newer one leaves its results
+    assert detect_recurrences({user.pk: version - 1}) == 0
+    assert RecurrenceScan.objects.get(user=user).data_version == version
+    assert list(RecurringTransaction.objects.values_list('id', flat=True)) == stored
+
+    # One of the same version replaces them rather than adding a second set
+    detect_recurrences({user.pk: version})
+    assert RecurringTransaction.objects.filter(user=user).count() == len(stored)
+
+def test_recurring_requires_authentication():
+    assert APIClient().get(reverse("analytics-recurring")).status_code == status.HTTP_401_UNAUTHORIZED
+
+def test_recurring_rejects_unknown_kind(auth_client):
+    response = auth_client.get(reverse("analytics-recurring"), {"kind": "investment"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+def test_detect_recurring_command(user):
+    seed_history(user)
+    other = create_test_user(username="other", email="other@example.com")['user']
+
+    call_command("detect_recurring", "--batch-size", "1", stdout=StringIO())
+    assert RecurrenceScan.objects.count() == 2
+    assert RecurringTransaction.objects.filter(user=user).count() == 5
+    assert not RecurringTransaction.objects.filter(user=other).exists()
+
+    RecurringTransaction.objects.filter(user=user).delete()
+    call_command("detect_recurring", "--stale-only", stdout=StringIO())
+    # Nothing changed since the last scan, so the user is skipped
+    assert not RecurringTransaction.objects.filter(user=user).exists()
@@ -0,0 +1,54 @@
+import io
+import pytest
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from api import renderers
+from api.renderers import FastJSONParser, FastJSONRenderer
+
+PAYLOAD = {
+    "id": 7,
+    "category": "Café \u2028 ₹ rent\u2029",
+    "amount": Decimal("1250.50"),
+    "amounts": ["10.00", Decimal("0.10")],
+    "date_spent": date(2024, 1, 15),
+    "created_at": datetime(2024, 1, 15, 9, 30, 5, 123456, tzinfo=dt_timezone.utc),
+    "naive": datetime(2024, 1, 15, 9, 30),
+    "nested": {"ok": True, "missing": None, 3: "int key"},
+    "ratio": 0.25,
+}
+
+def test_renderer_matches_drf_output():
+    assert FastJSONRenderer().render(PAYLOAD) == JSONRenderer().render(PAYLOAD)
+
+def test_renderer_falls_back_for_indent_and_without_orjson(monkeypatch):
+    media_type = "application/json; indent=4"
+    assert FastJSONRenderer().render(PAYLOAD, media_type) == JSONRenderer().render(PAYLOAD, media_type)
+
+    monkeypatch.setattr(renderers, "orjson", None)
+    assert FastJSONRenderer().render(PAYLOAD) == JSONRenderer().render(PAYLOAD)
+
+def test_renderer_falls_back_on_values_orjson_cannot_encode():
+    data = {"big": 2 ** 70}
+    assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+def test_renderer_none_is_empty_body():
+    assert FastJSONRenderer().render(None) == b""
+
+@pytest.mark.parametrize("body", [
+    b'{"category": "Rent", "amount": "1250.50", "items": [1, 2.5, null, true]}',
+    b'[{"category": "Caf\\u00e9"}]',
+    b'{"big": 1180591620717411303424}',
+])
+def test_parser_matches_drf(body):
+    assert FastJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(io.BytesIO(body))
+
+@pytest.mark.parametrize("body", [b'{"category": ', b'{"amount": NaN}', b''])
+def test_parser_rejects_invalid_json_like_drf(body):
+    with pytest.raises(ParseError) as fast:
+        FastJSONParser().parse(io.BytesIO(body))
+    with pytest.raises(ParseError) as drf:
+        JSONParser().parse(io.BytesIO(body))
+    assert str(fast.value) == str(drf.value)
@@ -0,0 +1,83 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from api.models import Expense, Income, Investment
+from api.services.search import score
+from api.tests.test_utils import create_test_user
+
+pytestmark = pytest.mark.django_db
+
+def seed(user):
+    Expense.objects.create(user=user, category="Groceries", amount=Decimal("1500.00"), date_spent=date(2024, 1, 5))
+    Expense.objects.create(user=user, category="groceries ", amount=Decimal("800.00"), date_spent=date(2024, 2, 5))
+    Expense.objects.create(user=user, category="Grocery delivery", amount=Decimal("300.00"),
+                           date_spent=date(2024, 3, 1))
+    Expense.objects.create(user=user, category="Rent", amount=Decimal("20000.00"), date_spent=date(2024, 1, 1))
+    Income.objects.create(user=user, source="Salary", amount=Decimal("90000.00"), date_received=date(2024, 1, 31))
+    Investment.objects.create(user=user, name="Nifty Index Fund", investment_type="stocks",
+                              amount_invested=Decimal("5000.00"), current_value=Decimal("5400.00"),
+                              date_invested=date(2024, 1, 10))
+
+def search(client, **params):
+    response = client.get(reverse("search"), params)
+    assert response.status_code == status.HTTP_200_OK
+    return response.data
+
+def test_score_prefers_exact_then_containing_labels():
+    assert score("groceries", "Groceries") == 1.0
+    assert score("groceries", "Groceries") > score("groceries", "Grocery delivery") > score("groceries", "Rent")
+    assert score("rent", "Rent") > score("rent", "Rental income")
+    assert score("rent", "") == 0.0
+
+def test_results_are_ranked_then_newest_first(auth_client, user):
+    seed(user)
+
+    data = search(auth_client, q="grocer")
+    assert data["count"] == 3
+    assert [(item["label"], item["date"]) for item in data["results"]] == [
+        ("groceries ", "2024-02-05"),
+        ("Groceries", "2024-01-05"),
+        ("Grocery delivery", "2024-03-01"),
+    ]
+    top = data["results"][0]
+    assert top["kind"] == "expense"
+    assert top["amount"] == "800.00"
+    assert top["score"] == score("grocer", "groceries")
+
+def test_search_covers_sources_and_investment_names(auth_client, user):
+    seed(user)
+    salary = search(auth_client, q="salary")["results"]
+    assert [(item["kind"], item["label"]) for item in salary] == [("income", "Salary")]
+    assert [(item["kind"], item["amount"]) for item in search(auth_client, q="index fund")["results"]] == [
+        ("investment", "5000.00"),
+    ]
+    assert search(auth_client, q="groceries", kind="income")["count"] == 0
+
+def test_results_are_paginated(auth_client, user):
+    for i in range(5):
+        Expense.objects.create(user=user, category="Fuel", amount=Decimal(100 + i), date_spent=date(2024, 1, 1 + i))
+
+    first = search(auth_client, q="fuel", limit=2)
+    assert first["count"] == 5
+    assert [item["date"] for item in first["results"]] == ["2024-01-05", "2024-01-04"]
+    assert first["previous"] is None and "offset=2" in first["next"]
+    last = search(auth_client, q="fuel", limit=2, offset=4)
+    assert [item["amount"] for item in last["results"]] == ["100.00"]
+    assert last["next"] is None
+
+def test_search_is_scoped_to_the_user(auth_client, user):
+    other = create_test_user(username="other", email="other@example.com")['user']
+    seed(other)
+    assert search(auth_client, q="groceries") == {"count": 0, "next": None, "previous": None, "results": []}
+
+def test_search_validates_query(auth_client):
+    assert auth_client.get(reverse("search")).status_code == status.HTTP_400_BAD_REQUEST
+    assert auth_client.get(reverse("search"), {"q": "g"}).status_code == status.HTTP_400_BAD_REQUEST
+    response = auth_client.get(reverse("search"), {"q": "rent", "kind": "budget"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+def test_search_requires_authentication():
+    assert APIClient().get(reverse("search"), {"q": "rent"}).status_code == status.HTTP_401_UNAUTHORIZED
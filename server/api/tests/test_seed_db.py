@@ -0,0 +1,48 @@
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from api.models import FinancialProfile, Income, Expense, Investment
+from api.services.seeding import SEED_PASSWORD, SEED_USER_PREFIX
+
+pytestmark = pytest.mark.django_db
+
+def dataset():
+    return {
+        'profiles': list(FinancialProfile.objects.order_by('user__username')
+                         .values_list('user__username', 'age', 'monthly_salary', 'monthly_savings', 'risk_tolerance')),
+        'incomes': sorted(Income.objects.values_list('user__username', 'source', 'amount', 'date_received')),
+        'expenses': sorted(Expense.objects.values_list('user__username', 'category', 'amount', 'date_spent')),
+        'investments': sorted(Investment.objects.values_list(
+            'user__username', 'name', 'investment_type', 'amount_invested', 'current_value', 'interest_rate', 'years')),
+    }
+
+def test_seed_db_creates_users_profiles_and_rows():
+    call_command('seed_db', users=4, rows_per_user=30, seed=7)
+
+    users = User.objects.filter(username__startswith=SEED_USER_PREFIX)
+    assert users.count() == 4
+    assert FinancialProfile.objects.count() == 4
+    assert Income.objects.count() + Expense.objects.count() + Investment.objects.count() == 4 * 30
+    assert users.first().check_password(SEED_PASSWORD)
+
+    valid_types = {choice for choice, _ in Investment.INVESTMENT_TYPE_CHOICES}
+    assert set(Investment.objects.values_list('investment_type', flat=True)) <= valid_types
+    for investment in Investment.objects.filter(investment_type='sip'):
+        assert investment.years and investment.interest_rate
+
+def test_seed_db_is_deterministic_across_batch_sizes():
+    call_command('seed_db', users=3, rows_per_user=25, seed=42, batch_size=7)
+    first = dataset()
+
+    call_command('seed_db', users=3, rows_per_user=25, seed=42, batch_size=1000, reset=True)
+    assert dataset() == first
+
+    call_command('seed_db', users=3, rows_per_user=25, seed=43, reset=True)
+    assert dataset() != first
+
+def test_seed_db_skips_existing_users():
+    call_command('seed_db', users=2, rows_per_user=10)
+    call_command('seed_db', users=3, rows_per_user=10)
+
+    assert User.objects.filter(username__startswith=SEED_USER_PREFIX).count() == 3
+    assert Income.objects.count() + Expense.objects.count() + Investment.objects.count() == 30
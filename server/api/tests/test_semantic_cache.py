@@ -0,0 +1,109 @@
+import os
+import pytest
+from datetime import date
+from api.models import FinancialProfile, Expense
+from api.services.ai_advisor import get_financial_advice
+from api.services.llm_stub import StubLLMServer
+from api.services.semantic_cache import (
+    SemanticAnswerCache, chat_answer_cache, content_words, cosine_similarity, vectorize,
+)
+from api.tests.test_utils import create_test_user
+
+@pytest.fixture
+def cache(settings):
+    settings.AI_CHAT_CACHE = {'SIMILARITY_THRESHOLD': 0.85, 'MAX_ENTRIES_PER_USER': 2, 'MAX_USERS': 2}
+    return SemanticAnswerCache()
+
+def test_near_duplicate_questions_are_similar():
+    a = vectorize("Should I invest in SIP?")
+    b = vectorize("should i invest in a SIP")
+    c = vectorize("How much rent can I afford?")
+    assert cosine_similarity(a, b) > 0.85
+    assert cosine_similarity(a, c) < 0.5
+
+def test_content_words_ignore_stopwords_and_plurals():
+    assert content_words("Should I invest in a SIP?") == content_words("should i invest in SIPs") == {"invest", "sip"}
+    assert content_words("Can I afford a 10 lakh loan?") == {"afford", "10", "lakh", "loan"}
+
+def test_lookup_returns_closest_answer(cache):
+    cache.store(1, "snap", "Should I invest in SIP?", "Yes, start a SIP.")
+    cache.store(1, "snap", "How much rent can I afford?", "Keep rent under 30%.")
+    assert cache.lookup(1, "snap", "should i invest in SIPs") == "Yes, start a SIP."
+    assert cache.lookup(1, "snap", "What is the best credit card?") is None
+
+@pytest.mark.parametrize("cached, asked", [
+    ("Can I afford a 10 lakh loan?", "Can I afford a 50 lakh loan?"),
+    ("How much should I save each month?", "How much should I spend each month?"),
+    ("tax on 5 lakh", "tax on 15 lakh"),
+    ("is this a good idea", "is this a bad idea"),
+])
+def test_questions_with_different_meanings_miss(cache, settings, cached, asked):
+    # Close as vectors, but a different word or amount: no threshold alone separates them
+    settings.AI_CHAT_CACHE = {'SIMILARITY_THRESHOLD': 0.5}
+    assert cosine_similarity(vectorize(cached), vectorize(asked)) > 0.75
+    cache.store(1, "snap", cached, "Cached advice")
+    assert cache.lookup(1, "snap", asked) is None
+    assert cache.lookup(1, "snap", cached.upper()) == "Cached advice"
+
+def test_lookup_is_scoped_to_user_and_snapshot(cache):
+    cache.store(1, "snap", "Should I invest in SIP?", "Yes")
+    assert cache.lookup(2, "snap", "Should I invest in SIP?") is None
+    assert cache.lookup(1, "changed", "Should I invest in SIP?") is None
+
+def test_new_snapshot_discards_old_answers(cache):
+    cache.store(1, "old", "Should I invest in SIP?", "Yes")
+    cache.store(1, "new", "How much rent can I afford?", "30%")
+    assert cache.lookup(1, "old", "Should I invest in SIP?") is None
+
+def test_threshold_is_tunable(cache, settings):
+    cache.store(1, "snap", "Should I invest in SIP?", "Yes")
+    settings.AI_CHAT_CACHE = {'SIMILARITY_THRESHOLD': 0.9999}
+    assert cache.lookup(1, "snap", "should i invest in a SIP") is None
+
+def test_least_recently_used_entries_and_users_are_evicted(cache):
+    cache.store(1, "snap", "Should I invest in SIP?", "a")
+    cache.store(1, "snap", "How much rent can I afford?", "b")
+    cache.store(1, "snap", "Is gold a good hedge?", "c")
+    assert cache.lookup(1, "snap", "Should I invest in SIP?") is None
+    assert cache.lookup(1, "snap", "Is gold a good hedge?") == "c"
+
+    cache.store(2, "snap", "Should I invest in SIP?", "d")
+    cache.store(3, "snap", "Should I invest in SIP?", "e")
+    assert cache.lookup(1, "snap", "Is gold a good hedge?") is None
+    assert cache.lookup(3, "snap", "Should I invest in SIP?") == "e"
+
+@pytest.mark.django_db
+class TestChatCache:
+    @pytest.fixture(autouse=True)
+    def stub(self, settings):
+        os.environ["GROQ_API_KEY"] = "test-api-key"
+        chat_answer_cache.clear()
+        with StubLLMServer(reply="Start a monthly SIP.") as server:
+            settings.GROQ_API_URL = server.url
+            yield server
+        chat_answer_cache.clear()
+        del os.environ["GROQ_API_KEY"]
+
+    @pytest.fixture
+    def user(self, db):
+        user = create_test_user()['user']
+        FinancialProfile.objects.create(user=user, age=30, monthly_salary=50000, monthly_savings=10000, risk_tolerance='medium')
+        return user
+
+    def test_repeat_question_skips_llm(self, user, stub):
+        first = get_financial_advice(user.id, mode="chat", user_message="Should I invest in SIP?")
+        second = get_financial_advice(user.id, mode="chat", user_message="should I invest in a SIP")
+        assert first == second == "Start a monthly SIP."
+        assert len(stub.requests) == 1
+
+    def test_changed_financial_data_misses_cache(self, user, stub):
+        get_financial_advice(user.id, mode="chat", user_message="Should I invest in SIP?")
+        Expense.objects.create(user=user, category="Rent", amount=15000, date_spent=date.today())
+        get_financial_advice(user.id, mode="chat", user_message="Should I invest in SIP?")
+        assert len(stub.requests) == 2
+
+    def test_conversation_context_bypasses_cache(self, user, stub):
+        get_financial_advice(user.id, mode="chat", user_message="Should I invest in SIP?")
+        context = [{"role": "assistant", "content": "Tell me more about your goals."}]
+        get_financial_advice(user.id, mode="chat", user_message="Should I invest in SIP?", context=context)
+        assert len(stub.requests) == 2
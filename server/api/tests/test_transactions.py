@@ -0,0 +1,63 @@
+import pytest
+from datetime import date
+from unittest.mock import patch
+from django.db import connection
+from django.urls import reverse
+from api.models import Expense, FinancialProfile
+from api.serializers import ExpenseSerializer
+from api.tests.test_utils import create_test_user
+
+# transactional_db so each request sees the real autocommit/transaction state
+pytestmark = pytest.mark.django_db(transaction=True)
+
+@pytest.fixture
+def user():
+    user = create_test_user()['user']
+    FinancialProfile.objects.create(user=user, age=30, monthly_salary=50000, monthly_savings=10000, risk_tolerance='medium')
+    return user
+
+def test_reads_run_outside_a_transaction(auth_client):
+    states = []
+    original = Expense.objects.filter
+
+    def record_state(*args, **kwargs):
+        states.append(connection.in_atomic_block)
+        return original(*args, **kwargs)
+
+    with patch.object(Expense.objects, "filter", side_effect=record_state):
+        assert auth_client.get(reverse("expense-list")).status_code == 200
+    assert states == [False]
+
+def test_ai_call_runs_outside_a_transaction(auth_client, settings):
+    settings.DATABASES['default']['ATOMIC_REQUESTS'] = True
+    states = []
+
+    def fake_advice(*args, **kwargs):
+        states.append(connection.in_atomic_block)
+        return "Advice"
+
+    try:
+        with patch("api.views.ai_views.get_financial_advice", side_effect=fake_advice):
+            assert auth_client.get(reverse("ai-insights")).status_code == 200
+    finally:
+        settings.DATABASES['default']['ATOMIC_REQUESTS'] = False
+    assert states == [False]
+
+def test_bulk_create_is_all_or_nothing(auth_client):
+    data = [
+        {"category": "Rent", "amount": 1000, "date_spent": str(date.today())},
+        {"category": "Food", "amount": 200, "date_spent": str(date.today())},
+    ]
+    original_save = ExpenseSerializer.save
+    calls = []
+
+    def fail_on_second(self, **kwargs):
+        calls.append(1)
+        if len(calls) == 2:
+            raise RuntimeError("database went away")
+        return original_save(self, **kwargs)
+
+    with patch.object(ExpenseSerializer, "save", fail_on_second):
+        with pytest.raises(RuntimeError):
+            auth_client.post(reverse("expense-list"), data, format="json")
+    assert Expense.objects.count() == 0
@@ -0,0 +1,94 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from api.models import Income, Expense
+from api.services.trends import bucket_start, moving_average
+from api.tests.test_utils import create_test_user
+
+pytestmark = pytest.mark.django_db
+
+@pytest.fixture
+def user(db):
+    user = create_test_user()['user']
+    for day, amount in [(date(2024, 1, 5), "5000.00"), (date(2024, 3, 5), "5000.00"), (date(2024, 4, 5), "6000.00")]:
+        Income.objects.create(user=user, source="Salary", amount=Decimal(amount), date_received=day)
+    for day, amount in [(date(2024, 1, 10), "1000.00"), (date(2024, 1, 31), "500.50"), (date(2024, 3, 1), "2000.00")]:
+        Expense.objects.create(user=user, category="Rent", amount=Decimal(amount), date_spent=day)
+    return user
+
+def test_monthly_buckets_include_empty_months(auth_client):
+    response = auth_client.get(reverse("analytics-trends"),
+                               {"period": "month", "start": "2024-01-01", "end": "2024-04-30"})
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.data
+    assert data["buckets"] == [date(2024, 1, 1), date(2024, 2, 1), date(2024, 3, 1), date(2024, 4, 1)]
+    assert data["income"]["values"] == ["5000.00", "0.00", "5000.00", "6000.00"]
+    assert data["expense"]["values"] == ["1500.50", "0.00", "2000.00", "0.00"]
+    assert data["net"]["values"] == ["3499.50", "0.00", "3000.00", "6000.00"]
+    assert data["totals"] == {"income": "16000.00", "expense": "3500.50", "net": "12499.50"}
+
+def test_month_over_month_changes_and_moving_average(auth_client):
+    response = auth_client.get(reverse("analytics-trends"),
+                               {"period": "month", "start": "2024-01-01", "end": "2024-04-30", "window": 2})
+
+    income = response.data["income"]
+    assert income["change"] == [None, "-5000.00", "5000.00", "1000.00"]
+    # A change from an empty month has no percentage
+    assert income["change_pct"] == [None, -100.0, None, 20.0]
+    assert income["moving_average"] == ["5000.00", "2500.00", "2500.00", "5500.00"]
+
+def test_weekly_buckets_start_on_monday(auth_client):
+    response = auth_client.get(reverse("analytics-trends"),
+                               {"period": "week", "start": "2024-01-03", "end": "2024-01-16"})
+
+    assert response.data["buckets"] == [date(2024, 1, 1), date(2024, 1, 8), date(2024, 1, 15)]
+    assert response.data["income"]["values"] == ["5000.00", "0.00", "0.00"]
+    assert response.data["expense"]["values"] == ["0.00", "1000.00", "0.00"]
+
+def test_range_excludes_rows_outside_it(auth_client):
+    # The range starts mid-bucket: the January 5th income is outside it, the 10th expense is inside
+    response = auth_client.get(reverse("analytics-trends"),
+                               {"period": "month", "start": "2024-01-08", "end": "2024-01-31"})
+
+    assert response.data["income"]["values"] == ["0.00"]
+    assert response.data["expense"]["values"] == ["1500.50"]
+
+def test_other_users_data_is_excluded(auth_client):
+    other = create_test_user(username="other", email="other@example.com")['user']
+    Expense.objects.create(user=other, category="Rent", amount=Decimal("9999.00"), date_spent=date(2024, 1, 15))
+
+    response = auth_client.get(reverse("analytics-trends"),
+                               {"period": "month", "start": "2024-01-01", "end": "2024-01-31"})
+
+    assert response.data["expense"]["values"] == ["1500.50"]
+
+def test_defaults_to_the_last_twelve_months(auth_client):
+    response = auth_client.get(reverse("analytics-trends"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["period"] == "month"
+    assert len(response.data["buckets"]) == 12
+    assert response.data["buckets"][-1] == bucket_start(date.today(), "month")
+
+@pytest.mark.parametrize("params", [
+    {"period": "year"},
+    {"start": "2024-05-01", "end": "2024-01-01"},
+    {"period": "day", "start": "2000-01-01", "end": "2024-01-01"},
+    {"window": 0},
+])
+def test_invalid_query_is_rejected(auth_client, params):
+    response = auth_client.get(reverse("analytics-trends"), params)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+def test_requires_authentication():
+    response = APIClient().get(reverse("analytics-trends"))
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+def test_moving_average_uses_partial_windows_at_the_start():
+    assert moving_average([3.0, 6.0, 9.0, 12.0], 3).tolist() == [3.0, 4.5, 6.0, 9.0]
@@ -7,15 +7,20 @@ from .views.financial_profile_views import (
     UserFinancialProfileView
 )
 from .views.income_views import IncomeListCreateView, IncomeDetailView
-from .views.expense_views import ExpenseListCreateView, ExpenseDetailView
-from .views.investment_views import InvestmentListCreateView, InvestmentDetailView
+from .views.expense_views import ExpenseListCreateView, ExpenseDetailView, ExpenseAnomalyListView
+from .views.investment_views import InvestmentListCreateView, InvestmentDetailView, InvestmentProjectionView
 from .views.user_views import UserListCreateView, UserDetailView
 from .views.dashboard_views import UserDashboardView
+from .views.analytics_views import TrendsView, PortfolioReturnsView, GoalSimulationView, RecurringTransactionsView
+from .views.budget_views import BudgetListCreateView, BudgetDetailView, BudgetStatusView
+from .views.search_views import SearchView
 from .views.ai_views import (
     ai_recommendations_view,
     ai_chat_view,
     ai_similar_investments_view,
-    ai_loan_analysis_view
+    ai_loan_analysis_view,
+    ai_metrics_view,
+    ai_user_metrics_view
 )
 
 urlpatterns = [
@@ -27,6 +32,12 @@ urlpatterns = [
     # Dashboard endpoint
     path('dashboard/', UserDashboardView.as_view(), name='user-dashboard'),
 
+    # Analytics endpoints
+    path('analytics/trends/', TrendsView.as_view(), name='analytics-trends'),
+    path('analytics/portfolio/', PortfolioReturnsView.as_view(), name='analytics-portfolio'),
+    path('analytics/goal-simulation/', GoalSimulationView.as_view(), name='analytics-goal-simulation'),
+    path('analytics/recurring/', RecurringTransactionsView.as_view(), name='analytics-recurring'),
+
     # Profile endpoints
     path('profile/', UserFinancialProfileView.as_view(), name='user-financial-profile'),
     path("profile/create/", FinancialProfileCreateView.as_view(), name="financial-profile-create"),
@@ -36,10 +47,18 @@ urlpatterns = [
     path('income/<int:pk>/', IncomeDetailView.as_view(), name='income-detail'),
 
     path('expense/', ExpenseListCreateView.as_view(), name='expense-list'),
+    path('expense/anomalies/', ExpenseAnomalyListView.as_view(), name='expense-anomalies'),
     path('expense/<int:pk>/', ExpenseDetailView.as_view(), name='expense-detail'),
 
     path('investment/', InvestmentListCreateView.as_view(), name='investment-list'),
     path('investment/<int:pk>/', InvestmentDetailView.as_view(), name='investment-detail'),
+    path('investment/projections/', InvestmentProjectionView.as_view(), name='investment-projections'),
+
+    path('budgets/', BudgetListCreateView.as_view(), name='budget-list'),
+    path('budgets/status/', BudgetStatusView.as_view(), name='budget-status'),
+    path('budgets/<int:pk>/', BudgetDetailView.as_view(), name='budget-detail'),
+
+    path('search/', SearchView.as_view(), name='search'),
 
     path('users/', UserListCreateView.as_view(), name='user-list-create'),
     path('users/<int:pk>/', UserDetailView.as_view(), name='user-detail'),
@@ -49,4 +68,6 @@ urlpatterns = [
     path('ai/chat/', ai_chat_view, name='ai-chat'),
     path('ai/similar-investments/', ai_similar_investments_view, name='ai-similar-investments'),
     path('ai/loan-analysis/', ai_loan_analysis_view, name='ai-loan-analysis'),
+    path('ai/metrics/', ai_metrics_view, name='ai-metrics'),
+    path('ai/metrics/users/<int:user_id>/', ai_user_metrics_view, name='ai-user-metrics'),
 ]
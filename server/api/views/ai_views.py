@@ -1,9 +1,12 @@
 import logging
+from django.db import transaction
 from rest_framework.response import Response
 from rest_framework import status, serializers
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.decorators import api_view, permission_classes
 from ..services.ai_advisor import get_financial_advice
+from ..services.llm_metrics import llm_metrics
+from ..services.model_router import model_health
 from ..serializers import (
     AIChatRequestSerializer,
     AIChatResponseSerializer,
@@ -16,16 +19,21 @@ from ..models import FinancialProfile
 
 logger = logging.getLogger(__name__)
 
+# Views that call the LLM are marked non-atomic so a transaction (and its
+# connection) is never held open across the outbound request, even if
+# ATOMIC_REQUESTS is switched back on.
+
+@transaction.non_atomic_requests
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def ai_recommendations_view(request):
     """Get AI-generated financial insights."""
     try:
-        logger.info(f"User {request.user.id} requested AI recommendations.")
+        logger.info("User %s requested AI recommendations.", request.user.id)
         
         # Check if user has a financial profile
         if not FinancialProfile.objects.filter(user=request.user).exists():
-            logger.warning(f"User {request.user.id} has no financial profile.")
+            logger.warning("User %s has no financial profile.", request.user.id)
             return Response(
                 {"error": "Please complete your financial profile first"},
                 status=status.HTTP_400_BAD_REQUEST
@@ -35,25 +43,26 @@ def ai_recommendations_view(request):
         serializer = AIInsightResponseSerializer(data={"advice": advice})
         serializer.is_valid(raise_exception=True)
         
-        logger.info(f"AI recommendations generated for user {request.user.id}.")
+        logger.info("AI recommendations generated for user %s.", request.user.id)
         return Response(serializer.data)
     except serializers.ValidationError as e:
-        logger.error(f"Validation error: {e.detail}", exc_info=True)
+        logger.error("Validation error: %s", e.detail, exc_info=True)
         return Response({"error": e.detail}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
-        logger.critical(f"Unexpected error in ai_recommendations_view: {e}", exc_info=True)
+        logger.critical("Unexpected error in ai_recommendations_view: %s", e, exc_info=True)
         return Response({"error": "An unexpected error occurred."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@transaction.non_atomic_requests
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def ai_chat_view(request):
     """Chat with AI financial advisor."""
     try:
-        logger.info(f"User {request.user.id} initiated AI chat.")
+        logger.info("User %s initiated AI chat.", request.user.id)
         
         # Check if user has a financial profile
         if not FinancialProfile.objects.filter(user=request.user).exists():
-            logger.warning(f"User {request.user.id} has no financial profile.")
+            logger.warning("User %s has no financial profile.", request.user.id)
             return Response(
                 {"error": "Please complete your financial profile first"},
                 status=status.HTTP_400_BAD_REQUEST
@@ -73,25 +82,26 @@ def ai_chat_view(request):
         response_serializer = AIChatResponseSerializer(data={"response": response, "status": "success"})
         response_serializer.is_valid(raise_exception=True)
         
-        logger.info(f"AI chat response sent to user {request.user.id}.")
+        logger.info("AI chat response sent to user %s.", request.user.id)
         return Response(response_serializer.data)
     except serializers.ValidationError as e:
-        logger.error(f"Validation error: {e.detail}", exc_info=True)
+        logger.error("Validation error: %s", e.detail, exc_info=True)
         return Response({"error": e.detail}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
-        logger.critical(f"Unexpected error in ai_chat_view: {e}", exc_info=True)
+        logger.critical("Unexpected error in ai_chat_view: %s", e, exc_info=True)
         return Response({"error": "An unexpected error occurred."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@transaction.non_atomic_requests
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def ai_similar_investments_view(request):
     """Get AI-generated similar investment recommendations."""
     try:
-        logger.info(f"User {request.user.id} requested similar investments.")
+        logger.info("User %s requested similar investments.", request.user.id)
         
         # Check if user has a financial profile
         if not FinancialProfile.objects.filter(user=request.user).exists():
-            logger.warning(f"User {request.user.id} has no financial profile.")
+            logger.warning("User %s has no financial profile.", request.user.id)
             return Response(
                 {"error": "Please complete your financial profile first"},
                 status=status.HTTP_400_BAD_REQUEST
@@ -101,25 +111,26 @@ def ai_similar_investments_view(request):
         serializer = AISimilarInvestmentsResponseSerializer(data={"recommendations": recommendations})
         serializer.is_valid(raise_exception=True)
         
-        logger.info(f"Similar investment recommendations generated for user {request.user.id}.")
+        logger.info("Similar investment recommendations generated for user %s.", request.user.id)
         return Response(serializer.data)
     except serializers.ValidationError as e:
-        logger.error(f"Validation error: {e.detail}", exc_info=True)
+        logger.error("Validation error: %s", e.detail, exc_info=True)
         return Response({"error": e.detail}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
-        logger.critical(f"Unexpected error in ai_similar_investments_view: {e}", exc_info=True)
+        logger.critical("Unexpected error in ai_similar_investments_view: %s", e, exc_info=True)
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+@transaction.non_atomic_requests
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def ai_loan_analysis_view(request):
     """Get AI-generated loan affordability analysis."""
     try:
-        logger.info(f"User {request.user.id} requested loan analysis.")
+        logger.info("User %s requested loan analysis.", request.user.id)
         
         # Check if user has a financial profile
         if not FinancialProfile.objects.filter(user=request.user).exists():
-            logger.warning(f"User {request.user.id} has no financial profile.")
+            logger.warning("User %s has no financial profile.", request.user.id)
             return Response(
                 {"error": "Please complete your financial profile first"},
                 status=status.HTTP_400_BAD_REQUEST
@@ -140,12 +151,32 @@ def ai_loan_analysis_view(request):
         response_serializer = AILoanAnalysisResponseSerializer(data={"advice": advice})
         response_serializer.is_valid(raise_exception=True)
         
-        logger.info(f"Loan analysis generated for user {request.user.id}.")
+        logger.info("Loan analysis generated for user %s.", request.user.id)
         return Response(response_serializer.data)
         
     except serializers.ValidationError as e:
-        logger.error(f"Validation error: {e.detail}", exc_info=True)
+        logger.error("Validation error: %s", e.detail, exc_info=True)
         return Response({"error": e.detail}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
-        logger.critical(f"Unexpected error in ai_loan_analysis_view: {e}", exc_info=True)
+        logger.critical("Unexpected error in ai_loan_analysis_view: %s", e, exc_info=True)
         return Response({"error": "An unexpected error occurred."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def ai_metrics_view(request):
+    """Get aggregated LLM call metrics per AI mode and model for this process."""
+    logger.info("Admin %s requested AI metrics.", request.user.id)
+    return Response({
+        "modes": llm_metrics.summary(),
+        "model_health": model_health.snapshot(),
+    })
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def ai_user_metrics_view(request, user_id):
+    """Get aggregated LLM call metrics per AI mode for a single user."""
+    logger.info("Admin %s requested AI metrics for user %s.", request.user.id, user_id)
+    return Response({
+        "user_id": user_id,
+        "modes": llm_metrics.user_summary(user_id),
+    })
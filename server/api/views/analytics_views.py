@@ -0,0 +1,152 @@
+import logging
+from datetime import date
+from decimal import Decimal
+from django.conf import settings
+from django.db.models import Sum
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from ..models import FinancialProfile, Investment
+from ..services.monte_carlo import PERCENTILES, run_simulation
+from ..services.data_version import get_data_version
+from ..services.portfolio import get_portfolio_returns
+from ..services.recurring import get_recurrences, is_active, monthly_equivalent
+from ..services.trends import get_trends
+from ..serializers import (
+    GoalSimulationRequestSerializer,
+    PortfolioQuerySerializer,
+    RecurringQuerySerializer,
+    RecurringTransactionSerializer,
+    TrendsQuerySerializer,
+)
+
+logger = logging.getLogger(__name__)
+
+class TrendsView(APIView):
+    """Income, expense and net savings per day, week or month, with moving averages and changes.
+
+    Query parameters: ``period`` (day, week or month), ``start``, ``end`` and ``window``.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        query = TrendsQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        logger.info("TrendsView: %s trends for user %s", query.validated_data['period'], request.user.id)
+        return Response(get_trends(request.user.id, **query.validated_data))
+
+
+class PortfolioReturnsView(APIView):
+    """Absolute return, CAGR and XIRR for the user's investments, overall, per type and per holding.
+
+    Pass ``holdings=false`` to leave out the per-holding list.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        query = PortfolioQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        logger.info("PortfolioReturnsView: Portfolio returns for user %s", request.user.id)
+        return Response(get_portfolio_returns(request.user.id, include_holdings=query.validated_data['holdings']))
+
+
+class RecurringTransactionsView(APIView):
+    """Recurring income and expenses (salary, rent, subscriptions) with their cadence and next due date.
+
+    Detection runs over the user's whole history only after their data has
+    changed; otherwise the stored results are read back. ``monthly_income``
+    and ``monthly_expense`` total the active series per average month.
+    Query parameters: ``kind`` and ``include_inactive``.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        query = RecurringQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        logger.info("RecurringTransactionsView: Recurring transactions for user %s", request.user.id)
+
+        today = date.today()
+        version, _ = get_data_version(request.user.id)
+        recurrences = get_recurrences(request.user.id, version)
+        if 'kind' in query.validated_data:
+            recurrences = recurrences.filter(kind=query.validated_data['kind'])
+        recurrences = list(recurrences)
+        active = [recurrence for recurrence in recurrences if is_active(recurrence, today)]
+        if not query.validated_data['include_inactive']:
+            recurrences = active
+        totals = {
+            kind: str(sum((monthly_equivalent(recurrence) for recurrence in active if recurrence.kind == kind),
+                          Decimal("0.00")))
+            for kind in ('income', 'expense')
+        }
+        return Response({
+            "as_of": today,
+            "recurring": RecurringTransactionSerializer(recurrences, many=True, context={'today': today}).data,
+            "monthly_income": totals['income'],
+            "monthly_expense": totals['expense'],
+        })
+
+
+class GoalSimulationView(APIView):
+    """Monte Carlo estimate of reaching ``goal_amount`` by ``target_age``, with percentile bands per year.
+
+    Savings, current corpus and risk tolerance default to the user's financial
+    profile and investments; the return distribution follows the risk tolerance.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        profile = FinancialProfile.objects.filter(user=request.user).first()
+        if profile is None:
+            logger.warning("GoalSimulationView: User %s has no financial profile.", request.user.id)
+            return Response(
+                {"error": "Please complete your financial profile first"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        serializer = GoalSimulationRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        years = data['target_age'] - profile.age
+        if years < 1:
+            return Response(
+                {"target_age": [f"Target age must be above your current age ({profile.age})."]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        config = settings.MONTE_CARLO
+        risk_tolerance = data.get('risk_tolerance', profile.risk_tolerance)
+        mean, volatility = config['RETURNS'][risk_tolerance]
+        monthly_savings = data.get('monthly_savings', profile.monthly_savings)
+        current_savings = data.get('current_savings')
+        if current_savings is None:
+            current_savings = (
+                Investment.objects.filter(user=request.user).aggregate(total=Sum('current_value'))['total']
+                or Decimal("0.00")
+            )
+        paths = data.get('paths', config['DEFAULT_PATHS'])
+
+        logger.info("GoalSimulationView: Simulating %s paths over %s years for user %s", paths, years, request.user.id)
+        probability, bands = run_simulation(
+            paths, years, float(current_savings), float(monthly_savings), mean, volatility, float(data['goal_amount']),
+            step_up=float(data['annual_step_up']) / 100, seed=data.get('seed'),
+        )
+        return Response({
+            "success_probability": round(probability, 4),
+            "paths": paths,
+            "years": years,
+            "inputs": {
+                "goal_amount": f"{data['goal_amount']:.2f}",
+                "current_age": profile.age,
+                "target_age": data['target_age'],
+                "monthly_savings": f"{monthly_savings:.2f}",
+                "current_savings": f"{current_savings:.2f}",
+                "annual_step_up_pct": float(data['annual_step_up']),
+                "risk_tolerance": risk_tolerance,
+                "expected_return_pct": mean * 100,
+                "volatility_pct": volatility * 100,
+            },
+            "ages": list(range(profile.age + 1, data['target_age'] + 1)),
+            "bands": {f"p{percentile}": row for percentile, row in zip(PERCENTILES, bands.round(2).tolist())},
+        })
@@ -3,10 +3,11 @@ from rest_framework import generics, status
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from django.contrib.auth import authenticate
+from django.contrib.auth.backends import ModelBackend
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth.models import User
 from ..serializers import RegisterSerializer, LoginSerializer, UserSerializer
+from ..services.users import get_user_by_username
 from rest_framework import serializers
 
 logger = logging.getLogger(__name__)
@@ -38,14 +39,14 @@ class RegisterView(APIView):
                 }
             }
 
-            logger.info(f"New user registered: {user.username} (ID: {user.id})")
+            logger.info("New user registered: %s (ID: %s)", user.username, user.id)
             return Response(response_data, status=status.HTTP_201_CREATED)
 
         except serializers.ValidationError as e:
-            logger.error(f"User registration failed: {e.detail}", exc_info=True)
+            logger.error("User registration failed: %s", e.detail, exc_info=True)
             return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
-            logger.error(f"User registration failed: {str(e)}", exc_info=True)
+            logger.error("User registration failed: %s", e, exc_info=True)
             return Response(
                 {'error': 'Registration failed, please try again'},
                 status=status.HTTP_400_BAD_REQUEST
@@ -64,10 +65,12 @@ class LoginView(APIView):
             username = serializer.validated_data['username'].lower()
             password = serializer.validated_data['password']
             
-            try:
-                user = User.objects.get(username__iexact=username)
-                user = authenticate(username=user.username, password=password)
-            except User.DoesNotExist:
+            # Single indexed fetch, then verify the password on the loaded row
+            user = get_user_by_username(username)
+            if user is None:
+                # Hash anyway so response time doesn't reveal whether the username exists
+                User().set_password(password)
+            elif not (user.check_password(password) and ModelBackend().user_can_authenticate(user)):
                 user = None
 
             if user is not None:
@@ -86,17 +89,17 @@ class LoginView(APIView):
                         'access': str(refresh.access_token),
                     }
                 }
-                logger.info(f"User logged in: {user.username} (ID: {user.id})")
+                logger.info("User logged in: %s (ID: %s)", user.username, user.id)
                 return Response(response_data)
             else:
-                logger.warning(f"Failed login attempt for username: {username}")
+                logger.warning("Failed login attempt for username: %s", username)
                 return Response(
                     {'error': 'Invalid credentials'},
                     status=status.HTTP_401_UNAUTHORIZED
                 )
 
         except Exception as e:
-            logger.error(f"Login error: {str(e)}", exc_info=True)
+            logger.error("Login error: %s", e, exc_info=True)
             return Response(
                 {'error': 'Login failed, please try again'},
                 status=status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,68 @@
+import logging
+from datetime import date
+from decimal import Decimal
+from django.db import transaction
+from rest_framework import generics
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from ..models import Budget
+from ..services.budgets import budget_status
+from ..serializers import BudgetSerializer, BudgetStatusQuerySerializer, BudgetStatusSerializer
+
+logger = logging.getLogger(__name__)
+
+class BudgetListCreateView(generics.ListCreateAPIView):
+    permission_classes = [IsAuthenticated]
+    queryset = Budget.objects.all()
+    serializer_class = BudgetSerializer
+
+    def get_queryset(self):
+        logger.info("BudgetListCreateView: Fetching budgets for user %s", self.request.user.id)
+        return Budget.objects.filter(user=self.request.user).order_by('category')
+
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            budget = serializer.save(user=self.request.user)
+        logger.info("BudgetListCreateView: Budget %s created by user %s", budget.id, self.request.user.id)
+
+
+class BudgetDetailView(generics.RetrieveUpdateDestroyAPIView):
+    permission_classes = [IsAuthenticated]
+    queryset = Budget.objects.all()
+    serializer_class = BudgetSerializer
+
+    def get_queryset(self):
+        logger.info("BudgetDetailView: Fetching specific budget for user %s", self.request.user.id)
+        return Budget.objects.filter(user=self.request.user)
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            serializer.save()
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+
+
+class BudgetStatusView(APIView):
+    """Spent vs. budget per category for one month (``?month=YYYY-MM``, default the current month).
+
+    Spending comes from the running per-category totals, so this is a single
+    indexed query however many expenses the user has.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        query = BudgetStatusQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        month = query.validated_data.get('month') or date.today().replace(day=1)
+        logger.info("BudgetStatusView: Budget status for %s requested by user %s", month, request.user.id)
+
+        budgets = list(budget_status(request.user.id, month))
+        return Response({
+            "month": month,
+            "budgets": BudgetStatusSerializer(budgets, many=True).data,
+            "total_limit": str(sum((budget.monthly_limit for budget in budgets), Decimal("0.00"))),
+            "total_spent": str(sum((budget.spent for budget in budgets), Decimal("0.00"))),
+        })
@@ -3,6 +3,9 @@ from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.contrib.auth.models import User
+from ..conditional import conditional_on_data_version
+from ..responses import PrerenderedResponse
+from ..services.dashboard_cache import get_cached_dashboard, store_dashboard
 from ..serializers import UserDashboardSerializer
 
 logger = logging.getLogger(__name__)
@@ -11,11 +14,28 @@ class UserDashboardView(generics.RetrieveAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = UserDashboardSerializer
 
+    @conditional_on_data_version
+    def get(self, request, *args, **kwargs):
+        renderer = request.accepted_renderer
+        if renderer.format != 'json':
+            return super().get(request, *args, **kwargs)
+
+        # Cached bytes are keyed by data version, so a hit skips both the ORM and serialization
+        content = get_cached_dashboard(request.user.pk, request.data_version, request.accepted_media_type)
+        if content is not None:
+            return PrerenderedResponse(content)
+
+        logger.info("UserDashboardView: Rendering dashboard for user %s", request.user.id)
+        data = self.get_serializer(self.get_object()).data
+        content = renderer.render(data, request.accepted_media_type, self.get_renderer_context())
+        store_dashboard(request.user.pk, request.data_version, request.accepted_media_type, content)
+        return PrerenderedResponse(content, data=data)
+
     def get_object(self):
         try:
             return self.request.user
         except Exception as e:
-            logger.error(f"Error retrieving user dashboard for user {self.request.user.id}: {str(e)}", exc_info=True)
+            logger.error("Error retrieving user dashboard for user %s: %s", self.request.user.id, e, exc_info=True)
             return Response(
                 {"error": str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
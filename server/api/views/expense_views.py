@@ -1,27 +1,38 @@
 import logging
+from django.db import transaction
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from ..models import Expense
-from ..serializers import ExpenseSerializer
+from ..models import Expense, ExpenseAnomaly, ExpenseCategory
+from ..conditional import conditional_on_data_version
+from ..fast_serialization import ValuesListMixin
+from ..services.anomalies import batched_category_stats
+from ..services.budgets import batched_spend_updates
+from ..services.data_version import batched_data_version_bumps
+from ..services.dimensions import batched_dimension_lookups
+from ..serializers import ExpenseAnomalySerializer, ExpenseSerializer
 
 logger = logging.getLogger(__name__)
 
-class ExpenseListCreateView(generics.ListCreateAPIView):
+class ExpenseListCreateView(ValuesListMixin, generics.ListCreateAPIView):
     permission_classes = [IsAuthenticated]
     queryset = Expense.objects.all()
     serializer_class = ExpenseSerializer
 
     def get_queryset(self):
-        logger.info(f"ExpenseListCreateView: Fetching expenses for user {self.request.user.id}")
+        logger.info("ExpenseListCreateView: Fetching expenses for user %s", self.request.user.id)
         return Expense.objects.filter(user=self.request.user)
 
+    @conditional_on_data_version
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         expense = serializer.save(user=self.request.user)
-        logger.info(f"ExpenseListCreateView: Expense {expense.id} created by user {self.request.user.id}")
+        logger.info("ExpenseListCreateView: Expense %s created by user %s", expense.id, self.request.user.id)
 
     def create(self, request, *args, **kwargs):
-        logger.info(f"ExpenseListCreateView: Received expense creation request from user {request.user.id}")
+        logger.info("ExpenseListCreateView: Received expense creation request from user %s", request.user.id)
 
         if isinstance(request.data, list):
             serializers = [self.get_serializer(data=item) for item in request.data]
@@ -35,21 +46,30 @@ class ExpenseListCreateView(generics.ListCreateAPIView):
                     errors.append({"index": idx, "errors": serializer.errors})
 
             if errors:
-                logger.warning(f"ExpenseListCreateView: Validation failed for user {request.user.id}, errors: {errors}")
+                logger.warning("ExpenseListCreateView: Validation failed for user %s, errors: %s", request.user.id, errors)
                 return Response(
                     {"error": "Validation failed for some items", "details": errors},
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
             instances = []
-            for serializer in valid_data:
-                self.perform_create(serializer)
-                instances.append(serializer.instance)
-
-            logger.info(f"ExpenseListCreateView: {len(instances)} expenses created successfully for user {request.user.id}")
+            categories = [serializer.validated_data['category'] for serializer in valid_data]
+            with (
+                transaction.atomic(),
+                batched_data_version_bumps(),
+                batched_spend_updates(),
+                batched_category_stats(),
+                batched_dimension_lookups(ExpenseCategory, categories),
+            ):
+                for serializer in valid_data:
+                    self.perform_create(serializer)
+                    instances.append(serializer.instance)
+
+            logger.info("ExpenseListCreateView: %s expenses created successfully for user %s", len(instances), request.user.id)
             return Response(ExpenseSerializer(instances, many=True).data, status=status.HTTP_201_CREATED)
 
-        return super().create(request, *args, **kwargs)
+        with transaction.atomic():
+            return super().create(request, *args, **kwargs)
 
 
 class ExpenseDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -58,23 +78,52 @@ class ExpenseDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = ExpenseSerializer
 
     def get_queryset(self):
-        logger.info(f"ExpenseDetailView: Fetching specific expense for user {self.request.user.id}")
-        return Expense.objects.filter(user=self.request.user)
+        logger.info("ExpenseDetailView: Fetching specific expense for user %s", self.request.user.id)
+        queryset = Expense.objects.filter(user=self.request.user)
+        if self.request.method in ('PUT', 'PATCH', 'DELETE'):
+            # Writes run in a transaction (see update/destroy); locking the row makes the values loaded
+            # here the committed ones, so concurrent edits can't both subtract the same old amount
+            # from the spend totals and category statistics
+            queryset = queryset.select_for_update()
+        return queryset
+
+    def get_object(self):
+        expense = super().get_object()
+        # Loaded under lock, so the save and delete signals needn't read the stored values again
+        expense._stored_values_locked = self.request.method in ('PUT', 'PATCH', 'DELETE')
+        return expense
 
     def update(self, request, *args, **kwargs):
-        logger.info(f"ExpenseDetailView: Update request for expense {kwargs.get('pk')} by user {request.user.id}")
-        return super().update(request, *args, **kwargs)
+        logger.info("ExpenseDetailView: Update request for expense %s by user %s", kwargs.get('pk'), request.user.id)
+        with transaction.atomic():
+            return super().update(request, *args, **kwargs)
 
     def destroy(self, request, *args, **kwargs):
-        logger.info(f"ExpenseDetailView: Delete request for expense {kwargs.get('pk')} by user {request.user.id}")
-        return super().destroy(request, *args, **kwargs)
+        logger.info("ExpenseDetailView: Delete request for expense %s by user %s", kwargs.get('pk'), request.user.id)
+        with transaction.atomic():
+            return super().destroy(request, *args, **kwargs)
 
     def handle_exception(self, exc):
         if isinstance(exc, Expense.DoesNotExist):
-            logger.warning(f"ExpenseDetailView: User {self.request.user.id} attempted to access a non-existent expense {self.kwargs.get('pk')}")
+            logger.warning("ExpenseDetailView: User %s attempted to access a non-existent expense %s", self.request.user.id, self.kwargs.get('pk'))
             return Response(
                 {"error": "Expense not found or does not belong to the user"},
                 status=status.HTTP_404_NOT_FOUND
             )
-        logger.error(f"ExpenseDetailView: Unexpected error for user {self.request.user.id}: {str(exc)}")
+        logger.error("ExpenseDetailView: Unexpected error for user %s: %s", self.request.user.id, exc)
         return super().handle_exception(exc)
+
+
+class ExpenseAnomalyListView(generics.ListAPIView):
+    """Expenses flagged as unusually large for their category, most recently flagged first.
+
+    Flags are set as expenses are saved, against running per-category
+    statistics, so listing them never rescans the user's history.
+    """
+    permission_classes = [IsAuthenticated]
+    queryset = ExpenseAnomaly.objects.all()
+    serializer_class = ExpenseAnomalySerializer
+
+    def get_queryset(self):
+        logger.info("ExpenseAnomalyListView: Fetching flagged expenses for user %s", self.request.user.id)
+        return ExpenseAnomaly.objects.filter(user=self.request.user).select_related('expense').order_by('-flagged_at')
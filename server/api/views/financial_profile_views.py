@@ -1,4 +1,5 @@
 import logging
+from django.db import transaction
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -13,10 +14,10 @@ class FinancialProfileCreateView(generics.CreateAPIView):
     serializer_class = FinancialProfileSerializer
 
     def create(self, request, *args, **kwargs):
-        logger.info(f"FinancialProfileCreateView: Received request from user {request.user.id}")
+        logger.info("FinancialProfileCreateView: Received request from user %s", request.user.id)
 
         if FinancialProfile.objects.filter(user=request.user).exists():
-            logger.warning(f"User {request.user.id} attempted to create a duplicate financial profile.")
+            logger.warning("User %s attempted to create a duplicate financial profile.", request.user.id)
             return Response(
                 {'error': 'You already have a financial profile.'},
                 status=status.HTTP_400_BAD_REQUEST
@@ -24,12 +25,13 @@ class FinancialProfileCreateView(generics.CreateAPIView):
 
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
-            logger.info(f"FinancialProfileCreateView: Validation successful for user {request.user.id}")
-            self.perform_create(serializer)
-            logger.info(f"FinancialProfile created for user {request.user.id}")
+            logger.info("FinancialProfileCreateView: Validation successful for user %s", request.user.id)
+            with transaction.atomic():
+                self.perform_create(serializer)
+            logger.info("FinancialProfile created for user %s", request.user.id)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         
-        logger.error(f"FinancialProfileCreateView: Validation failed for user {request.user.id}, errors: {serializer.errors}")
+        logger.error("FinancialProfileCreateView: Validation failed for user %s, errors: %s", request.user.id, serializer.errors)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def perform_create(self, serializer):
@@ -43,13 +45,21 @@ class FinancialProfileView(generics.RetrieveUpdateDestroyAPIView):
         return FinancialProfile.objects.filter(user=self.request.user)
 
     def get_object(self):
-        logger.info(f"FinancialProfileView: Fetching financial profile for user {self.request.user.id}")
+        logger.info("FinancialProfileView: Fetching financial profile for user %s", self.request.user.id)
         return generics.get_object_or_404(FinancialProfile, user=self.request.user)
 
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            serializer.save()
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+
 class UserFinancialProfileView(generics.RetrieveAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = FinancialProfileSerializer
 
     def get_object(self):
-        logger.info(f"UserFinancialProfileView: Fetching financial profile for user {self.request.user.id}")
+        logger.info("UserFinancialProfileView: Fetching financial profile for user %s", self.request.user.id)
         return FinancialProfile.objects.filter(user=self.request.user).first()
@@ -1,27 +1,36 @@
 import logging
+from django.db import transaction
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from ..models import Income
+from ..models import Income, IncomeSource
+from ..conditional import conditional_on_data_version
+from ..fast_serialization import ValuesListMixin
+from ..services.data_version import batched_data_version_bumps
+from ..services.dimensions import batched_dimension_lookups
 from ..serializers import IncomeSerializer
 
 logger = logging.getLogger(__name__)
 
-class IncomeListCreateView(generics.ListCreateAPIView):
+class IncomeListCreateView(ValuesListMixin, generics.ListCreateAPIView):
     permission_classes = [IsAuthenticated]
     queryset = Income.objects.all()
     serializer_class = IncomeSerializer
 
     def get_queryset(self):
-        logger.info(f"IncomeListCreateView: Fetching incomes for user {self.request.user.id}")
+        logger.info("IncomeListCreateView: Fetching incomes for user %s", self.request.user.id)
         return Income.objects.filter(user=self.request.user)
 
+    @conditional_on_data_version
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         income = serializer.save(user=self.request.user)
-        logger.info(f"IncomeListCreateView: Income {income.id} created by user {self.request.user.id}")
+        logger.info("IncomeListCreateView: Income %s created by user %s", income.id, self.request.user.id)
 
     def create(self, request, *args, **kwargs):
-        logger.info(f"IncomeListCreateView: Received income creation request from user {request.user.id}")
+        logger.info("IncomeListCreateView: Received income creation request from user %s", request.user.id)
 
         if isinstance(request.data, list):
             serializers = [self.get_serializer(data=item) for item in request.data]
@@ -35,21 +44,24 @@ class IncomeListCreateView(generics.ListCreateAPIView):
                     errors.append({"index": idx, "errors": serializer.errors})
 
             if errors:
-                logger.warning(f"IncomeListCreateView: Validation failed for user {request.user.id}, errors: {errors}")
+                logger.warning("IncomeListCreateView: Validation failed for user %s, errors: %s", request.user.id, errors)
                 return Response(
                     {"error": "Validation failed for some items", "details": errors},
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
             instances = []
-            for serializer in valid_data:
-                self.perform_create(serializer)
-                instances.append(serializer.instance)
+            sources = [serializer.validated_data['source'] for serializer in valid_data]
+            with transaction.atomic(), batched_data_version_bumps(), batched_dimension_lookups(IncomeSource, sources):
+                for serializer in valid_data:
+                    self.perform_create(serializer)
+                    instances.append(serializer.instance)
 
-            logger.info(f"IncomeListCreateView: {len(instances)} incomes created successfully for user {request.user.id}")
+            logger.info("IncomeListCreateView: %s incomes created successfully for user %s", len(instances), request.user.id)
             return Response(IncomeSerializer(instances, many=True).data, status=status.HTTP_201_CREATED)
 
-        return super().create(request, *args, **kwargs)
+        with transaction.atomic():
+            return super().create(request, *args, **kwargs)
 
 
 class IncomeDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -58,23 +70,25 @@ class IncomeDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = IncomeSerializer
 
     def get_queryset(self):
-        logger.info(f"IncomeDetailView: Fetching specific income for user {self.request.user.id}")
+        logger.info("IncomeDetailView: Fetching specific income for user %s", self.request.user.id)
         return Income.objects.filter(user=self.request.user)
 
     def update(self, request, *args, **kwargs):
-        logger.info(f"IncomeDetailView: Update request for income {kwargs.get('pk')} by user {request.user.id}")
-        return super().update(request, *args, **kwargs)
+        logger.info("IncomeDetailView: Update request for income %s by user %s", kwargs.get('pk'), request.user.id)
+        with transaction.atomic():
+            return super().update(request, *args, **kwargs)
 
     def destroy(self, request, *args, **kwargs):
-        logger.info(f"IncomeDetailView: Delete request for income {kwargs.get('pk')} by user {request.user.id}")
-        return super().destroy(request, *args, **kwargs)
+        logger.info("IncomeDetailView: Delete request for income %s by user %s", kwargs.get('pk'), request.user.id)
+        with transaction.atomic():
+            return super().destroy(request, *args, **kwargs)
 
     def handle_exception(self, exc):
         if isinstance(exc, Income.DoesNotExist):
-            logger.warning(f"IncomeDetailView: User {self.request.user.id} attempted to access a non-existent income {self.kwargs.get('pk')}")
+            logger.warning("IncomeDetailView: User %s attempted to access a non-existent income %s", self.request.user.id, self.kwargs.get('pk'))
             return Response(
                 {"error": "Income not found or does not belong to the user"},
                 status=status.HTTP_404_NOT_FOUND
             )
-        logger.error(f"IncomeDetailView: Unexpected error for user {self.request.user.id}: {str(exc)}")
+        logger.error("IncomeDetailView: Unexpected error for user %s: %s", self.request.user.id, exc)
         return super().handle_exception(exc)
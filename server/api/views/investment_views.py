@@ -1,27 +1,37 @@
 import logging
+from django.db import transaction
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from ..models import Investment
-from ..serializers import InvestmentSerializer
+from ..conditional import conditional_on_data_version
+from ..fast_serialization import ValuesListMixin
+from ..services.data_version import batched_data_version_bumps
+from ..services.projections import get_projections
+from ..serializers import InvestmentSerializer, ProjectionQuerySerializer
 
 logger = logging.getLogger(__name__)
 
-class InvestmentListCreateView(generics.ListCreateAPIView):
+class InvestmentListCreateView(ValuesListMixin, generics.ListCreateAPIView):
     permission_classes = [IsAuthenticated]
     queryset = Investment.objects.all()
     serializer_class = InvestmentSerializer
 
     def get_queryset(self):
-        logger.info(f"InvestmentListCreateView: Fetching investments for user {self.request.user.id}")
+        logger.info("InvestmentListCreateView: Fetching investments for user %s", self.request.user.id)
         return Investment.objects.filter(user=self.request.user)
 
+    @conditional_on_data_version
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         investment = serializer.save(user=self.request.user)
-        logger.info(f"InvestmentListCreateView: Investment {investment.id} created by user {self.request.user.id}")
+        logger.info("InvestmentListCreateView: Investment %s created by user %s", investment.id, self.request.user.id)
 
     def create(self, request, *args, **kwargs):
-        logger.info(f"InvestmentListCreateView: Received investment creation request from user {request.user.id}")
+        logger.info("InvestmentListCreateView: Received investment creation request from user %s", request.user.id)
 
         if isinstance(request.data, list):
             serializers = [self.get_serializer(data=item) for item in request.data]
@@ -35,25 +45,27 @@ class InvestmentListCreateView(generics.ListCreateAPIView):
                     errors.append({"index": idx, "errors": serializer.errors})
 
             if errors:
-                logger.warning(f"InvestmentListCreateView: Validation failed for user {request.user.id}, errors: {errors}")
+                logger.warning("InvestmentListCreateView: Validation failed for user %s, errors: %s", request.user.id, errors)
                 return Response(
                     {"error": "Validation failed for some items", "details": errors},
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
             instances = []
-            for serializer in valid_data:
-                self.perform_create(serializer)
-                instances.append(serializer.instance)
+            with transaction.atomic(), batched_data_version_bumps():
+                for serializer in valid_data:
+                    self.perform_create(serializer)
+                    instances.append(serializer.instance)
 
-            logger.info(f"InvestmentListCreateView: {len(instances)} investments created successfully for user {request.user.id}")
+            logger.info("InvestmentListCreateView: %s investments created successfully for user %s", len(instances), request.user.id)
             return Response(InvestmentSerializer(instances, many=True).data, status=status.HTTP_201_CREATED)
 
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        self.perform_create(serializer)
+        with transaction.atomic():
+            self.perform_create(serializer)
         headers = self.get_success_headers(serializer.data)
-        logger.info(f"InvestmentListCreateView: Investment created successfully for user {request.user.id}")
+        logger.info("InvestmentListCreateView: Investment created successfully for user %s", request.user.id)
         return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
 
@@ -63,23 +75,41 @@ class InvestmentDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = InvestmentSerializer
 
     def get_queryset(self):
-        logger.info(f"InvestmentDetailView: Fetching specific investment for user {self.request.user.id}")
+        logger.info("InvestmentDetailView: Fetching specific investment for user %s", self.request.user.id)
         return Investment.objects.filter(user=self.request.user)
 
     def update(self, request, *args, **kwargs):
-        logger.info(f"InvestmentDetailView: Update request for investment {kwargs.get('pk')} by user {request.user.id}")
-        return super().update(request, *args, **kwargs)
+        logger.info("InvestmentDetailView: Update request for investment %s by user %s", kwargs.get('pk'), request.user.id)
+        with transaction.atomic():
+            return super().update(request, *args, **kwargs)
 
     def destroy(self, request, *args, **kwargs):
-        logger.info(f"InvestmentDetailView: Delete request for investment {kwargs.get('pk')} by user {request.user.id}")
-        return super().destroy(request, *args, **kwargs)
+        logger.info("InvestmentDetailView: Delete request for investment %s by user %s", kwargs.get('pk'), request.user.id)
+        with transaction.atomic():
+            return super().destroy(request, *args, **kwargs)
 
     def handle_exception(self, exc):
         if isinstance(exc, Investment.DoesNotExist):
-            logger.warning(f"InvestmentDetailView: User {self.request.user.id} attempted to access a non-existent investment {self.kwargs.get('pk')}")
+            logger.warning("InvestmentDetailView: User %s attempted to access a non-existent investment %s", self.request.user.id, self.kwargs.get('pk'))
             return Response(
                 {"error": "Investment not found or does not belong to the user"},
                 status=status.HTTP_404_NOT_FOUND
             )
-        logger.error(f"InvestmentDetailView: Unexpected error for user {self.request.user.id}: {str(exc)}")
+        logger.error("InvestmentDetailView: Unexpected error for user %s: %s", self.request.user.id, exc)
         return super().handle_exception(exc)
+
+
+class InvestmentProjectionView(APIView):
+    """Month-by-month projected invested amount and value of the user's SIPs and FDs up to maturity.
+
+    Pass ``holdings=true`` to include each holding's own curves. Projections
+    depend only on the stored holdings, so they revalidate on the data version.
+    """
+    permission_classes = [IsAuthenticated]
+
+    @conditional_on_data_version
+    def get(self, request):
+        query = ProjectionQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        logger.info("InvestmentProjectionView: Projections requested by user %s", request.user.id)
+        return Response(get_projections(request.user.id, include_holdings=query.validated_data['holdings']))
@@ -0,0 +1,26 @@
+import logging
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_GET
+from ..metrics import render_prometheus, request_metrics
+from ..services.llm_metrics import llm_metrics
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+@require_GET
+def metrics_view(request):
+    """Expose request and LLM metrics in Prometheus text format.
+
+    Scrapes must send ``Authorization: Bearer <METRICS_AUTH_TOKEN>``; without a
+    token configured the endpoint is only open with ``DEBUG`` on.
+    """
+    token = getattr(settings, 'METRICS_AUTH_TOKEN', None)
+    allowed = request.headers.get('Authorization') == f"Bearer {token}" if token else settings.DEBUG
+    if not allowed:
+        logger.warning("Rejected metrics scrape from %s", request.META.get('REMOTE_ADDR'))
+        return HttpResponseForbidden()
+
+    body = render_prometheus(request_metrics.collect(), llm_metrics.summary())
+    return HttpResponse(body, content_type=PROMETHEUS_CONTENT_TYPE)
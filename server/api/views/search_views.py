@@ -0,0 +1,33 @@
+import logging
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+from ..services.search import KINDS, search_transactions
+from ..serializers import SearchQuerySerializer, SearchResultSerializer
+
+logger = logging.getLogger(__name__)
+
+class SearchPagination(LimitOffsetPagination):
+    default_limit = 20
+    max_limit = 100
+
+
+class SearchView(APIView):
+    """The user's expenses, incomes and investments whose category, source or name matches ``q``.
+
+    Results are ranked by how well the label matches, then newest first, and
+    paginated with ``limit`` and ``offset``. Query parameters: ``q`` and ``kind``.
+    """
+    permission_classes = [IsAuthenticated]
+    pagination_class = SearchPagination
+
+    def get(self, request):
+        query = SearchQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        logger.info("SearchView: Search by user %s", request.user.id)
+
+        kind = query.validated_data.get('kind')
+        results = search_transactions(request.user.id, query.validated_data['q'], (kind,) if kind else KINDS)
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(results if results is not None else [], request, view=self)
+        return paginator.get_paginated_response(SearchResultSerializer(page, many=True).data)
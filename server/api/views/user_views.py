@@ -14,10 +14,10 @@ class UserListCreateView(generics.ListAPIView):
 
     def get_queryset(self):
         user = self.request.user
-        logger.info(f"UserListCreateView: User {user.id} ({user.username}) requested user list")
+        logger.info("UserListCreateView: User %s (%s) requested user list", user.id, user.username)
 
         if not user.is_staff:
-            logger.info(f"UserListCreateView: Restricted user list to only User {user.id}")
+            logger.info("UserListCreateView: Restricted user list to only User %s", user.id)
             return User.objects.filter(id=user.id)
 
         logger.info("UserListCreateView: Admin user accessed full user list")
@@ -33,8 +33,8 @@ class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
         obj = super().get_object()
 
         if not user.is_staff and obj.id != user.id:
-            logger.warning(f"UserDetailView: Unauthorized access attempt by User {user.id} to User {obj.id}")
+            logger.warning("UserDetailView: Unauthorized access attempt by User %s to User %s", user.id, obj.id)
             return Response({"error": "You don't have permission to access this user"}, status=status.HTTP_403_FORBIDDEN)
 
-        logger.info(f"UserDetailView: User {user.id} accessed details of User {obj.id}")
+        logger.info("UserDetailView: User %s accessed details of User %s", user.id, obj.id)
         return obj
@@ -18,6 +18,7 @@ import os
 env = environ.Env()
 environ.Env.read_env()
 GROQ_API_KEY = env('GROQ_API_KEY')
+GROQ_API_URL = env('GROQ_API_URL', default='https://api.groq.com/openai/v1/chat/completions')
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -44,6 +45,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',  # Trigram lookups for search
     'rest_framework',
     'api',
     'rest_framework_simplejwt',
@@ -52,6 +54,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -94,7 +97,11 @@ DATABASES = {
         'PASSWORD': env('DB_PASSWORD', default='carbon_password'),
         'HOST': env('DB_HOST', default='localhost'),
         'PORT': env('DB_PORT', default='5432'),
-        'ATOMIC_REQUESTS': True,  # Enable atomic requests
+        # Transactions are scoped per write operation in the views rather than per
+        # request, so reads and outbound AI calls never hold one open.
+        'ATOMIC_REQUESTS': False,
+        'CONN_MAX_AGE': env.int('DB_CONN_MAX_AGE', default=60),  # Reuse connections across requests (seconds)
+        'CONN_HEALTH_CHECKS': True,  # Ping reused connections before handing them to a request
         'TEST': {
             'NAME': 'test_carbon_db',
             'SERIALIZE': False,    # Disable serialization for faster tests
@@ -102,6 +109,28 @@ DATABASES = {
     }
 }
 
+# Optional connection pooling (requires psycopg 3: pip install "psycopg[binary,pool]").
+# Pooled connections are checked on checkout and recycled after DB_POOL_MAX_LIFETIME.
+if env.bool('DB_POOL', default=False):
+    try:
+        from psycopg_pool import ConnectionPool
+    except ImportError as e:
+        from django.core.exceptions import ImproperlyConfigured
+        raise ImproperlyConfigured('DB_POOL requires psycopg 3 with psycopg_pool installed') from e
+
+    DATABASES['default']['CONN_MAX_AGE'] = 0  # Django requires this when pooling
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = False
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': env.int('DB_POOL_MIN_SIZE', default=2),
+            'max_size': env.int('DB_POOL_MAX_SIZE', default=10),
+            'max_lifetime': env.float('DB_POOL_MAX_LIFETIME', default=1800.0),
+            'max_idle': env.float('DB_POOL_MAX_IDLE', default=300.0),
+            'timeout': env.float('DB_POOL_TIMEOUT', default=10.0),
+            'check': ConnectionPool.check_connection,
+        },
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -160,9 +189,19 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # orjson-backed when installed; identical output to DRF's JSON classes either way
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 SPECTACULAR_SETTINGS = {
@@ -192,6 +231,96 @@ SIMPLE_JWT = {
     'USER_ID_CLAIM': 'user_id',
 }
 
+# AI model routing
+# Each mode maps to a list of rules; the first rule whose max_prompt_chars fits
+# the prompt is used, and its models are tried in order. Models that are
+# recorded as slow or failing are tried last.
+AI_MODEL_ROUTING = {
+    'ROUTES': {
+        'default': [
+            {'models': ['llama-3.3-70b-versatile', 'llama-3.1-8b-instant']},
+        ],
+        'chat': [
+            {'max_prompt_chars': 6000, 'models': ['llama-3.1-8b-instant', 'llama-3.3-70b-versatile']},
+            {'models': ['llama-3.3-70b-versatile', 'llama-3.1-8b-instant']},
+        ],
+    },
+    'TIMEOUT': env.float('AI_MODEL_TIMEOUT', default=30.0),  # Seconds per model attempt
+    'SLOW_LATENCY_SECONDS': env.float('AI_MODEL_SLOW_LATENCY', default=10.0),
+    'MAX_ERROR_RATE': 0.5,
+    'MIN_SAMPLES': 3,
+    'SMOOTHING': 0.3,
+    'PROBE_INTERVAL_SECONDS': 60.0,  # How often a slow or failing model gets a chance to recover
+}
+
+# Near-duplicate answer cache for AI chat, per user and financial data snapshot
+AI_CHAT_CACHE = {
+    'ENABLED': env.bool('AI_CHAT_CACHE_ENABLED', default=True),
+    'SIMILARITY_THRESHOLD': env.float('AI_CHAT_CACHE_THRESHOLD', default=0.85),
+    'MAX_ENTRIES_PER_USER': 50,
+    'MAX_USERS': 1000,
+}
+
+# Authenticated users are cached per process so JWT requests skip the auth_user
+# lookup; entries are invalidated on user save/delete and expire after TTL seconds.
+AUTH_USER_CACHE = {
+    'ENABLED': env.bool('AUTH_USER_CACHE_ENABLED', default=True),
+    'TTL': env.int('AUTH_USER_CACHE_TTL', default=300),
+    'MAX_SIZE': 10000,
+}
+
+# Rendered dashboard JSON, one entry per user, checked against the user's data
+# version on every hit. Point DASHBOARD_CACHE_BACKEND at
+# django.core.cache.backends.filebased.FileBasedCache (with a directory as the
+# location) to share entries between worker processes.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'dashboard': {
+        'BACKEND': env('DASHBOARD_CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': env('DASHBOARD_CACHE_LOCATION', default='dashboard'),
+        'TIMEOUT': env.int('DASHBOARD_CACHE_TIMEOUT', default=3600),
+        'OPTIONS': {
+            'MAX_ENTRIES': env.int('DASHBOARD_CACHE_MAX_ENTRIES', default=1000),
+        },
+    },
+}
+DASHBOARD_CACHE = {
+    'ENABLED': env.bool('DASHBOARD_CACHE_ENABLED', default=True),
+    'ALIAS': 'dashboard',
+}
+
+# Monte Carlo goal simulation. Annual returns per risk tolerance are
+# (expected return, volatility). Set MONTE_CARLO_WORKERS above 1 to spread
+# large runs over a process pool, started on first use in each server process.
+MONTE_CARLO = {
+    'DEFAULT_PATHS': env.int('MONTE_CARLO_PATHS', default=100_000),
+    'MAX_PATHS': env.int('MONTE_CARLO_MAX_PATHS', default=1_000_000),
+    'WORKERS': env.int('MONTE_CARLO_WORKERS', default=1),
+    'MIN_PATHS_PER_WORKER': 50_000,
+    'RETURNS': {
+        'low': (0.07, 0.06),
+        'medium': (0.10, 0.12),
+        'high': (0.12, 0.18),
+    },
+}
+
+# Expense anomaly flags: an expense is flagged when it is at least Z_THRESHOLD
+# standard deviations above its category's mean, once the category has
+# MIN_SAMPLES earlier expenses.
+EXPENSE_ANOMALIES = {
+    'MIN_SAMPLES': env.int('EXPENSE_ANOMALY_MIN_SAMPLES', default=5),
+    'Z_THRESHOLD': env.float('EXPENSE_ANOMALY_Z_THRESHOLD', default=3.0),
+}
+
+# Request metrics exposed on /metrics. Set METRICS_DIR to a directory shared by
+# the worker processes on one host so each scrape merges every running worker's
+# totals; files of exited workers are removed by the next scrape.
+METRICS_DIR = env('METRICS_DIR', default=None)
+METRICS_FLUSH_INTERVAL = env.int('METRICS_FLUSH_INTERVAL', default=5)  # Seconds
+METRICS_AUTH_TOKEN = env('METRICS_AUTH_TOKEN', default=None)  # Required to scrape unless DEBUG
+
 # CORS settings
 CORS_ALLOW_ALL_ORIGINS = True  # Only for development
 CORS_ALLOW_CREDENTIALS = True
@@ -200,6 +329,10 @@ CORS_ALLOWED_ORIGINS = [
 ]
 
 # Logging
+# Handlers only enqueue records; a background thread per handler formats and
+# writes them. SamplingFilter keeps 1 in N of the listed high-volume messages.
+LOG_SAMPLE_EVERY = env.int('LOG_SAMPLE_EVERY', default=10)
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -208,18 +341,48 @@ LOGGING = {
             "format": "{levelname} {asctime} {module} {message}",
             "style": "{",
         },
+        "json": {
+            "()": "api.log_handlers.JSONFormatter",
+        },
+    },
+    "filters": {
+        "sampling": {
+            "()": "api.log_handlers.SamplingFilter",
+            "every": {
+                "api.views.income_views": {
+                    "IncomeListCreateView: Fetching incomes": LOG_SAMPLE_EVERY,
+                    "IncomeDetailView: Fetching specific income": LOG_SAMPLE_EVERY,
+                },
+                "api.views.expense_views": {
+                    "ExpenseListCreateView: Fetching expenses": LOG_SAMPLE_EVERY,
+                    "ExpenseDetailView: Fetching specific expense": LOG_SAMPLE_EVERY,
+                },
+                "api.views.investment_views": {
+                    "InvestmentListCreateView: Fetching investments": LOG_SAMPLE_EVERY,
+                    "InvestmentDetailView: Fetching specific investment": LOG_SAMPLE_EVERY,
+                },
+                "api.views.financial_profile_views": {
+                    "FinancialProfileView: Fetching financial profile": LOG_SAMPLE_EVERY,
+                    "UserFinancialProfileView: Fetching financial profile": LOG_SAMPLE_EVERY,
+                },
+            },
+        },
     },
     "handlers": {
         "file": {
             "level": "DEBUG",
-            "class": "logging.FileHandler",
+            "class": "api.log_handlers.QueueingHandler",
+            "target": "logging.FileHandler",
             "filename": os.path.join(BASE_DIR, "logs/app.log"),
-            "formatter": "verbose",
+            "formatter": "json",
+            "filters": ["sampling"],
         },
         "console": {
             "level": "DEBUG",
-            "class": "logging.StreamHandler",
+            "class": "api.log_handlers.QueueingHandler",
+            "target": "logging.StreamHandler",
             "formatter": "verbose",
+            "filters": ["sampling"],
         },
     },
     "loggers": {
@@ -230,8 +393,8 @@ LOGGING = {
         },
         "api": {
             "handlers": ["file", "console"],
-            "level": "DEBUG",
+            "level": env('API_LOG_LEVEL', default='INFO'),
             "propagate": False,
         },
     },
-}
\ No newline at end of file
+}